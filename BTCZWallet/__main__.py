@@ -241,6 +241,10 @@ class BitcoinZGUI(Window):
         self.app_version.style.color = WHITE
 
     def exit_app(self, sender, event):
+        self.app.loop.create_task(self.close_app())
+
+    async def close_app(self):
+        await self.rpc.close_session()
         self.app.exit()
 
 
@@ -281,6 +285,14 @@ def release_single_instance():
         mutex_handle = None
 
 
+def close_storage(app):
+    console = getattr(app, "console", None)
+    main_window = getattr(console, "main", None)
+    async_storage = getattr(main_window, "async_storage", None)
+    if async_storage:
+        async_storage.shutdown()
+
+
 
 class BitcoinZWallet(App):
     
@@ -320,6 +332,7 @@ def main():
     try:
         app.main_loop()
     finally:
+        close_storage(app)
         release_single_instance()
 
 if __name__ == "__main__":
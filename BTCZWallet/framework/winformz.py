@@ -1149,6 +1149,8 @@ class Table(Forms.DataGridView):
         self._rtl = rtl
 
         self.app_path = get_app_path()
+        self._images = {}
+        self._value_needed = None
 
         if self._location:
             self.Location = Drawing.Point(*self._location)
@@ -1370,6 +1372,53 @@ class Table(Forms.DataGridView):
         self.disable_sorting()
 
 
+    def set_virtual_source(self, columns: dict, row_count: int, value_needed: Callable[[int, int], object]):
+        self.Rows.Clear()
+        self.Columns.Clear()
+        for name, image in columns.items():
+            if image:
+                column = Forms.DataGridViewImageColumn()
+            else:
+                column = Forms.DataGridViewTextBoxColumn()
+            column.Name = name
+            column.HeaderText = name
+            self.Columns.Add(column)
+
+        self._value_needed = value_needed
+        if not self.VirtualMode:
+            self.VirtualMode = True
+            self.CellValueNeeded += self._on_cell_value_needed
+        self.RowCount = row_count
+
+        self.update_column_widths()
+        self.Invoke(Forms.MethodInvoker(lambda: self._resize_columns()))
+        self.disable_sorting()
+
+    def update_row_count(self, row_count: int):
+        if self.RowCount != row_count:
+            self.RowCount = row_count
+        self.Invalidate()
+
+    def _on_cell_value_needed(self, sender, e: Forms.DataGridViewCellValueEventArgs):
+        if not self._value_needed:
+            return
+        value = self._value_needed(e.RowIndex, e.ColumnIndex)
+        if isinstance(value, str) and value.lower().endswith((".png", ".jpg", ".jpeg", ".bmp")):
+            value = self._load_image(value)
+        e.Value = value
+
+    def _load_image(self, value):
+        image = self._images.get(value)
+        if image is None:
+            try:
+                full_path = str(Os.Path.Combine(self.app_path, value))
+                if Os.File.Exists(full_path):
+                    image = Drawing.Image.FromFile(full_path)
+                    self._images[value] = image
+            except Exception as e:
+                print(f"Failed to load image '{value}': {e}")
+        return image
+
     
     def add_column(self, name: str, header: str):
         self.Columns.Add(name, header)
@@ -0,0 +1,91 @@
+from toga import App
+
+from .events import BALANCES_CHANGED
+
+
+BALANCE_MINCONF = 1
+BALANCE_MAXCONF = 9999999
+
+
+class BalanceEngine():
+    def __init__(self, app:App, rpc, storage):
+        super().__init__()
+
+        self.app = app
+        self.rpc = rpc
+        self.storage = storage
+
+        self.snapshot = None
+
+
+    async def load(self):
+        if self.snapshot is None:
+            self.snapshot = {
+                row[2]: row[3] for row in await self.storage.get_addresses(full=True)
+            }
+        return self.snapshot
+
+
+    async def add_address(self, address_type, address, balance = 0.0):
+        await self.storage.insert_address(address_type, None, address, balance)
+        (await self.load())[address] = balance
+
+
+    async def sync_transparent(self):
+        results = await self.rpc.batch(
+            [
+                ("listaddresses", []),
+                ("listaddressgroupings", [])
+            ]
+        )
+        (addresses, _), (groupings, _) = results
+        if addresses is None or groupings is None:
+            return None
+        balances = {}
+        for group in groupings:
+            for entry in group:
+                balances[entry[0]] = round(float(entry[1]), 8) if len(entry) > 1 else 0.0
+        current = {address: (None, balances.get(address, 0.0)) for address in addresses}
+        for address, balance in balances.items():
+            if address not in current:
+                current[address] = (True, balance)
+        return await self.apply("transparent", current)
+
+
+    async def sync_shielded(self):
+        results = await self.rpc.batch(
+            [
+                ("z_listaddresses", []),
+                ("z_listunspent", [BALANCE_MINCONF, BALANCE_MAXCONF, False])
+            ]
+        )
+        (addresses, _), (notes, _) = results
+        if addresses is None or notes is None:
+            return None
+        current = dict.fromkeys(addresses, 0.0)
+        for note in notes:
+            address = note.get("address")
+            if address in current:
+                current[address] += note.get("amount", 0.0)
+        current = {
+            address: (None, round(balance, 8)) for address, balance in current.items()
+        }
+        return await self.apply("shielded", current)
+
+
+    async def apply(self, address_type, current):
+        snapshot = await self.load()
+        rows = []
+        inserted = 0
+        for address, (change, balance) in current.items():
+            if address not in snapshot:
+                inserted += 1
+            elif snapshot[address] == balance:
+                continue
+            rows.append((address_type, change, address, balance))
+            snapshot[address] = balance
+        if rows:
+            await self.storage.bulk_upsert_balances(rows)
+            changed = [row[2] for row in rows]
+            self.rpc.events.emit(BALANCES_CHANGED, address_type=address_type, addresses=changed)
+        return len(current), inserted, len(rows) - inserted
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+from toga import App
+
+
+BLOCK_CACHE_SIZE = 4096
+BLOCK_CACHE_MIN_CONFIRMATIONS = 10
+
+
+class BlockCache():
+    def __init__(self, app:App, rpc, storage):
+        super().__init__()
+
+        self.app = app
+        self.rpc = rpc
+
+        self.storage = storage
+        self.blocks = OrderedDict()
+        self.heights = {}
+
+
+    def remember(self, block):
+        blockhash, height, _ = block
+        self.blocks[blockhash] = block
+        self.blocks.move_to_end(blockhash)
+        self.heights[height] = blockhash
+        while len(self.blocks) > BLOCK_CACHE_SIZE:
+            old_hash, old_block = self.blocks.popitem(last=False)
+            if self.heights.get(old_block[1]) == old_hash:
+                del self.heights[old_block[1]]
+
+
+    async def lookup(self, block):
+        if isinstance(block, int):
+            blockhash = self.heights.get(block)
+        else:
+            blockhash = block
+        cached = self.blocks.get(blockhash)
+        if cached:
+            self.blocks.move_to_end(blockhash)
+            return cached
+        if isinstance(block, int):
+            stored = await self.storage.get_block(height=block)
+        else:
+            stored = await self.storage.get_block(blockhash=block)
+        if stored:
+            self.remember(stored)
+        return stored
+
+
+    async def get_block(self, block):
+        blocks = await self.get_blocks([block])
+        return blocks[0]
+
+
+    async def get_blocks(self, blocks):
+        blocks = list(blocks)
+        results = [await self.lookup(block) for block in blocks]
+        missing = list(dict.fromkeys(
+            block for block, result in zip(blocks, results) if result is None
+        ))
+        if not missing:
+            return results
+
+        responses = await self.rpc.batch(
+            self.block_request(block) for block in missing
+        )
+        fetched = {}
+        deep_blocks = []
+        for block, (result, _) in zip(missing, responses):
+            if not result:
+                continue
+            data = (result.get("hash"), result.get("height"), result.get("time"))
+            fetched[block] = data
+            if result.get("confirmations", 0) >= BLOCK_CACHE_MIN_CONFIRMATIONS:
+                self.remember(data)
+                deep_blocks.append(data)
+        if deep_blocks:
+            await self.storage.insert_blocks(deep_blocks)
+
+        return [
+            result or fetched.get(block)
+            for block, result in zip(blocks, results)
+        ]
+
+
+    def block_request(self, block):
+        if isinstance(block, int):
+            return ("getblock", [f"{block}", 1])
+        return ("getblockheader", [f"{block}", True])
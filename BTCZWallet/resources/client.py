@@ -1,10 +1,156 @@
 
+import asyncio
 import json
+import time
 import binascii
 import aiohttp
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
 
 from toga import App
 
+from .operations import OperationTracker
+from .events import EventBus, TipWatcher
+
+
+RPC_CONNECTIONS_LIMIT = 8
+RPC_KEEPALIVE_TIMEOUT = 30
+RPC_TIMEOUT = 120
+RPC_BATCH_SIZE = 100
+
+RPC_CACHE_TTL = {
+    "getinfo": 2,
+    "getblockchaininfo": 2,
+    "getnetworksolps": 10,
+    "getpeerinfo": 5,
+    "getconnectioncount": 5,
+    "getdeprecationinfo": 60,
+    "z_gettotalbalance": 3,
+    "getunconfirmedbalance": 3
+}
+RPC_PRIORITY_INTERACTIVE = "interactive"
+RPC_PRIORITY_MOBILE = "mobile"
+RPC_PRIORITY_BACKGROUND = "background"
+RPC_PRIORITY_WEIGHTS = {
+    RPC_PRIORITY_INTERACTIVE: 8,
+    RPC_PRIORITY_MOBILE: 4,
+    RPC_PRIORITY_BACKGROUND: 1
+}
+
+rpc_priority = ContextVar("rpc_priority", default=RPC_PRIORITY_BACKGROUND)
+
+RPC_WALLET_WRITES = {
+    "z_sendmany",
+    "sendtoaddress",
+    "getnewaddress",
+    "z_getnewaddress",
+    "importprivkey",
+    "z_importkey",
+    "z_importwallet"
+}
+
+
+class RPCScheduler():
+    def __init__(self, limit:int = 4):
+        super().__init__()
+
+        self.limit = limit
+        self.active = 0
+        self.lock = Lock()
+        self.queues = {priority: deque() for priority in RPC_PRIORITY_WEIGHTS}
+        self.credits = dict(RPC_PRIORITY_WEIGHTS)
+        self.hooks = []
+        self.stats = {
+            priority: {"calls": 0, "queued": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for priority in RPC_PRIORITY_WEIGHTS
+        }
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def set_limit(self, limit:int):
+        with self.lock:
+            self.limit = max(1, int(limit))
+            self._wake()
+
+    async def acquire(self, priority):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            if self.active < self.limit and not any(self.queues.values()):
+                self.active += 1
+                waiter = None
+            else:
+                waiter = (loop.create_future(), loop, priority, time.monotonic())
+                self.queues[priority].append(waiter)
+        if waiter is None:
+            self._report(priority, 0.0, False)
+            return
+
+        future = waiter[0]
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self.lock:
+                queue = self.queues[priority]
+                queued = waiter in queue
+                if queued:
+                    queue.remove(waiter)
+            if not queued and not future.cancelled():
+                self.release()
+            raise
+        self._report(priority, time.monotonic() - waiter[3], True)
+
+    def release(self):
+        with self.lock:
+            self.active -= 1
+            self._wake()
+
+    def _wake(self):
+        while self.active < self.limit:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self.active += 1
+            future, loop = waiter[0], waiter[1]
+            loop.call_soon_threadsafe(self._grant, future)
+
+    def _next_waiter(self):
+        waiting = [priority for priority, queue in self.queues.items() if queue]
+        if not waiting:
+            return None
+        if not any(self.credits[priority] > 0 for priority in waiting):
+            self.credits = dict(RPC_PRIORITY_WEIGHTS)
+        for priority in waiting:
+            if self.credits[priority] > 0:
+                self.credits[priority] -= 1
+                return self.queues[priority].popleft()
+
+    def _grant(self, future):
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def _report(self, priority, wait, queued):
+        with self.lock:
+            stats = self.stats[priority]
+            stats["calls"] += 1
+            if queued:
+                stats["queued"] += 1
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+        for hook in list(self.hooks):
+            try:
+                hook(priority, wait)
+            except Exception:
+                pass
+
 
 class RPC():
     def __init__(self, app:App, utils):
@@ -13,39 +159,191 @@ class RPC():
         self.app = app
         self.utils = utils
 
+        self.session = None
+        self.session_loop = None
+        self.scheduler = RPCScheduler()
+        self.operations = OperationTracker(self.app, self)
+        self.events = EventBus(self.app)
+        self.tip_watcher = TipWatcher(self.app, self, self.events)
+
+        self.cache = {}
+        self.inflight = {}
+        self.best_block_hash = None
+        self.cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0
+        }
+
+    async def open_session(self):
+        if self.session and not self.session.closed:
+            return self.session
+        connector = aiohttp.TCPConnector(
+            limit=RPC_CONNECTIONS_LIMIT,
+            limit_per_host=RPC_CONNECTIONS_LIMIT,
+            keepalive_timeout=RPC_KEEPALIVE_TIMEOUT
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT)
+        )
+        self.session_loop = asyncio.get_running_loop()
+        return self.session
+
+    async def close_session(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.session_loop = None
+
+    def on_session_loop(self):
+        return self.session_loop is None or self.session_loop is asyncio.get_running_loop()
+
+    @contextmanager
+    def priority(self, priority):
+        token = rpc_priority.set(priority)
+        try:
+            yield
+        finally:
+            rpc_priority.reset(token)
+
+    def set_priority(self, priority):
+        rpc_priority.set(priority)
+
+    async def _post(self, payload):
+        credentials = self.utils.get_rpc_credentials()
+        if credentials.threads != self.scheduler.limit:
+            self.scheduler.set_limit(credentials.threads)
+        headers = {}
+        if credentials.authorization:
+            headers["Authorization"] = credentials.authorization
+
+        await self.scheduler.acquire(rpc_priority.get())
+        try:
+            if self.on_session_loop():
+                session = await self.open_session()
+                async with session.post(credentials.url, json=payload, headers=headers) as response:
+                    return await response.text()
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT)) as session:
+                async with session.post(credentials.url, json=payload, headers=headers) as response:
+                    return await response.text()
+        finally:
+            self.scheduler.release()
+
+    def _parse_response(self, data):
+        error = data.get("error")
+        if error:
+            message = error.get("message", "").strip()
+            return None, message
+
+        return data.get("result"), None
+
     async def _rpc_call(self, method, params):
+        ttl = RPC_CACHE_TTL.get(method)
+        if ttl is None or not self.on_session_loop():
+            response = await self._rpc_request(method, params)
+            if method in RPC_WALLET_WRITES:
+                self.clear_cache()
+                self.tip_watcher.poke()
+            return response
+
+        key = (method, json.dumps(params))
+        cached = self.cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.cache_stats["hits"] += 1
+            return cached[1]
+
+        task = self.inflight.get(key)
+        if task:
+            self.cache_stats["coalesced"] += 1
+        else:
+            self.cache_stats["misses"] += 1
+            task = asyncio.ensure_future(self._rpc_request(method, params))
+            task.add_done_callback(lambda t: self._store_cache(key, ttl, t))
+            self.inflight[key] = task
+        return await asyncio.shield(task)
+
+    def _store_cache(self, key, ttl, task):
+        self.inflight.pop(key, None)
+        if task.cancelled() or task.exception():
+            return
+        response = task.result()
+        result, error = response
+        if error is not None:
+            return
+        if key[0] == "getblockchaininfo" and result:
+            best_block_hash = result.get("bestblockhash")
+            if best_block_hash != self.best_block_hash:
+                if self.best_block_hash is not None:
+                    self.clear_cache()
+                self.best_block_hash = best_block_hash
+        self.cache[key] = (time.monotonic() + ttl, response)
+
+    def clear_cache(self):
+        self.cache.clear()
+        self.cache_stats["invalidations"] += 1
+
+    async def _rpc_request(self, method, params):
         try:
-            rpcuser, rpcpassword, rpcport = self.utils.get_rpc_config()
-            url = f"http://localhost:{rpcport}/"
-            auth = aiohttp.BasicAuth(rpcuser, rpcpassword)
             payload = {
                 "jsonrpc": "1.0",
                 "id": "curltest",
                 "method": method,
                 "params": params,
             }
-            async with aiohttp.ClientSession(auth=auth) as session:
-                async with session.post(url, json=payload) as response:
-                    text = await response.text()
-                    try:
-                        data = json.loads(text)
-                    except json.JSONDecodeError:
-                        return None, text.strip()
-
-                    error = data.get("error")
-                    if error:
-                        code = error.get("code")
-                        message = error.get("message", "").strip()
-                        if code == -28:
-                            return None, message
-                        return None, message
-
-                    return data.get("result"), None
+            text = await self._post(payload)
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                return None, text.strip()
+
+            return self._parse_response(data)
 
         except Exception as e:
             return None, str(e).strip()
-        
-        
+
+    async def batch(self, calls):
+        calls = list(calls)
+        results = []
+        for start in range(0, len(calls), RPC_BATCH_SIZE):
+            chunk = calls[start:start + RPC_BATCH_SIZE]
+            results.extend(await self._batch_call(chunk))
+        return results
+
+    async def _batch_call(self, calls):
+        try:
+            payload = [
+                {
+                    "jsonrpc": "1.0",
+                    "id": index,
+                    "method": method,
+                    "params": params,
+                }
+                for index, (method, params) in enumerate(calls)
+            ]
+            text = await self._post(payload)
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                return [(None, text.strip())] * len(calls)
+
+            if isinstance(data, dict):
+                return [self._parse_response(data)] * len(calls)
+
+            responses = {item.get("id"): item for item in data}
+            results = []
+            for index in range(len(calls)):
+                item = responses.get(index)
+                if item is None:
+                    results.append((None, "Missing response in batch"))
+                else:
+                    results.append(self._parse_response(item))
+            return results
+
+        except Exception as e:
+            return [(None, str(e).strip())] * len(calls)
+
     async def stopNode(self):
         return await self._rpc_call(
             "stop",
@@ -166,10 +464,16 @@ class RPC():
             [f"{txid}"]
         )
     
-    async def getBlock(self, block):
+    async def getBlock(self, block, verbosity:int = 1):
         return await self._rpc_call(
             "getblock",
-            [f"{block}", 2]
+            [f"{block}", verbosity]
+        )
+    
+    async def getBlockHeader(self, blockhash):
+        return await self._rpc_call(
+            "getblockheader",
+            [f"{blockhash}", True]
         )
     
     async def listTransactions(self, count, tx_from):
@@ -178,6 +482,18 @@ class RPC():
             ["*", count, tx_from]
         )
     
+    async def listSinceBlock(self, blockhash, target_confirmations:int = 1):
+        return await self._rpc_call(
+            "listsinceblock",
+            [f"{blockhash}", target_confirmations]
+        )
+    
+    async def getBestBlockHash(self):
+        return await self._rpc_call(
+            "getbestblockhash",
+            []
+        )
+    
     async def z_listUnspent(self, address:str, minconf:int, maxconf:int = 9999999):
         return await self._rpc_call(
             "z_listunspent",
@@ -220,16 +536,20 @@ class RPC():
             [f"{uaddress}", [{"address": f"{toaddress}", "amount": float(amount)}], 1, float(txfee)]
         )
     
-    async def z_getOperationStatus(self, operation_ids:str):
+    async def z_getOperationStatus(self, operation_ids):
+        if isinstance(operation_ids, str):
+            operation_ids = [operation_ids]
         return await self._rpc_call(
             "z_getoperationstatus",
-            [[f"{operation_ids}"]]
+            [[f"{opid}" for opid in operation_ids]]
         )
     
-    async def z_getOperationResult(self, operation_ids:str):
+    async def z_getOperationResult(self, operation_ids):
+        if isinstance(operation_ids, str):
+            operation_ids = [operation_ids]
         return await self._rpc_call(
             "z_getoperationresult",
-            [[f"{operation_ids}"]]
+            [[f"{opid}" for opid in operation_ids]]
         )
     
     async def z_sendToManyAddresses(self, uaddress:str, addresses):
@@ -0,0 +1,72 @@
+from toga import App
+
+
+CONFIRMATION_DROPPED = -1
+CONFIRMATION_MISSING_LIMIT = 3
+
+
+class ConfirmationTracker():
+    def __init__(self, app:App, rpc, storage):
+        super().__init__()
+
+        self.app = app
+        self.rpc = rpc
+        self.storage = storage
+
+        self.pending = None
+        self.missing = {}
+        self.checked_state = None
+
+
+    async def load(self):
+        if self.pending is None:
+            self.pending = set(await self.storage.get_unconfirmed_transactions())
+        return self.pending
+
+
+    def track(self, txid):
+        if self.pending is not None:
+            self.pending.add(txid)
+
+
+    async def check(self):
+        pending = list(await self.load())
+        if not pending:
+            return 0
+        tip_height = self.rpc.tip_watcher.height
+        mempool_state = self.rpc.tip_watcher.mempool_state
+        if tip_height is not None and (tip_height, mempool_state) == self.checked_state:
+            return len(pending)
+
+        results = await self.rpc.batch(
+            [("getblockcount", [])] + [("gettransaction", [txid]) for txid in pending]
+        )
+        (height, _), transactions = results[0], results[1:]
+        if height is None:
+            return None
+        self.checked_state = (height, mempool_state)
+
+        updates = []
+        for txid, (result, error) in zip(pending, transactions):
+            if result is None:
+                if error is None:
+                    continue
+                self.missing[txid] = self.missing.get(txid, 0) + 1
+                if self.missing[txid] >= CONFIRMATION_MISSING_LIMIT:
+                    updates.append((CONFIRMATION_DROPPED, txid))
+                continue
+            self.missing.pop(txid, None)
+            confirmations = result.get("confirmations", 0)
+            if confirmations > 0:
+                updates.append((height - confirmations + 1, txid))
+            elif confirmations < 0:
+                updates.append((CONFIRMATION_DROPPED, txid))
+
+        if updates:
+            await self.storage.update_transactions(updates)
+            for blocks, txid in updates:
+                self.pending.discard(txid)
+                self.missing.pop(txid, None)
+                if blocks == CONFIRMATION_DROPPED:
+                    self.app.console.info_log(f"Transaction dropped : {txid}")
+        return len(self.pending)
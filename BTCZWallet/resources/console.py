@@ -8,6 +8,7 @@ import sys
 import logging
 from PIL import Image
 import shlex
+import time
 
 from toga import App, Window, Box, TextInput, Label, ImageView
 from ..framework import (
@@ -15,6 +16,10 @@ from ..framework import (
     BorderStyle, Sys, Forms, Keys, ToolTip, MenuStrip,
     ClipBoard, Os, run_async, Drawing
 )
+from .storage import StorageTxs
+from .storage.migrations import get_migrations
+from .export import TransactionExporter
+from .search import parse_date
 from toga.style.pack import Pack
 from toga.colors import rgb, GRAY
 from toga.constants import COLUMN, CENTER, ROW, YELLOW, BLACK
@@ -166,6 +171,7 @@ class Console(Window):
         self.shell_history_index = None
 
         self.recording = None
+        self.tasks_live = None
         self.recording_path = None
         self.recording_temp = None
         self.frame_index = 0
@@ -603,6 +609,12 @@ class Console(Window):
                 " → applogs :   Open the application logs directory\n"
                 " → capture :   captures the application current visual state\n"
                 " → record start/stop :   Record the current application window as an animated GIF (10 FPS)\n"
+                " → rpcstats :   Show RPC cache counters and queue wait per priority\n"
+                " → migrations :   Show storage schema migrations applied at startup\n"
+                " → operations :   List pending z_sendmany operations and their status\n"
+                " → tasks [live/stop] :   Show background tasks (last run, duration, next due)\n"
+                " → export txs <path> [--from --to --address] :   Export transaction history (.csv, .jsonl, .parquet)\n"
+                "                     Dates as YYYY-MM-DD, --to is inclusive\n"
                 "================================================\n"
                 " → merge <address> : ! Merge all transparent balances from your wallet into a single address\n"
                 "                     Usage: merge <address>\n"
@@ -627,6 +639,61 @@ class Console(Window):
         elif value == "capture":
             self.create_app_screenshot()
 
+        elif value == "rpcstats":
+            self.rpc_stats()
+
+        elif value == "migrations":
+            self.migrations_stats()
+
+        elif value == "operations":
+            pending = self.rpc.operations.get_pending()
+            if not pending:
+                self.info_shell("No pending operations")
+            else:
+                self.info_shell("\n".join(f" → {opid} : {status}" for opid, status in pending.items()))
+
+        elif value.startswith("tasks"):
+            parts = value.split()
+            if len(parts) > 2:
+                self.error_shell("Too many arguments")
+            elif len(parts) == 1:
+                self.tasks_table()
+            elif parts[1] == "live":
+                if not self.tasks_live:
+                    self.tasks_live = True
+                    self.app.loop.create_task(self.live_tasks_table())
+            elif parts[1] == "stop":
+                self.tasks_live = None
+            else:
+                self.error_shell("Invalid argument")
+
+        elif value.startswith("export"):
+            try:
+                parts = shlex.split(value)
+            except ValueError as e:
+                self.error_shell(str(e))
+                return
+            if len(parts) < 3 or parts[1] != "txs":
+                self.error_shell("Usage: export txs <path> [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--address <address>]")
+                return
+            options = {}
+            arguments = iter(parts[3:])
+            for option in arguments:
+                if option not in ("--from", "--to", "--address"):
+                    self.error_shell(f"Invalid argument : {option}")
+                    return
+                options[option] = next(arguments, None)
+                if options[option] is None:
+                    self.error_shell(f"Missing value for {option}")
+                    return
+            try:
+                start = self.parse_export_date(options.get("--from"))
+                end = self.parse_export_date(options.get("--to"), 1)
+            except ValueError:
+                self.error_shell("Invalid date, use YYYY-MM-DD")
+                return
+            run_async(self.export_transactions(parts[2], start, end, options.get("--address")))
+
         elif value.startswith("record"):
             parts = value.split()
             if len(parts) < 2:
@@ -646,7 +713,7 @@ class Console(Window):
                         return
                     run_async(self.save_record())
                 else:
-                    self.error_shell(f"Invalid argument")
+                    self.error_shell("Invalid argument")
 
         elif value.startswith("merge"):
             parts = value.split()
@@ -695,6 +762,119 @@ class Console(Window):
                 self.error_shell(str(e))
 
 
+    def parse_export_date(self, value, days = 0):
+        if value is None:
+            return None
+        return parse_date(value, days)
+
+
+    async def export_transactions(self, path, start, end, address):
+        exporter = TransactionExporter(StorageTxs(self.app))
+        loop = asyncio.get_running_loop()
+        reported = 0
+
+        def on_progress(written, total):
+            nonlocal reported
+            percent = written * 100 // total if total else 100
+            if percent >= reported + 10 or written == total:
+                reported = percent
+                loop.call_soon_threadsafe(self.info_shell, f"Exporting... {written}/{total} ({percent}%)")
+
+        try:
+            self.info_shell(f"Exporting transactions to : {path}")
+            started = time.monotonic()
+            written = await self.main.async_storage.read(exporter.export, path, start, end, address, on_progress)
+            duration = time.monotonic() - started
+            rate = written / duration if duration else written
+            self.info_shell(f"Exported {written} transactions in {duration:.1f} s ({rate:.0f} rows/s)")
+        except Exception as e:
+            self.error_shell(f"{e}")
+
+
+    def rpc_stats(self):
+        stats = self.rpc.cache_stats
+        requests = stats["hits"] + stats["misses"] + stats["coalesced"]
+        saved = stats["hits"] + stats["coalesced"]
+        ratio = (saved / requests * 100) if requests else 0
+        self.info_shell(
+            f"RPC cache :\n"
+            f" → hits : {stats['hits']}\n"
+            f" → misses : {stats['misses']}\n"
+            f" → coalesced : {stats['coalesced']}\n"
+            f" → invalidations : {stats['invalidations']}\n"
+            f" → saved node calls : {saved} ({ratio:.1f}%)"
+        )
+        scheduler = self.rpc.scheduler
+        lines = [f"RPC queue (limit {scheduler.limit}, active {scheduler.active}) :"]
+        for priority, stats in scheduler.stats.items():
+            average = (stats["total_wait"] / stats["calls"] * 1000) if stats["calls"] else 0
+            lines.append(
+                f" → {priority} : {stats['calls']} calls, {stats['queued']} queued, "
+                f"avg wait {average:.1f} ms, max wait {stats['max_wait'] * 1000:.1f} ms"
+            )
+        self.info_shell("\n".join(lines))
+
+
+    def migrations_stats(self):
+        migrations = get_migrations()
+        if not migrations:
+            self.info_shell("No storage opened yet")
+            return
+        lines = ["Storage migrations :"]
+        for name, applied in sorted(migrations.items()):
+            if not applied:
+                lines.append(f" → {name} : up to date")
+            for version, migration, seconds in applied:
+                lines.append(f" → {name} v{version} {migration} : {seconds * 1000:.1f} ms")
+        self.info_shell("\n".join(lines))
+
+
+    def format_tasks_table(self):
+        scheduler = getattr(self.main, "scheduler", None)
+        if not scheduler:
+            return None
+        header = ("Task", "Last run", "Duration", "Next due", "Interval", "Runs")
+        rows = [header] + scheduler.get_table()
+        widths = [max(len(row[index]) for row in rows) for index in range(len(header))]
+        lines = [
+            "  ".join(value.ljust(width) for value, width in zip(row, widths))
+            for row in rows
+        ]
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines)
+
+
+    def tasks_table(self):
+        table = self.format_tasks_table()
+        if table is None:
+            self.error_shell("Scheduler not running")
+            return
+        self.info_shell(table)
+
+
+    async def live_tasks_table(self):
+        shell = self.console_output_shell
+        start = None
+        drawn = ""
+        while self.tasks_live:
+            table = self.format_tasks_table()
+            if table is None:
+                self.error_shell("Scheduler not running")
+                self.tasks_live = None
+                return
+            table += "\n"
+            if start is None or shell.Text[start:start + len(drawn)] != drawn:
+                start = shell.TextLength
+                drawn = ""
+            shell.SelectionStart = start
+            shell.SelectionLength = len(drawn)
+            shell.SelectionColor = Color.rgb(114,137,218)
+            shell.SelectedText = table
+            shell.SelectionColor = Color.WHITE
+            drawn = table
+            await asyncio.sleep(1)
+
+
     async def start_merging(self, address):
         balance = await self.get_transparent_balance()
         operation, error_message = await self.rpc.sendToAddress(address, balance)
@@ -0,0 +1,199 @@
+import asyncio
+
+from toga import App
+
+try:
+    import zmq
+    import zmq.asyncio
+except ImportError:
+    zmq = None
+
+
+NEW_BLOCK = "new_block"
+MEMPOOL_CHANGED = "mempool_changed"
+WALLET_CHANGED = "wallet_changed"
+TRANSACTIONS_CHANGED = "transactions_changed"
+BALANCES_CHANGED = "balances_changed"
+
+TIP_POLL_INTERVAL = 2
+TIP_POLL_BACKOFF = 2
+TIP_MAX_POLL_INTERVAL = 16
+TIP_ZMQ_POLL_INTERVAL = 30
+SAFETY_POLL_INTERVAL = 60
+
+
+class EventBus():
+    def __init__(self, app:App):
+        super().__init__()
+
+        self.app = app
+        self.subscribers = {}
+        self.counts = {}
+
+
+    def subscribe(self, event, callback):
+        self.subscribers.setdefault(event, []).append(callback)
+
+
+    def unsubscribe(self, event, callback):
+        callbacks = self.subscribers.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+
+    def emit(self, event, **data):
+        self.counts[event] = self.counts.get(event, 0) + 1
+        for callback in list(self.subscribers.get(event, [])):
+            try:
+                result = callback(event, **data)
+            except Exception as e:
+                self.app.console.error_log(f"{event} : {e}")
+                continue
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(self.guard(event, result))
+
+
+    async def guard(self, event, coroutine):
+        try:
+            await coroutine
+        except Exception as e:
+            self.app.console.error_log(f"{event} : {e}")
+
+
+class TipWatcher():
+    def __init__(self, app:App, rpc, events):
+        super().__init__()
+
+        self.app = app
+        self.rpc = rpc
+        self.events = events
+
+        self.task = None
+        self.zmq_task = None
+        self.wakeup = None
+        self.interval = TIP_POLL_INTERVAL
+        self.best_block_hash = None
+        self.height = None
+        self.wallet_state = None
+        self.mempool_state = None
+
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.wakeup = asyncio.Event()
+            self.task = self.app.loop.create_task(self.run())
+
+
+    async def run(self):
+        self.app.console.event_log(f"✔: Chain tip watcher")
+        self.start_zmq()
+        while True:
+            try:
+                changed = await self.check_tip()
+            except Exception as e:
+                changed = False
+                self.app.console.error_log(f"Chain tip watcher : {e}")
+            if changed:
+                self.interval = TIP_POLL_INTERVAL
+            else:
+                self.interval = min(self.interval * TIP_POLL_BACKOFF, TIP_MAX_POLL_INTERVAL)
+            if self.zmq_task and not self.zmq_task.done():
+                interval = TIP_ZMQ_POLL_INTERVAL
+            else:
+                interval = self.interval
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+    def poke(self):
+        self.interval = TIP_POLL_INTERVAL
+        if self.wakeup:
+            self.wakeup.set()
+
+
+    async def check_tip(self):
+        results = await self.rpc.batch(
+            [
+                ("getbestblockhash", []),
+                ("getblockcount", []),
+                ("getwalletinfo", []),
+                ("getmempoolinfo", [])
+            ]
+        )
+        (blockhash, _), (height, _), (walletinfo, _), (mempoolinfo, _) = results
+        changed = False
+
+        if blockhash and blockhash != self.best_block_hash:
+            previous = self.best_block_hash
+            self.best_block_hash = blockhash
+            self.height = height
+            changed = True
+            if previous is not None:
+                self.rpc.clear_cache()
+                self.rpc.best_block_hash = blockhash
+                self.events.emit(NEW_BLOCK, blockhash=blockhash, height=height)
+
+        if walletinfo:
+            wallet_state = (
+                walletinfo.get("txcount"),
+                walletinfo.get("balance"),
+                walletinfo.get("unconfirmed_balance"),
+                walletinfo.get("shielded_balance")
+            )
+            if wallet_state != self.wallet_state:
+                previous = self.wallet_state
+                self.wallet_state = wallet_state
+                changed = True
+                if previous is not None:
+                    self.rpc.clear_cache()
+                    self.events.emit(WALLET_CHANGED, txcount=wallet_state[0])
+
+        if mempoolinfo:
+            mempool_state = (mempoolinfo.get("size"), mempoolinfo.get("bytes"))
+            if mempool_state != self.mempool_state:
+                previous = self.mempool_state
+                self.mempool_state = mempool_state
+                changed = True
+                if previous is not None:
+                    self.events.emit(MEMPOOL_CHANGED, size=mempool_state[0])
+
+        return changed
+
+
+    def start_zmq(self):
+        if zmq is None:
+            return
+        credentials = self.rpc.utils.get_rpc_credentials()
+        endpoints = {}
+        if credentials.zmq_hashblock:
+            endpoints[b"hashblock"] = credentials.zmq_hashblock
+        if credentials.zmq_hashtx:
+            endpoints[b"hashtx"] = credentials.zmq_hashtx
+        if endpoints:
+            self.zmq_task = asyncio.ensure_future(self.listen_zmq(endpoints))
+
+
+    async def listen_zmq(self, endpoints):
+        socket = None
+        try:
+            context = zmq.asyncio.Context.instance()
+            socket = context.socket(zmq.SUB)
+            for endpoint in set(endpoints.values()):
+                socket.connect(endpoint)
+            for topic in endpoints:
+                socket.setsockopt(zmq.SUBSCRIBE, topic)
+            self.app.console.event_log(f"✔: ZMQ notifications")
+            while True:
+                await socket.recv_multipart()
+                self.wakeup.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.app.console.error_log(f"ZMQ : {e}")
+        finally:
+            if socket is not None:
+                socket.close(0)
+            self.wakeup.set()
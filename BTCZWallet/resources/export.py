@@ -0,0 +1,124 @@
+import csv
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+EXPORT_CHUNK = 5000
+EXPORT_COLUMNS = (
+    "type", "category", "address", "txid", "amount", "blocks",
+    "fee", "timestamp", "date", "address_balance", "type_balance"
+)
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+
+class CsvWriter():
+    def __init__(self, path):
+        super().__init__()
+
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter():
+    def __init__(self, path):
+        super().__init__()
+
+        self.file = open(path, "w", encoding="utf-8")
+
+
+    def write(self, rows):
+        self.file.writelines(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows
+        )
+
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter():
+    def __init__(self, path):
+        super().__init__()
+
+        self.schema = pyarrow.schema(
+            [
+                ("type", pyarrow.string()),
+                ("category", pyarrow.string()),
+                ("address", pyarrow.string()),
+                ("txid", pyarrow.string()),
+                ("amount", pyarrow.float64()),
+                ("blocks", pyarrow.int64()),
+                ("fee", pyarrow.float64()),
+                ("timestamp", pyarrow.int64()),
+                ("date", pyarrow.string()),
+                ("address_balance", pyarrow.float64()),
+                ("type_balance", pyarrow.float64())
+            ]
+        )
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+
+    def write(self, rows):
+        columns = [list(column) for column in zip(*rows)]
+        self.writer.write_table(pyarrow.Table.from_arrays(columns, schema=self.schema))
+
+
+    def close(self):
+        self.writer.close()
+
+
+class TransactionExporter():
+    def __init__(self, storage):
+        super().__init__()
+
+        self.storage = storage
+
+
+    def get_format(self, path):
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        if extension == "json":
+            extension = "jsonl"
+        if extension not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format '{extension}', use {', '.join(EXPORT_FORMATS)}")
+        if extension == "parquet" and pyarrow is None:
+            raise ValueError("Parquet export requires pyarrow")
+        return extension
+
+
+    def open_writer(self, path):
+        extension = self.get_format(path)
+        if extension == "csv":
+            return CsvWriter(path)
+        elif extension == "jsonl":
+            return JsonLinesWriter(path)
+        return ParquetWriter(path)
+
+
+    def export(self, path, start = None, end = None, address = None, progress = None):
+        writer = self.open_writer(path)
+        total = self.storage.count_export_transactions(start, end, address)
+        written = 0
+        try:
+            for rows in self.storage.iter_export_transactions(start, end, address, EXPORT_CHUNK):
+                writer.write(rows)
+                written += len(rows)
+                if progress:
+                    progress(written, total)
+        finally:
+            writer.close()
+        return written
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+
+from .search import SEARCH_COUNT_LIMIT
+
+
+HISTORY_PAGE_SIZE = 100
+HISTORY_CACHED_PAGES = 10
+HISTORY_SEEK_DISTANCE = 5
+
+
+class TransactionHistory():
+    def __init__(self, storage):
+        super().__init__()
+
+        self.storage = storage
+        self.count = 0
+        self.pages = OrderedDict()
+        self.positions = {0: None}
+        self.loading = set()
+        self.query = None
+        self.capped = False
+        self.generation = 0
+
+
+    async def set_query(self, query):
+        if query is not None and query.is_empty():
+            query = None
+        self.query = query
+        return await self.refresh()
+
+
+    async def refresh(self):
+        self.generation += 1
+        generation = self.generation
+        query = self.query
+        if query is None:
+            count = await self.storage.count_transactions()
+            capped = False
+        else:
+            count = await self.storage.count_search_transactions(query, SEARCH_COUNT_LIMIT)
+            capped = count >= SEARCH_COUNT_LIMIT
+        rows = await self.storage.get_transactions_after(None, HISTORY_PAGE_SIZE, query) if count else []
+        if generation != self.generation:
+            return self.count
+        self.count = count
+        self.capped = capped
+        self.pages.clear()
+        self.positions = {0: None}
+        self.loading.clear()
+        self.store_page(0, rows)
+        return self.count
+
+
+    def wants_more(self, index):
+        return self.capped and index >= self.count - HISTORY_PAGE_SIZE
+
+
+    async def extend(self):
+        if not self.capped:
+            return self.count
+        generation = self.generation
+        limit = self.count + SEARCH_COUNT_LIMIT
+        count = await self.storage.count_search_transactions(self.query, limit)
+        if generation == self.generation:
+            self.count = count
+            self.capped = count >= limit
+        return self.count
+
+
+    def get_row(self, index):
+        if index < 0 or index >= self.count:
+            return None
+        page, offset = divmod(index, HISTORY_PAGE_SIZE)
+        rows = self.pages.get(page)
+        if rows is None:
+            return None
+        self.pages.move_to_end(page)
+        if offset < len(rows):
+            return rows[offset]
+        return None
+
+
+    def is_missing(self, index):
+        page = index // HISTORY_PAGE_SIZE
+        return 0 <= index < self.count and page not in self.pages and page not in self.loading
+
+
+    async def load(self, index):
+        page = index // HISTORY_PAGE_SIZE
+        generation = self.generation
+        self.loading.add(page)
+        try:
+            await self.get_page(page)
+        finally:
+            if generation == self.generation:
+                self.loading.discard(page)
+        return generation == self.generation
+
+
+    async def get_page(self, page):
+        rows = self.pages.get(page)
+        if rows is not None:
+            self.pages.move_to_end(page)
+            return rows
+        generation = self.generation
+        position = await self.find_position(page)
+        if position is None and page > 0:
+            return []
+        rows = await self.storage.get_transactions_after(position, HISTORY_PAGE_SIZE, self.query)
+        if generation == self.generation:
+            self.store_page(page, rows)
+        return rows
+
+
+    def store_page(self, page, rows):
+        if rows:
+            last_row = rows[-1]
+            self.positions[page + 1] = (last_row[7], last_row[8])
+        self.pages[page] = rows
+        while len(self.pages) > HISTORY_CACHED_PAGES:
+            self.pages.popitem(last=False)
+
+
+    async def find_position(self, page):
+        if page in self.positions:
+            return self.positions[page]
+        generation = self.generation
+        known = max(known for known in self.positions if known < page)
+        if page - known > HISTORY_SEEK_DISTANCE:
+            position = await self.storage.get_transaction_position(page * HISTORY_PAGE_SIZE - 1, self.query)
+            if generation == self.generation:
+                self.positions[page] = position
+            return position
+        for step in range(known, page):
+            await self.get_page(step)
+        return self.positions.get(page)
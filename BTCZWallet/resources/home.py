@@ -14,6 +14,11 @@ from toga.style.pack import Pack
 from toga.constants import COLUMN, BOLD, CENTER
 from toga.colors import rgb, WHITE, RED, BLACK
 
+from .events import NEW_BLOCK, TRANSACTIONS_CHANGED
+from .scheduler import TASK_PRIORITY_LOW
+from .storage import StorageTxs
+from .timeline import BalanceHistory
+
 
 class Languages(Window):
     def __init__(self, main:Window, settings, utils, tr, font):
@@ -315,6 +320,8 @@ class Home(Box):
         self.deprecation = None
         self.market_retrieved = None
 
+        self.balance_history = BalanceHistory(StorageTxs(self.app))
+
         html_path = Path(__file__).parent / "html" / "home.html"
         self.market_output = WebView(
             app=self.app,
@@ -327,80 +334,94 @@ class Home(Box):
     def insert_widgets(self):
         if not self.home_toggle:
             self.home_toggle = True
-            self.app.loop.create_task(self.update_marketcap())
-            self.app.loop.create_task(self.update_marketchart())
-            self.app.loop.create_task(self.update_circulating_supply())
-            self.app.loop.create_task(self.update_remaining_deprecation())
+            scheduler = self.main.scheduler
+            scheduler.register(
+                "Market cap", self.update_marketcap, 601, TASK_PRIORITY_LOW,
+                max_interval=601
+            )
+            scheduler.register(
+                "Market curve", self.update_marketchart, 602, TASK_PRIORITY_LOW,
+                needs_ui=True, max_interval=602
+            )
+            scheduler.register(
+                "Circulating supply", self.update_circulating_supply, 10, TASK_PRIORITY_LOW,
+                needs_ui=True, events=(NEW_BLOCK,)
+            )
+            scheduler.register(
+                "Remaining deprecation", self.update_remaining_deprecation, 10, TASK_PRIORITY_LOW,
+                needs_ui=True, events=(NEW_BLOCK,)
+            )
+            scheduler.register(
+                "Balance chart", self.update_balance_chart, 60, TASK_PRIORITY_LOW,
+                needs_ui=True, events=(TRANSACTIONS_CHANGED,)
+            )
         
         
 
     async def update_circulating_supply(self):
-        self.app.console.event_log(f"✔: Circulating supply")
-        while True:
-            if self.current_blocks:
-                self.circulating = self.units.calculate_circulating(int(self.current_blocks))
-                remaining_blocks = self.units.remaining_blocks_until_halving(int(self.current_blocks))
-                remaining_days = self.units.remaining_days_until_halving(int(self.current_blocks))
-                circulating = int(self.circulating)
-
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setCirculating('{circulating}');")
-                blocks_text = self.tr.text("blocks_label")
-                days_text = self.tr.text("days_label")
-                circulating_percentage = f"{(self.circulating / 21_000_000_000) * 100:.1f} %"
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setCirculatingTooltip('{circulating_percentage}');")
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(
-                    f"setNextHalving('{remaining_blocks} {blocks_text} / {remaining_days} {days_text}');"
-                )
-            await asyncio.sleep(10)
+        if not self.current_blocks:
+            return
+        self.circulating = self.units.calculate_circulating(int(self.current_blocks))
+        remaining_blocks = self.units.remaining_blocks_until_halving(int(self.current_blocks))
+        remaining_days = self.units.remaining_days_until_halving(int(self.current_blocks))
+        circulating = int(self.circulating)
+
+        self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setCirculating('{circulating}');")
+        blocks_text = self.tr.text("blocks_label")
+        days_text = self.tr.text("days_label")
+        circulating_percentage = f"{(self.circulating / 21_000_000_000) * 100:.1f} %"
+        self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setCirculatingTooltip('{circulating_percentage}');")
+        self.market_output.control.CoreWebView2.ExecuteScriptAsync(
+            f"setNextHalving('{remaining_blocks} {blocks_text} / {remaining_days} {days_text}');"
+        )
+        return self.current_blocks
 
 
     async def update_remaining_deprecation(self):
-        self.app.console.event_log(f"✔: Remaining deprecation")
-        while True:
-            if self.current_blocks:
-                remaining_blocks = self.units.remaining_blocks_until_deprecation(int(self.deprecation), int(self.current_blocks))
-                remaining_days = self.units.remaining_days_until_deprecation(int(self.deprecation), int(self.current_blocks))
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(
-                    f"setDeprecation('{remaining_blocks} Blocks / {remaining_days} Days');"
-                )
-            await asyncio.sleep(10)
+        if not self.current_blocks:
+            return
+        remaining_blocks = self.units.remaining_blocks_until_deprecation(int(self.deprecation), int(self.current_blocks))
+        remaining_days = self.units.remaining_days_until_deprecation(int(self.deprecation), int(self.current_blocks))
+        self.market_output.control.CoreWebView2.ExecuteScriptAsync(
+            f"setDeprecation('{remaining_blocks} Blocks / {remaining_days} Days');"
+        )
+        return self.current_blocks
 
 
     async def update_marketcap(self):
-        self.app.console.event_log(f"✔: Market cap")
-        while True:
-            data = await self.utils.fetch_marketcap()
-            if data:
-                market_price = data["market_data"]["current_price"][self.settings.currency()]
-                market_cap = data["market_data"]["market_cap"][self.settings.currency()]
-                market_volume = data["market_data"]["total_volume"][self.settings.currency()]
-                price_percentage_24 = data["market_data"]["price_change_percentage_24h"]
-                price_percentage_7d = data["market_data"]["price_change_percentage_7d"]
-                
-                btcz_price = self.units.format_price(market_price)
-                self.settings.update_settings("btcz_price", btcz_price)
-
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setBTCZPrice('{self.settings.symbol()} {btcz_price}');")
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setChange24h('{price_percentage_24} %');")
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setChange7d('{price_percentage_7d} %');")
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setMarketCap('{self.settings.symbol()} {market_cap}');")
-                self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setVolume('{self.settings.symbol()} {market_volume}');")
-
-            await asyncio.sleep(601)
+        data = await self.utils.fetch_marketcap()
+        if data:
+            market_price = data["market_data"]["current_price"][self.settings.currency()]
+            market_cap = data["market_data"]["market_cap"][self.settings.currency()]
+            market_volume = data["market_data"]["total_volume"][self.settings.currency()]
+            price_percentage_24 = data["market_data"]["price_change_percentage_24h"]
+            price_percentage_7d = data["market_data"]["price_change_percentage_7d"]
+            
+            btcz_price = self.units.format_price(market_price)
+            self.settings.update_settings("btcz_price", btcz_price)
+
+            self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setBTCZPrice('{self.settings.symbol()} {btcz_price}');")
+            self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setChange24h('{price_percentage_24} %');")
+            self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setChange7d('{price_percentage_7d} %');")
+            self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setMarketCap('{self.settings.symbol()} {market_cap}');")
+            self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setVolume('{self.settings.symbol()} {market_volume}');")
 
 
     async def update_marketchart(self):
-        self.app.console.event_log(f"✔: Market curve")
-        while True:
-            data = await self.utils.fetch_marketchart()
-            currency = self.settings.currency().upper()
-            if not data:
-                if not self.market_retrieved:
-                    js_data = f'generateData([], "{currency}");'
-            else:
-                self.market_retrieved = True
-                js_data = f'generateData({json.dumps(data)}, "{currency}");'
-
-            self.market_output.control.CoreWebView2.ExecuteScriptAsync(js_data)
-
-            await asyncio.sleep(602)
\ No newline at end of file
+        data = await self.utils.fetch_marketchart()
+        currency = self.settings.currency().upper()
+        if not data:
+            if not self.market_retrieved:
+                js_data = f'generateData([], "{currency}");'
+        else:
+            self.market_retrieved = True
+            js_data = f'generateData({json.dumps(data)}, "{currency}");'
+
+        self.market_output.control.CoreWebView2.ExecuteScriptAsync(js_data)
+
+
+    async def update_balance_chart(self):
+        hidden = self.settings.hidden_balances()
+        points = [] if hidden else await self.main.async_storage.read(self.balance_history.series, "day")
+        self.market_output.control.CoreWebView2.ExecuteScriptAsync(f"setBalanceHistory({json.dumps(points)});")
+        return hidden, len(points), points[-1] if points else None
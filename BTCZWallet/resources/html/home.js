@@ -1,6 +1,7 @@
 
 let btczChart;
 let chartFailed = false;
+let balanceChart;
 
 function generateData(prices, currency) {
   const ctx = document.getElementById('btczChart').getContext('2d');
@@ -118,6 +119,67 @@ function generateData(prices, currency) {
 }
 
 
+function setBalanceHistory(points) {
+  const ctx = document.getElementById('balanceChart').getContext('2d');
+  const labels = points.map(p => new Date(p[0] * 1000).toISOString().slice(0, 10));
+  const transparent = points.map(p => p[1]);
+  const shielded = points.map(p => p[2]);
+
+  if (balanceChart) {
+    balanceChart.data.labels = labels;
+    balanceChart.data.datasets[0].data = transparent;
+    balanceChart.data.datasets[1].data = shielded;
+    balanceChart.update();
+    return;
+  }
+
+  balanceChart = new Chart(ctx, {
+    type: 'line',
+    data: {
+      labels: labels,
+      datasets: [
+        {
+          label: 'Transparent',
+          data: transparent,
+          borderColor: 'rgba(3, 240, 252, 0.9)',
+          backgroundColor: 'rgba(3, 240, 252, 0.1)',
+          fill: true,
+          stepped: true,
+          borderWidth: 1.5,
+          pointRadius: 0
+        },
+        {
+          label: 'Shielded',
+          data: shielded,
+          borderColor: 'rgba(237, 58, 58, 0.9)',
+          backgroundColor: 'rgba(237, 58, 58, 0.1)',
+          fill: true,
+          stepped: true,
+          borderWidth: 1.5,
+          pointRadius: 0
+        }
+      ]
+    },
+    options: {
+      maintainAspectRatio: false,
+      animation: false,
+      interaction: { mode: 'index', intersect: false },
+      plugins: {
+        legend: { display: true, labels: { color: '#9aa4b2', boxWidth: 12 } },
+        tooltip: {
+          backgroundColor: 'rgba(0,0,0,0.7)',
+          callbacks: { label: ctx => `${ctx.dataset.label} ${ctx.parsed.y.toFixed(8)} BTCZ` }
+        }
+      },
+      scales: {
+        x: { grid: { display: false }, ticks: { color: '#9aa4b2', maxTicksLimit: 8 } },
+        y: { grid: { color: 'rgba(255,255,255,0.05)' }, ticks: { color: '#9aa4b2' } }
+      }
+    }
+  });
+}
+
+
 function setBTCZPrice(value) {
   document.getElementById('btczPrice').textContent = value ?? '--';
 }
@@ -0,0 +1,128 @@
+import math
+
+from toga import App
+
+from .storage import StorageTxs, StorageMessages, StorageMobile
+
+
+INDEX_TRANSPARENT = "transparent"
+INDEX_SHIELDED = "shielded"
+INDEX_MEMOS = "memos"
+INDEX_MOBILE_TADDRESS = "taddress"
+INDEX_MOBILE_ZADDRESS = "zaddress"
+
+INDEX_BLOOM_THRESHOLD = 250000
+INDEX_BLOOM_ERROR_RATE = 0.001
+INDEX_BLOOM_HEADROOM = 2
+
+
+class BloomFilter():
+    def __init__(self, capacity, error_rate):
+        super().__init__()
+
+        self.capacity = max(capacity, 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+
+    def positions(self, key):
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        first = value & 0xFFFFFFFF
+        second = (value >> 32) | 1
+        return [(first + step * second) % self.size for step in range(self.hashes)]
+
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class TxIndex():
+    def __init__(self, app:App, async_storage):
+        super().__init__()
+
+        self.app = app
+        self.async_storage = async_storage
+        self.storagetxs = StorageTxs(self.app)
+        self.storagemsgs = StorageMessages(self.app)
+        self.storage_mobile = StorageMobile(self.app)
+
+        self.sets = {}
+        self.blooms = {}
+        self.loaded = set()
+        self.versions = {}
+
+
+    def read_index(self, name):
+        if name in (INDEX_TRANSPARENT, INDEX_SHIELDED):
+            count = self.storagetxs.count_transactions(name)
+            keys = self.storagetxs.iter_transaction_keys(name)
+            if count > INDEX_BLOOM_THRESHOLD:
+                bloom = BloomFilter(count * INDEX_BLOOM_HEADROOM, INDEX_BLOOM_ERROR_RATE)
+                for key in keys:
+                    bloom.add(key)
+                return bloom
+            return set(keys)
+        elif name == INDEX_MEMOS:
+            return set(self.storagemsgs.get_txs())
+        return set(self.storage_mobile.get_addresses_list(name))
+
+
+    async def load(self, name):
+        while name not in self.loaded:
+            version = self.versions.get(name, 0)
+            index = await self.async_storage.read(self.read_index, name)
+            if name in self.loaded or version != self.versions.get(name, 0):
+                continue
+            if isinstance(index, BloomFilter):
+                self.blooms[name] = index
+            else:
+                self.sets[name] = index
+            self.loaded.add(name)
+
+
+    def invalidate(self, name):
+        self.versions[name] = self.versions.get(name, 0) + 1
+        self.loaded.discard(name)
+        self.sets.pop(name, None)
+        self.blooms.pop(name, None)
+
+
+    async def members(self, name):
+        await self.load(name)
+        return self.sets.get(name, set())
+
+
+    async def known(self, name, keys):
+        keys = set(keys)
+        await self.load(name)
+        if name in self.sets:
+            return keys & self.sets[name]
+        bloom = self.blooms[name]
+        candidates = {key for key in keys if key in bloom}
+        if not candidates:
+            return candidates
+        stored = await self.async_storage.read(
+            self.storagetxs.get_transaction_keys, [key[0] for key in candidates], name
+        )
+        return candidates & stored
+
+
+    def add(self, name, key):
+        if name in self.sets:
+            self.sets[name].add(key)
+        elif name in self.blooms:
+            bloom = self.blooms[name]
+            bloom.add(key)
+            if bloom.count >= bloom.capacity:
+                self.invalidate(name)
@@ -29,10 +29,12 @@ from .receive import Receive
 from .send import Send
 from .messages import Messages, EditUser
 from .mining import Mining
-from .storage import StorageMessages, StorageAddresses
+from .storage import StorageMessages, StorageAddresses, AsyncStorage
 from .network import Peer, AddNode, TorConfig
 from .mobile import Mobile
 from .server import MobileServer
+from .scheduler import TaskScheduler, TASK_PRIORITY_HIGH, TASK_PRIORITY_LOW
+from .index import TxIndex
 
 
 user32 = ctypes.windll.user32
@@ -85,6 +87,9 @@ class Menu(Window):
 
         self.storage = StorageMessages(self.app)
         self.addresses_storage = StorageAddresses(self.app)
+        self.async_storage = AsyncStorage(self.app)
+        self.scheduler = TaskScheduler(self.app, self, self.rpc.events)
+        self.tx_index = TxIndex(self.app, self.async_storage)
         self.statusbar = AppStatusBar(self.app, self, settings, utils, units, rpc, tr, font)
         self.wallet = Wallet(self.app, self, settings, units, rpc, tr, font)
         self.home_page = Home(self.app, self, settings, utils, units, tr, font)
@@ -330,8 +335,10 @@ class Menu(Window):
         self.app.loop.create_task(self.transactions_page.run_tasks())
         await asyncio.sleep(1)
         self.app.loop.create_task(self.message_page.gather_unread_memos())
-        await asyncio.sleep(1)
-        self.app.loop.create_task(self.count_unread_messages())
+        self.scheduler.register(
+            "Unread messages", self.count_unread_messages, 5, TASK_PRIORITY_LOW,
+            needs_ui=True
+        )
 
 
     def add_actions_cmds(self):
@@ -395,7 +402,8 @@ class Menu(Window):
         else:
             self.toolbar.hide_balances_cmd.checked = True
             self.settings.update_settings("hidden_balances", True)
-        self.transactions_page.reload_transactions()
+        self.transactions_page.set_hidden_balances(self.toolbar.hide_balances_cmd.checked)
+        self.app.loop.create_task(self.home_page.update_balance_chart())
 
 
     def update_notifications_txs(self, sender, event):
@@ -487,7 +495,7 @@ class Menu(Window):
                 self.mining_page.reload_addresses()
         new_address,_ = await self.rpc.getNewAddress()
         if new_address:
-            self.addresses_storage.insert_address("transparent", None, new_address, 0.0)
+            await self.wallet.balances.add_address("transparent", new_address)
             message = self.tr.message("newaddress_dialog")
             self.info_dialog(
                 title=self.tr.title("newaddress_dialog"),
@@ -503,7 +511,7 @@ class Menu(Window):
                 self.mining_page.reload_addresses()
         new_address,_ = await self.rpc.z_getNewAddress()
         if new_address:
-            self.addresses_storage.insert_address("shielded", None, new_address, 0.0)
+            await self.wallet.balances.add_address("shielded", new_address)
             message = self.tr.message("newaddress_dialog")
             self.info_dialog(
                 title=self.tr.title("newaddress_dialog"),
@@ -542,26 +550,28 @@ class Menu(Window):
 
     async def count_unread_messages(self):
         text = self.tr.text("messages_button")
-        while True:
-            unread_messages = self.storage.get_unread_messages()
-            if unread_messages:
-                count = len(unread_messages)
-                if count > 99:
-                    count = "99+"
-                self.message_button.text = f"{text} [{count}]"
-            else:
-                self.message_button.text = text
-            if self.message_button_toggle:
-                icon = "images/messages_a.png"
-            else:
-                icon = "images/messages_i.png"
-            message_icon = self.menu_icon(icon)
-            self.message_button._impl.native.Image = Drawing.Image.FromFile(message_icon)
-
-            await asyncio.sleep(5)
+        unread_messages = self.storage.get_unread_messages()
+        if unread_messages:
+            count = len(unread_messages)
+            if count > 99:
+                count = "99+"
+            self.message_button.text = f"{text} [{count}]"
+        else:
+            self.message_button.text = text
+        if self.message_button_toggle:
+            icon = "images/messages_a.png"
+        else:
+            icon = "images/messages_i.png"
+        message_icon = self.menu_icon(icon)
+        self.message_button._impl.native.Image = Drawing.Image.FromFile(message_icon)
+        return len(unread_messages or []), self.message_button_toggle
 
 
     def clean_unread_messages(self):
+        self.app.loop.create_task(self.move_unread_messages())
+
+
+    async def move_unread_messages(self):
         unread_messages = self.storage.get_unread_messages()
         if unread_messages:
             for data in unread_messages:
@@ -570,8 +580,8 @@ class Menu(Window):
                 text = data[2]
                 amount = data[3]
                 timestamp = data[4]
-                self.storage.message(contact_id, author, text, amount, timestamp)
-            self.storage.delete_unread()
+                await self.async_storage.messages.message(contact_id, author, text, amount, timestamp)
+            await self.async_storage.messages.delete_unread()
 
 
     def backup_messages(self, sender, event):
@@ -669,6 +679,8 @@ class Menu(Window):
                 self.home_page.clear_cache()
                 self.notify.hide()
                 self.notify.dispose()
+                await self.async_storage.close()
+                await self.rpc.close_session()
                 self.app.exit()
 
 
@@ -975,16 +987,16 @@ class Menu(Window):
         self.app.console.info_log(f"Show app notifcation...")
         self.notify.show()
         self._impl.native.TopMost = False
-        self.app.loop.create_task(self.read_uri_file())
+        self.scheduler.register(
+            "URI file", self.read_uri_file, 3, TASK_PRIORITY_HIGH, max_interval=3
+        )
 
 
     async def read_uri_file(self):
-        while True:
-            address, amount = self.utils.get_uri_from_txt()
-            if address and amount:
-                await self.show_send_page(address, amount)
-                self.utils.clear_uri_txt()
-            await asyncio.sleep(3)
+        address, amount = self.utils.get_uri_from_txt()
+        if address and amount:
+            await self.show_send_page(address, amount)
+            self.utils.clear_uri_txt()
 
 
     def start_resize(self, hit_test_value):
@@ -29,6 +29,10 @@ from toga.colors import (
 )
 
 from .storage import StorageMessages  
+from .client import RPC_PRIORITY_INTERACTIVE
+from .events import NEW_BLOCK, WALLET_CHANGED, SAFETY_POLL_INTERVAL
+from .scheduler import TASK_PRIORITY_LOW
+from .index import INDEX_MEMOS
 
 
 
@@ -165,7 +169,7 @@ class EditUser(Window):
             self.confirm_button
         )
 
-    def verify_username(self, button):
+    async def verify_username(self, button):
         if not self.username_input.value:
             self.error_dialog(
                 title="Missing Username",
@@ -181,7 +185,7 @@ class EditUser(Window):
             self.username_input.focus()
             return
         username = self.username_input.value
-        self.storage.edit_username(self.username, username)
+        await self.main.async_storage.messages.edit_username(self.username, username)
         self.info_dialog(
             title="Updated Successfully",
             message="Your username has been successfully updated."
@@ -365,8 +369,8 @@ class Indentifier(Window):
         if messages_address:
             prv_key, _= await self.rpc.z_ExportKey(messages_address)
             if prv_key:
-                self.storage.key(prv_key)
-            self.storage.identity(category, username, messages_address)
+                await self.main.async_storage.messages.key(prv_key)
+            await self.main.async_storage.messages.identity(category, username, messages_address)
             self.info_dialog(
                 title="Identity Setup Complete!",
                 message=f"Success! Your new identity has been securely set up with the username:\n\n"
@@ -649,7 +653,7 @@ class Contact(Box):
 
 
     def ban_contact(self):
-        def on_result(widget, result):
+        async def on_result(widget, result):
             def on_second_result(widget, result):
                 if result is None:
                     if self.chat.selected_contact_toggle:
@@ -660,8 +664,8 @@ class Contact(Box):
                         self.chat.last_unread_timestamp = None
                         self.chat.selected_contact_toggle = None
             if result is True:
-                self.storage.ban(self.address, self.username)
-                self.storage.delete_contact(self.address)
+                await self.main.async_storage.messages.ban(self.address, self.username)
+                await self.main.async_storage.messages.delete_contact(self.address)
                 self.chat.contacts_box.remove(self)
                 self.main.mobile_server.broker.push("update_contacts")
                 self.main.info_dialog(
@@ -824,50 +828,44 @@ class Pending(Box):
         memo = {"type":"identity","category":category,"id":id,"username":username,"address":address}
         memo_str = json.dumps(memo)
         self.pending_window._impl.native.Enabled = False
-        await self.send_memo(
-            address,
-            destination_address,
-            amount,
-            txfee,
-            memo_str,
-            id
-        )
+        with self.rpc.priority(RPC_PRIORITY_INTERACTIVE):
+            await self.send_memo(
+                address,
+                destination_address,
+                amount,
+                txfee,
+                memo_str,
+                id
+            )
 
 
     async def send_memo(self, address, toaddress, amount, txfee, memo, id):
         operation, _= await self.rpc.SendMemo(address, toaddress, amount, txfee, memo)
         if operation:
-            transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            self.storage.delete_pending(self.address)
-                            self.storage.add_contact(self.category, id, self.contact_id, self.username, self.address)
-                            self.pending_window.pending_list_box.remove(self)
-                            self.pending_window.info_dialog(
-                                title="New Contact Added",
-                                message="The contact has been successfully stored in the list."
-                            )
-                            self.pending_window._impl.native.Enabled = True
-                            self.main.mobile_server.broker.push("update_contacts")
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self.pending_window._impl.native.Enabled = True
+            transaction_result = await self.rpc.operations.wait(operation)
+            if transaction_result.get('status') == "success":
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
+                await self.main.async_storage.messages.delete_pending(self.address)
+                await self.main.async_storage.messages.add_contact(self.category, id, self.contact_id, self.username, self.address)
+                self.pending_window.pending_list_box.remove(self)
+                self.pending_window.info_dialog(
+                    title="New Contact Added",
+                    message="The contact has been successfully stored in the list."
+                )
+                self.pending_window._impl.native.Enabled = True
+                self.main.mobile_server.broker.push("update_contacts")
+            else:
+                self.pending_window._impl.native.Enabled = True
         else:
             self.pending_window._impl.native.Enabled = True
 
 
-    def reject_button_click(self, button):
-        self.storage.ban(self.address, self.username)
-        self.storage.delete_pending(self.address)
+    async def reject_button_click(self, button):
+        await self.main.async_storage.messages.ban(self.address, self.username)
+        await self.main.async_storage.messages.delete_pending(self.address)
         self.pending_window.pending_list_box.remove(self)
 
 
@@ -967,8 +965,8 @@ class Banned(Box):
         )
 
 
-    def unban_button_click(self, button):
-        self.storage.delete_ban(self.address)
+    async def unban_button_click(self, button):
+        await self.banned_window.main.async_storage.messages.delete_ban(self.address)
         self.banned_window.banned_list_box.remove(self)
 
 
@@ -1173,7 +1171,8 @@ class NewContact(Window):
                 message=self.tr.message("addressisbanned_dialog")
             )
             return
-        self.app.loop.create_task(self.send_request())
+        with self.rpc.priority(RPC_PRIORITY_INTERACTIVE):
+            self.app.loop.create_task(self.send_request())
 
 
     async def send_request(self):
@@ -1198,27 +1197,20 @@ class NewContact(Window):
     async def send_memo(self, address, toaddress, amount, txfee, memo, id):
         operation, _= await self.rpc.SendMemo(address, toaddress, amount, txfee, memo)
         if operation:
-            transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            self.storage.add_request(id, toaddress)
-                            self.info_dialog(
-                                title="Request sent",
-                                message="The request has been sent successfully to the address."
-                            )
-                            self.close()
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self._impl.native.Enabled = True
+            transaction_result = await self.rpc.operations.wait(operation)
+            if transaction_result.get('status') == "success":
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
+                await self.main.async_storage.messages.add_request(id, toaddress)
+                self.info_dialog(
+                    title="Request sent",
+                    message="The request has been sent successfully to the address."
+                )
+                self.close()
+            else:
+                self._impl.native.Enabled = True
         else:
             self._impl.native.Enabled = True
 
@@ -1958,9 +1950,20 @@ class Chat(Box):
 
 
     def run_tasks(self):
-        self.app.loop.create_task(self.update_messages_balance())
-        self.app.loop.create_task(self.waiting_new_memos())
-        self.app.loop.create_task(self.update_contacts_list())
+        self.contacts = []
+        scheduler = self.main.scheduler
+        scheduler.register(
+            "Update messages balance", self.update_messages_balance, SAFETY_POLL_INTERVAL, TASK_PRIORITY_LOW,
+            needs_ui=True, needs_node=True, events=(NEW_BLOCK, WALLET_CHANGED)
+        )
+        scheduler.register(
+            "Gather memos", self.sync_new_memos, SAFETY_POLL_INTERVAL,
+            needs_node=True, events=(WALLET_CHANGED,)
+        )
+        scheduler.register(
+            "Contacts list", self.update_contacts_list, 5, TASK_PRIORITY_LOW,
+            needs_ui=True
+        )
         self.load_pending_list()
 
 
@@ -1977,52 +1980,39 @@ class Chat(Box):
 
 
     async def update_messages_balance(self):
-        self.app.console.event_log(f"✔: Update messages balance")
-        while True:
-            if not self.main.message_button_toggle:
-                await asyncio.sleep(1)
-                continue
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            address = self.storage.get_identity("address")
-            if address:
-                balance, _= await self.rpc.z_getBalance(address[0])
-                if balance:
-                    text = self.tr.text("address_balance")
-                    balance = self.units.format_balance(balance)
-                    if self.rtl:
-                        balance = self.units.arabic_digits(balance)
-                    self.address_balance.text = f"{text} {balance}"
-            
-            await asyncio.sleep(5)
-            
-
-    async def waiting_new_memos(self):
-        self.app.console.event_log(f"✔: Gather memos")
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            address = self.storage.get_identity("address")
-            if address:
-                listunspent, _= await self.rpc.z_listUnspent(address[0], 0)
-                if listunspent:
-                    self.count_list_unspent(listunspent)
-                    list_txs = self.storage.get_txs()
-                    for data in listunspent:
-                        txid = data['txid']
-                        if txid not in list_txs:
-                            await self.unhexlify_memo(data)
-                            
-                    if len(listunspent) >= 20:
-                        total_balance,_ = await self.rpc.z_getBalance(address[0])
-                        merge_fee = Decimal('0.0002')
-                        txfee = Decimal('0.0001')
-                        amount = Decimal(total_balance) - merge_fee
-                        await self.merge_utxos(address[0], amount, txfee)
-
-            await asyncio.sleep(5)
+        if not self.main.message_button_toggle:
+            return
+        address = self.storage.get_identity("address")
+        if address:
+            balance, _= await self.rpc.z_getBalance(address[0])
+            if balance:
+                text = self.tr.text("address_balance")
+                balance = self.units.format_balance(balance)
+                if self.rtl:
+                    balance = self.units.arabic_digits(balance)
+                self.address_balance.text = f"{text} {balance}"
+            return balance
+
+
+    async def sync_new_memos(self):
+        address = self.storage.get_identity("address")
+        if address:
+            listunspent, _= await self.rpc.z_listUnspent(address[0], 0)
+            if listunspent:
+                self.count_list_unspent(listunspent)
+                list_txs = await self.main.tx_index.known(INDEX_MEMOS, (data['txid'] for data in listunspent))
+                for data in listunspent:
+                    txid = data['txid']
+                    if txid not in list_txs:
+                        await self.unhexlify_memo(data)
+
+                if len(listunspent) >= 20:
+                    total_balance,_ = await self.rpc.z_getBalance(address[0])
+                    merge_fee = Decimal('0.0002')
+                    txfee = Decimal('0.0001')
+                    amount = Decimal(total_balance) - merge_fee
+                    await self.merge_utxos(address[0], amount, txfee)
+                return len(listunspent)
 
 
     def count_list_unspent(self, listunspent):
@@ -2040,22 +2030,12 @@ class Chat(Box):
         memo = "merge"
         operation, _= await self.rpc.SendMemo(address, address, amount, txfee, memo)
         if operation:
-            transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            status = transaction_result[0].get('status')
-                            result = transaction_result[0].get('result', {})
-                            if status == "failed":
-                                    return
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            return
-                        await asyncio.sleep(3)
+            transaction_result = await self.rpc.operations.wait(operation)
+            if transaction_result.get('status') == "success":
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
 
 
     async def unhexlify_memo(self, data):
@@ -2070,26 +2050,29 @@ class Chat(Box):
             form_type = form_dict.get('type')
 
             if form_type == "identity":
-                self.get_identity(form_dict)
+                await self.get_identity(form_dict)
 
             elif form_type == "message":
-                self.get_message(form_dict, amount)
+                await self.get_message(form_dict, amount)
             
             elif form_type == "edit":
-                self.edit_message(form_dict)
+                await self.edit_message(form_dict)
 
             elif form_type == "request":
-                self.get_request(form_dict)
+                await self.get_request(form_dict)
 
-            self.storage.tx(txid)
+            await self.main.async_storage.messages.tx(txid)
+            self.main.tx_index.add(INDEX_MEMOS, txid)
 
         except (binascii.Error, json.decoder.JSONDecodeError):
-            self.storage.tx(txid)
+            await self.main.async_storage.messages.tx(txid)
+            self.main.tx_index.add(INDEX_MEMOS, txid)
         except Exception:
-            self.storage.tx(txid)
+            await self.main.async_storage.messages.tx(txid)
+            self.main.tx_index.add(INDEX_MEMOS, txid)
 
 
-    def get_identity(self, form):
+    async def get_identity(self, form):
         category = form.get('category')
         contact_id = form.get('id')
         username = form.get('username')
@@ -2099,8 +2082,8 @@ class Chat(Box):
             return
         id = self.storage.get_request(address)
         if id:
-            self.storage.add_contact(category, id[0], contact_id, username, address)
-            self.storage.delete_request(address)
+            await self.main.async_storage.messages.add_contact(category, id[0], contact_id, username, address)
+            await self.main.async_storage.messages.delete_request(address)
             if self.settings.notification_messages():
                 self.notify.send_note(
                     title="Request Accepted",
@@ -2109,7 +2092,7 @@ class Chat(Box):
             self.main.mobile_server.broker.push("update_contacts")
 
 
-    def get_message(self, form, amount):
+    async def get_message(self, form, amount):
         replied = None
         contact_id = form.get('id')
         author = form.get('username')
@@ -2122,12 +2105,12 @@ class Chat(Box):
             return
         self.processed_timestamps.add(timestamp)
         if author != contact_username:
-            self.storage.update_contact_username(author, contact_id)
+            await self.main.async_storage.messages.update_contact_username(author, contact_id)
         if self.contact_id == contact_id and self.main.message_button_toggle and not self.main._is_minimized and self.main._is_active:
-            self.storage.message(contact_id, author, message, amount, timestamp, None, replied)
+            await self.main.async_storage.messages.message(contact_id, author, message, amount, timestamp, None, replied)
             self.username_value.text = author
         else:
-            self.storage.unread_message(contact_id, author, message, amount, timestamp, None, replied)
+            await self.main.async_storage.messages.unread_message(contact_id, author, message, amount, timestamp, None, replied)
             if self.settings.notification_messages():
                 self.notify.send_note(
                     title="New Message",
@@ -2137,7 +2120,7 @@ class Chat(Box):
 
 
 
-    def edit_message(self, form):
+    async def edit_message(self, form):
         contact_id = form.get('id')
         message = form.get('text')
         timestamp = form.get('timestamp')
@@ -2150,16 +2133,16 @@ class Chat(Box):
         if not is_message and not is_unread_message:
             return
         if is_message:
-            self.storage.update_message(contact_id, message, timestamp, edited_timestamp)
+            await self.main.async_storage.messages.update_message(contact_id, message, timestamp, edited_timestamp)
         elif is_unread_message:
-            self.storage.update_unread_message(contact_id, message, timestamp, edited_timestamp)
+            await self.main.async_storage.messages.update_unread_message(contact_id, message, timestamp, edited_timestamp)
         if self.contact_id == contact_id:
             timestamp_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
             edited_timestamp_str = datetime.fromtimestamp(edited_timestamp).strftime('%Y-%m-%d %H:%M:%S')
             self.control_edit_message(timestamp_str, message, edited_timestamp_str)
 
 
-    def get_request(self, form):
+    async def get_request(self, form):
         category = form.get('category')
         contact_id = form.get('id')
         username = form.get('username')
@@ -2167,7 +2150,7 @@ class Chat(Box):
         banned = self.storage.get_banned(True)
         if address in banned:
             return
-        self.storage.add_pending(category, contact_id, username, address)
+        await self.main.async_storage.messages.add_pending(category, contact_id, username, address)
         if not self.pending_toggle:
             self.update_pending_list()
         else:
@@ -2240,7 +2223,7 @@ class Chat(Box):
 
     def on_scroll_bottom(self):
         if not self.loading_toggle:
-            self.clean_unread_messages()
+            self.app.loop.create_task(self.clean_unread_messages())
 
 
     def on_scroll_top(self):
@@ -2366,42 +2349,38 @@ class Chat(Box):
             
 
     async def update_contacts_list(self):
-        self.app.console.event_log(f"✔: Contacts list")
-        self.contacts = []
-        while True:
-            if not self.main.message_button_toggle:
-                await asyncio.sleep(1)
-                continue
-            contacts = self.storage.get_contacts()
-            if contacts:
-                for data in contacts:
-                    try:
-                        contact_id = data[2]
-                        address = data[4]
-                        if contact_id not in self.contacts:
-                            contact = Contact(
-                                data, self.app, self, self.main, self.utils, self.units, self.rpc, self.settings, self.tr, self.font
-                            )
-                            contact._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
-                                sender, event, contact_id, address)
-                            contact.category_icon._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
-                                sender, event, contact_id, address)
-                            contact.username_label._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
-                                sender, event, contact_id, address)
-                            contact.unread_messages._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
-                                sender, event, contact_id, address)
-                            
-                            self.contacts_box.add(
-                                contact
-                            )
-                            self.contacts.append(contact_id)
-                    except IndexError:
-                        print(f"Skipping contact due to missing data: {data}")
-                        continue
-                    except Exception as e:
-                        print(f"Unexpected error: {e}, data: {data}")
-                        continue
-            await asyncio.sleep(5)
+        if not self.main.message_button_toggle:
+            return
+        contacts = self.storage.get_contacts()
+        if contacts:
+            for data in contacts:
+                try:
+                    contact_id = data[2]
+                    address = data[4]
+                    if contact_id not in self.contacts:
+                        contact = Contact(
+                            data, self.app, self, self.main, self.utils, self.units, self.rpc, self.settings, self.tr, self.font
+                        )
+                        contact._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
+                            sender, event, contact_id, address)
+                        contact.category_icon._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
+                            sender, event, contact_id, address)
+                        contact.username_label._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
+                            sender, event, contact_id, address)
+                        contact.unread_messages._impl.native.Click += lambda sender, event, contact_id=contact_id, address=address:self.contact_click(
+                            sender, event, contact_id, address)
+                        
+                        self.contacts_box.add(
+                            contact
+                        )
+                        self.contacts.append(contact_id)
+                except IndexError:
+                    print(f"Skipping contact due to missing data: {data}")
+                    continue
+                except Exception as e:
+                    print(f"Unexpected error: {e}, data: {data}")
+                    continue
+        return len(self.contacts)
 
 
     def load_pending_list(self):
@@ -2636,7 +2615,7 @@ class Chat(Box):
             await asyncio.sleep(3)
 
 
-    def clean_unread_messages(self):
+    async def clean_unread_messages(self):
         unread_messages = self.storage.get_unread_messages(self.contact_id)
         if unread_messages:
             for data in unread_messages:
@@ -2646,9 +2625,9 @@ class Chat(Box):
                 timestamp = data[3]
                 edited = data[4]
                 replied = data[5]
-                self.storage.message(self.contact_id, author, text, amount, timestamp, edited, replied)
+                await self.main.async_storage.messages.message(self.contact_id, author, text, amount, timestamp, edited, replied)
                 self.messages.append(data)
-            self.storage.delete_unread(self.contact_id)
+            await self.main.async_storage.messages.delete_unread(self.contact_id)
             self.hide_unread_label()
 
 
@@ -2788,7 +2767,8 @@ class Chat(Box):
         if message.lower() == "/market":
             self.app.loop.create_task(self.handle_market_command())
             return
-        self.app.loop.create_task(self.send_message())
+        with self.rpc.priority(RPC_PRIORITY_INTERACTIVE):
+            self.app.loop.create_task(self.send_message())
 
 
     def verify_edit_message(self):
@@ -2799,7 +2779,8 @@ class Chat(Box):
             self.update_send_button()
             self.message_input.value = ""
             return
-        self.app.loop.create_task(self.send_edit_message())
+        with self.rpc.priority(RPC_PRIORITY_INTERACTIVE):
+            self.app.loop.create_task(self.send_edit_message())
 
     
     async def send_message(self):
@@ -2835,42 +2816,35 @@ class Chat(Box):
         operation, _= await self.rpc.SendMemo(address, self.user_address, amount, txfee, memo)
         if operation:
             self.app.console.info_log(f"Operation : {operation}")
-            transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            data = author, text, amount, timestamp, None, replied
-                            self.messages.append(data)
-                            self.cancel_reply()
-                            self.control_message_sent(timestamp)
-                            self.reply_toggle = None
-                            self.message_input.value = ""
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            self.storage.message(self.contact_id, author, text, amount, timestamp, None, replied)
-                            self.send_button._impl.native.Focus()
-                            self.fee_input.value = "0.00020000"
-                            self.character_count.style.color = GRAY
-                            self.enable_send_button()
-                            await asyncio.sleep(0.2)
-                            self.message_input.focus()
-                            self.main.mobile_server.broker.push("update_messages")
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self.control_message_failed(timestamp)
-                    self.main.error_dialog(
-                        title="Failed",
-                        message="Sending message was failed, verify your balance"
-                    )
-                    if self.reply_toggle:
-                        self.enable_cancel_reply()
-                    self.enable_send_button()
+            transaction_result = await self.rpc.operations.wait(operation)
+            if transaction_result.get('status') == "success":
+                data = author, text, amount, timestamp, None, replied
+                self.messages.append(data)
+                self.cancel_reply()
+                self.control_message_sent(timestamp)
+                self.reply_toggle = None
+                self.message_input.value = ""
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
+                await self.main.async_storage.messages.message(self.contact_id, author, text, amount, timestamp, None, replied)
+                self.send_button._impl.native.Focus()
+                self.fee_input.value = "0.00020000"
+                self.character_count.style.color = GRAY
+                self.enable_send_button()
+                await asyncio.sleep(0.2)
+                self.message_input.focus()
+                self.main.mobile_server.broker.push("update_messages")
+            else:
+                self.control_message_failed(timestamp)
+                self.main.error_dialog(
+                    title="Failed",
+                    message="Sending message was failed, verify your balance"
+                )
+                if self.reply_toggle:
+                    self.enable_cancel_reply()
+                self.enable_send_button()
         else:
             self.control_message_failed(timestamp)
             if self.reply_toggle:
@@ -2898,41 +2872,34 @@ class Chat(Box):
         operation, _= await self.rpc.SendMemo(address, self.user_address, amount, txfee, memo)
         if operation:
             self.app.console.info_log(f"Operation : {operation}")
-            transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            self.message_input.value = ""
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            data = author, text, amount, self.message_timestamp, edit_timestamp, None
-                            self.messages.append(data)
-                            self.storage.update_message(self.contact_id, text, self.message_timestamp, edit_timestamp)
-                            timestamp_str = datetime.fromtimestamp(self.message_timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                            edited_timestamp_str = datetime.fromtimestamp(edit_timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                            self.cancel_edit()
-                            self.control_edit_message(timestamp_str, text, edited_timestamp_str)
-                            self.edit_toggle = None
-                            self.send_button._impl.native.Focus()
-                            self.character_count.style.color = GRAY
-                            self.enable_send_button()
-                            await asyncio.sleep(0.2)
-                            self.message_input.focus()
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self.main.error_dialog(
-                        title="Failed",
-                        message="Editing message was failed, verify your balance"
-                    )
-                    if self.edit_toggle:
-                        self.enable_cancel_edit()
-                    self.enable_send_button()
+            transaction_result = await self.rpc.operations.wait(operation)
+            if transaction_result.get('status') == "success":
+                self.message_input.value = ""
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
+                data = author, text, amount, self.message_timestamp, edit_timestamp, None
+                self.messages.append(data)
+                await self.main.async_storage.messages.update_message(self.contact_id, text, self.message_timestamp, edit_timestamp)
+                timestamp_str = datetime.fromtimestamp(self.message_timestamp).strftime('%Y-%m-%d %H:%M:%S')
+                edited_timestamp_str = datetime.fromtimestamp(edit_timestamp).strftime('%Y-%m-%d %H:%M:%S')
+                self.cancel_edit()
+                self.control_edit_message(timestamp_str, text, edited_timestamp_str)
+                self.edit_toggle = None
+                self.send_button._impl.native.Focus()
+                self.character_count.style.color = GRAY
+                self.enable_send_button()
+                await asyncio.sleep(0.2)
+                self.message_input.focus()
+            else:
+                self.main.error_dialog(
+                    title="Failed",
+                    message="Editing message was failed, verify your balance"
+                )
+                if self.edit_toggle:
+                    self.enable_cancel_edit()
+                self.enable_send_button()
         else:
             if self.edit_toggle:
                 self.enable_cancel_edit()
@@ -3184,7 +3151,7 @@ class Messages(Box):
             if address:
                 listunspent, _= await self.rpc.z_listUnspent(address[0], 0)
                 if listunspent:
-                    list_txs = self.storage.get_txs()
+                    list_txs = await self.main.tx_index.known(INDEX_MEMOS, (data['txid'] for data in listunspent))
                     for data in listunspent:
                         txid = data['txid']
                         if txid not in list_txs:
@@ -3219,17 +3186,21 @@ class Messages(Box):
 
             if form_type == "message":
                 await self.get_message(form_dict, amount)
-                self.storage.tx(txid)
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
                 self.message_count += 1
             elif form_type == "request":
                 await self.get_request(form_dict)
-                self.storage.tx(txid)
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
                 self.request_count += 1
 
         except (binascii.Error, json.decoder.JSONDecodeError) as e:
-            self.storage.tx(txid)
+            await self.main.async_storage.messages.tx(txid)
+            self.main.tx_index.add(INDEX_MEMOS, txid)
         except Exception as e:
-            self.storage.tx(txid)
+            await self.main.async_storage.messages.tx(txid)
+            self.main.tx_index.add(INDEX_MEMOS, txid)
 
 
     async def get_message(self, form, amount):
@@ -3243,7 +3214,7 @@ class Messages(Box):
         contacts_ids = self.storage.get_contacts("contact_id")
         if id not in contacts_ids:
             return
-        self.storage.unread_message(id, author, message, amount, timestamp, None, replied)
+        await self.main.async_storage.messages.unread_message(id, author, message, amount, timestamp, None, replied)
         self.chat.processed_timestamps.add(timestamp)
 
 
@@ -3255,4 +3226,4 @@ class Messages(Box):
         banned = self.storage.get_banned(True)
         if address in banned:
             return
-        self.storage.add_pending(category, id, username, address)
\ No newline at end of file
+        await self.main.async_storage.messages.add_pending(category, id, username, address)
\ No newline at end of file
@@ -711,7 +711,7 @@ class Mining(Box):
                             self.main.notifymining.immature.text = f"🔃 {immature_text} {self.units.format_balance(immature_bal)}"
                             self.main.notifymining.paid.text = f"💸 {paid_text} {self.units.format_balance(paid)}"
 
-                            self.store_mining_stats(
+                            await self.store_mining_stats(
                                 self.selected_miner, self.selected_address, self.selected_pool,
                                 self.pool_region_selection.value.region,
                                 self.worker_name, total_share, balance, immature_bal,
@@ -727,14 +727,14 @@ class Mining(Box):
                 await asyncio.sleep(60)
 
 
-    def store_mining_stats(self, miner, address, pool, region, worker, shares, balance, immature, paid, solutions, reward):
+    async def store_mining_stats(self, miner, address, pool, region, worker, shares, balance, immature, paid, solutions, reward):
         mining_stats = self.mobile_storage.get_mining_stats()
         if mining_stats:
-            self.mobile_storage.update_mining_stats(
+            await self.main.async_storage.mobile.update_mining_stats(
                 miner, address, pool, region, worker, shares, balance, immature, paid, solutions, reward
             )
         else:
-            self.mobile_storage.insert_mining_stats(
+            await self.main.async_storage.mobile.insert_mining_stats(
                 miner, address, pool, region, worker, shares, balance, immature, paid, solutions, reward
             )
 
@@ -9,6 +9,7 @@ from toga.constants import COLUMN, ROW, CENTER, BOLD
 from toga.colors import rgb, GRAY, GREENYELLOW, BLACK, WHITE, RED, YELLOW
 
 from .storage import StorageMobile, StorageTxs, StorageAddresses, StorageMessages
+from .index import INDEX_MOBILE_TADDRESS, INDEX_MOBILE_ZADDRESS
 
 
 
@@ -482,8 +483,12 @@ class AddDevice(Window):
                 message="Failed to generate new addresses"
             )
             return
-        self.mobile_storage.insert_device(mobile_auth, device_name, taddress, zaddress)
-        self.mobile_storage.insert_secret(mobile_auth, mobile_secret)
+        async_storage = self.mobile_window.main.async_storage
+        await async_storage.mobile.insert_device(mobile_auth, device_name, taddress, zaddress)
+        tx_index = self.mobile_window.main.tx_index
+        tx_index.add(INDEX_MOBILE_TADDRESS, taddress)
+        tx_index.add(INDEX_MOBILE_ZADDRESS, zaddress)
+        await async_storage.mobile.insert_secret(mobile_auth, mobile_secret)
         self.info_dialog(
             title="Device Added",
             message=f"The device name {device_name} has been successfully added",
@@ -673,12 +678,16 @@ class Device(Box):
 
 
     def remove_device(self, button):
-        def on_result(widget, result):
+        async def on_result(widget, result):
             if result is False:
                 return
             if result is True:
-                self.storage.delete_device(self.device_id)
-                self.storage.delete_secret(self.device_id)
+                async_storage = self.mobile_window.main.async_storage
+                await async_storage.mobile.delete_device(self.device_id)
+                tx_index = self.mobile_window.main.tx_index
+                tx_index.invalidate(INDEX_MOBILE_TADDRESS)
+                tx_index.invalidate(INDEX_MOBILE_ZADDRESS)
+                await async_storage.mobile.delete_secret(self.device_id)
                 self.mobile_window.devices_list.remove(self)
         self.mobile_window.question_dialog(
             title="Removing Device",
@@ -91,6 +91,8 @@ class Notify(NotifyIcon):
                 if self.main.mobile_server.server_status:
                     self.main.notifymobile.hide()
                     self.main.notifymobile.dispose()
+                await self.main.async_storage.close()
+                await self.rpc.close_session()
                 self.app.exit()
 
         if self.main.mining_page.mining_status:
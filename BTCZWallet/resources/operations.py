@@ -0,0 +1,125 @@
+import asyncio
+from threading import Lock
+
+from toga import App
+
+
+OPERATION_MIN_INTERVAL = 1
+OPERATION_MAX_INTERVAL = 6
+OPERATION_BACKOFF = 1.5
+OPERATION_MISSING_LIMIT = 5
+OPERATION_FINAL_STATUS = ("success", "failed", "cancelled")
+
+
+class OperationTracker():
+    def __init__(self, app:App, rpc):
+        super().__init__()
+
+        self.app = app
+        self.rpc = rpc
+
+        self.lock = Lock()
+        self.operations = {}
+        self.missing = {}
+        self.statuses = {}
+        self.task = None
+        self.wakeup = None
+
+
+    def get_pending(self):
+        with self.lock:
+            return {opid: self.statuses.get(opid, "queued") for opid in self.operations}
+
+
+    def track(self, opid):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.lock:
+            self.operations.setdefault(opid, []).append((future, loop))
+        tracker_loop = self.app.loop if self.app else loop
+        if tracker_loop is loop:
+            self.start()
+        else:
+            tracker_loop.call_soon_threadsafe(self.start)
+        return future
+
+
+    async def wait(self, opid):
+        return await self.track(opid)
+
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.ensure_future(self.run())
+        self.wakeup.set()
+
+
+    async def run(self):
+        interval = OPERATION_MIN_INTERVAL
+        while True:
+            with self.lock:
+                opids = list(self.operations)
+            if not opids:
+                self.task = None
+                return
+
+            statuses, _ = await self.rpc.z_getOperationStatus(opids)
+            finished = []
+            changed = False
+            seen = set()
+            for operation in statuses or []:
+                opid = operation.get("id")
+                status = operation.get("status")
+                seen.add(opid)
+                if self.statuses.get(opid) != status:
+                    self.statuses[opid] = status
+                    changed = True
+                if status in OPERATION_FINAL_STATUS:
+                    finished.append(opid)
+
+            if statuses is not None:
+                for opid in opids:
+                    if opid in seen:
+                        self.missing.pop(opid, None)
+                        continue
+                    self.missing[opid] = self.missing.get(opid, 0) + 1
+                    if self.missing[opid] >= OPERATION_MISSING_LIMIT:
+                        self.resolve(opid, {"id": opid, "status": "unknown"})
+
+            if finished:
+                results, _ = await self.rpc.z_getOperationResult(finished)
+                results = {operation.get("id"): operation for operation in results or []}
+                for opid in finished:
+                    self.resolve(
+                        opid, results.get(opid, {"id": opid, "status": self.statuses.get(opid)})
+                    )
+
+            if changed or finished:
+                interval = OPERATION_MIN_INTERVAL
+            else:
+                interval = min(interval * OPERATION_BACKOFF, OPERATION_MAX_INTERVAL)
+
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), interval)
+                interval = OPERATION_MIN_INTERVAL
+            except asyncio.TimeoutError:
+                pass
+
+
+    def resolve(self, opid, operation):
+        with self.lock:
+            waiters = self.operations.pop(opid, [])
+        self.missing.pop(opid, None)
+        self.statuses.pop(opid, None)
+        for future, loop in waiters:
+            if loop is asyncio.get_running_loop():
+                self.set_result(future, operation)
+            else:
+                loop.call_soon_threadsafe(self.set_result, future, operation)
+
+
+    def set_result(self, future, operation):
+        if not future.done():
+            future.set_result(operation)
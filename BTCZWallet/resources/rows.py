@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+
+ROW_CACHE_SIZE = 5000
+
+
+class RowCache():
+    def __init__(self, formatter, capacity = ROW_CACHE_SIZE):
+        super().__init__()
+
+        self.formatter = formatter
+        self.capacity = capacity
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def get(self, data):
+        key = (data[3], data[2], data[1])
+        signature = (data[4], data[5])
+        entry = self.rows.get(key)
+        if entry is not None and entry[0] == signature:
+            self.rows.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        values = tuple(self.formatter(data))
+        self.rows[key] = (signature, values)
+        self.rows.move_to_end(key)
+        while len(self.rows) > self.capacity:
+            self.rows.popitem(last=False)
+        return values
+
+
+    def invalidate(self):
+        self.rows.clear()
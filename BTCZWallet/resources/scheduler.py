@@ -0,0 +1,220 @@
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from toga import App, Window
+
+
+TASK_PRIORITY_HIGH = 2
+TASK_PRIORITY_NORMAL = 1
+TASK_PRIORITY_LOW = 0
+
+TASK_JITTER = 0.1
+TASK_BACKOFF = 2
+TASK_MAX_BACKOFF = 8
+TASK_CONCURRENCY = 3
+TASK_IDLE_CHECK = 1
+
+
+class ScheduledTask():
+    def __init__(self, name, callback, interval, priority, needs_ui, needs_node, events, max_interval):
+        super().__init__()
+
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.priority = priority
+        self.needs_ui = needs_ui
+        self.needs_node = needs_node
+        self.events = events
+        self.max_interval = max_interval
+
+        self.current_interval = interval
+        self.next_due = time.monotonic()
+        self.last_run = None
+        self.duration = None
+        self.last_result = None
+        self.runs = 0
+        self.errors = 0
+        self.running = None
+        self.pending = None
+        self.triggered = None
+
+
+class TaskScheduler():
+    def __init__(self, app:App, main:Window, events):
+        super().__init__()
+
+        self.app = app
+        self.main = main
+        self.events = events
+
+        self.tasks = {}
+        self.subscribed = set()
+        self.running = 0
+        self.random = random.Random()
+        self.task = None
+        self.wakeup = None
+
+
+    def register(
+        self,
+        name,
+        callback,
+        interval,
+        priority = TASK_PRIORITY_NORMAL,
+        needs_ui = False,
+        needs_node = False,
+        events = (),
+        max_interval = None
+    ):
+        if max_interval is None:
+            max_interval = interval * TASK_MAX_BACKOFF
+        task = self.tasks.get(name)
+        if task is None:
+            task = ScheduledTask(
+                name, callback, interval, priority, needs_ui, needs_node, tuple(events), max_interval
+            )
+            self.tasks[name] = task
+        else:
+            task.callback = callback
+            task.interval = interval
+            task.current_interval = interval
+            task.priority = priority
+            task.needs_ui = needs_ui
+            task.needs_node = needs_node
+            task.events = tuple(events)
+            task.max_interval = max_interval
+            task.next_due = time.monotonic()
+        for event in task.events:
+            if event not in self.subscribed:
+                self.events.subscribe(event, self.on_event)
+                self.subscribed.add(event)
+        self.app.console.event_log(f"✔: {name}")
+        self.start()
+        return task
+
+
+    def unregister(self, name):
+        self.tasks.pop(name, None)
+
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.wakeup = asyncio.Event()
+            self.task = self.app.loop.create_task(self.run())
+        else:
+            self.wakeup.set()
+
+
+    def on_event(self, event, **data):
+        now = time.monotonic()
+        for task in self.tasks.values():
+            if event in task.events:
+                task.current_interval = task.interval
+                task.triggered = True
+                if task.running:
+                    task.pending = True
+                else:
+                    task.next_due = now
+        if self.wakeup:
+            self.wakeup.set()
+
+
+    def paused_reason(self, task):
+        if task.needs_ui and self.main._is_hidden:
+            return "hidden"
+        if task.needs_node and self.main.import_key_toggle:
+            return "import"
+        return None
+
+
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            waiting = []
+            due = []
+            for task in self.tasks.values():
+                if task.running:
+                    continue
+                if self.paused_reason(task):
+                    waiting.append(now + TASK_IDLE_CHECK)
+                    continue
+                if task.next_due <= now:
+                    due.append(task)
+                else:
+                    waiting.append(task.next_due)
+
+            due.sort(key=lambda task: (-task.priority, task.next_due))
+            for task in due:
+                if self.running >= TASK_CONCURRENCY:
+                    break
+                self.launch(task)
+
+            delay = min(waiting, default=now + TASK_IDLE_CHECK) - now
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+    def launch(self, task):
+        self.running += 1
+        task.pending = None
+        task.running = self.app.loop.create_task(self.execute(task))
+
+
+    async def execute(self, task):
+        started = time.monotonic()
+        task.last_run = time.time()
+        triggered = task.triggered
+        task.triggered = None
+        result = None
+        failed = None
+        try:
+            result = await task.callback()
+        except Exception as e:
+            task.errors += 1
+            failed = True
+            self.app.console.error_log(f"{task.name} : {e}")
+        finally:
+            task.duration = time.monotonic() - started
+            task.runs += 1
+            self.running -= 1
+            task.running = None
+
+        unchanged = result is not None and result == task.last_result
+        if failed or (unchanged and not triggered):
+            task.current_interval = min(task.current_interval * TASK_BACKOFF, task.max_interval)
+        elif not unchanged:
+            task.current_interval = task.interval
+        if not failed:
+            task.last_result = result
+
+        if task.pending:
+            task.next_due = time.monotonic()
+        else:
+            jitter = self.random.uniform(-TASK_JITTER, TASK_JITTER)
+            task.next_due = time.monotonic() + task.current_interval * (1 + jitter)
+        self.wakeup.set()
+
+
+    def get_table(self):
+        now = time.monotonic()
+        rows = []
+        for task in sorted(self.tasks.values(), key=lambda task: (-task.priority, task.name)):
+            if task.last_run:
+                last_run = datetime.fromtimestamp(task.last_run).strftime("%H:%M:%S")
+            else:
+                last_run = "-"
+            duration = f"{task.duration * 1000:.0f} ms" if task.duration is not None else "-"
+            if task.running:
+                next_due = "running"
+            else:
+                next_due = self.paused_reason(task) or f"{max(task.next_due - now, 0):.1f} s"
+            rows.append(
+                (task.name, last_run, duration, next_due, f"{task.current_interval:.0f} s", str(task.runs))
+            )
+        return rows
@@ -0,0 +1,138 @@
+import re
+from datetime import datetime, timedelta
+
+
+SEARCH_COUNT_LIMIT = 1000
+SEARCH_PAGE_SIZE = 50
+SEARCH_PAGE_LIMIT = 500
+SEARCH_DELAY = 0.3
+SEARCH_CATEGORIES = ("send", "receive")
+SEARCH_TYPES = {"transparent": "transparent", "t": "transparent", "shielded": "shielded", "z": "shielded"}
+SEARCH_ADDRESS_PREFIXES = ("t1", "t3", "zs", "zc")
+
+HEX_PATTERN = re.compile(r"^[0-9a-f]{1,64}$")
+AMOUNT_PATTERN = re.compile(r"^(>=|<=|>|<|=)?(\d+(?:\.\d+)?)$")
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_date(value, days = 0):
+    date = datetime.strptime(value, DATE_FORMAT) + timedelta(days=days)
+    return int(date.timestamp())
+
+
+class TransactionQuery():
+    def __init__(
+        self,
+        txid = None,
+        address = None,
+        addresses = None,
+        min_amount = None,
+        max_amount = None,
+        start = None,
+        end = None,
+        category = None,
+        tx_type = None
+    ):
+        super().__init__()
+
+        self.txid = txid
+        self.address = address
+        self.addresses = addresses
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.start = start
+        self.end = end
+        self.category = category
+        self.tx_type = tx_type
+
+
+    @classmethod
+    def parse(cls, text, addresses = None):
+        query = cls(addresses=addresses)
+        for token in text.split():
+            key, separator, value = token.partition(":")
+            if not separator:
+                query.parse_word(token)
+                continue
+            key = key.lower()
+            if not value:
+                raise ValueError(f"Missing value for '{key}'")
+            if key == "txid":
+                query.set_txid(value)
+            elif key in ("address", "addr"):
+                query.address = value
+            elif key == "amount":
+                query.set_amount(value)
+            elif key == "from":
+                query.start = parse_date(value)
+            elif key == "to":
+                query.end = parse_date(value, 1)
+            elif key == "date":
+                query.start = parse_date(value)
+                query.end = parse_date(value, 1)
+            elif key in ("category", "cat"):
+                if value.lower() not in SEARCH_CATEGORIES:
+                    raise ValueError(f"Invalid category '{value}'")
+                query.category = value.lower()
+            elif key == "type":
+                if value.lower() not in SEARCH_TYPES:
+                    raise ValueError(f"Invalid type '{value}'")
+                query.tx_type = SEARCH_TYPES[value.lower()]
+            else:
+                raise ValueError(f"Unknown filter '{key}'")
+        return query
+
+
+    def parse_word(self, word):
+        lowered = word.lower()
+        if lowered in SEARCH_CATEGORIES:
+            self.category = lowered
+        elif lowered in ("transparent", "shielded"):
+            self.tx_type = lowered
+        elif word.startswith(SEARCH_ADDRESS_PREFIXES) and len(word) > 30:
+            self.address = word
+        elif HEX_PATTERN.match(lowered) and (not lowered.isdigit() or len(lowered) > 16):
+            self.set_txid(lowered)
+        elif AMOUNT_PATTERN.match(word) or ".." in word:
+            self.set_amount(word)
+        else:
+            try:
+                self.start = parse_date(word)
+                self.end = parse_date(word, 1)
+            except ValueError:
+                raise ValueError(f"Invalid search term '{word}'") from None
+
+
+    def set_txid(self, value):
+        value = value.lower()
+        if not HEX_PATTERN.match(value):
+            raise ValueError(f"Invalid txid '{value}'")
+        self.txid = value
+
+
+    def set_amount(self, value):
+        if ".." in value:
+            low, _, high = value.partition("..")
+            self.min_amount = float(low) if low else None
+            self.max_amount = float(high) if high else None
+            return
+        match = AMOUNT_PATTERN.match(value)
+        if not match:
+            raise ValueError(f"Invalid amount '{value}'")
+        operator, amount = match.group(1), float(match.group(2))
+        if operator in (">", ">="):
+            self.min_amount = amount
+        elif operator in ("<", "<="):
+            self.max_amount = amount
+        else:
+            self.min_amount = amount
+            self.max_amount = amount
+
+
+    def is_empty(self):
+        return all(
+            value is None for value in (
+                self.txid, self.address, self.addresses, self.min_amount, self.max_amount,
+                self.start, self.end, self.category, self.tx_type
+            )
+        )
@@ -21,7 +21,8 @@ from toga.colors import (
 )
 
 from .wallet import AddressBook
-from .storage import StorageMessages, StorageTxs, StorageAddresses
+from .storage import StorageMessages, StorageAddresses
+from .client import RPC_PRIORITY_INTERACTIVE
 
 
 class CashOut(Window):
@@ -40,8 +41,6 @@ class CashOut(Window):
         self.tr = tr
         self.font = font
 
-        self.storagetxs = StorageTxs(self.app)
-
         self.uaddress = uaddress
         self.single = single
 
@@ -188,10 +187,11 @@ class CashOut(Window):
 
     async def confirm_cashout(self, button):
         self.disable_send()
-        if self.single:
-            await self.send_single()
-        else:
-            await self.send_many()
+        with self.rpc.priority(RPC_PRIORITY_INTERACTIVE):
+            if self.single:
+                await self.send_single()
+            else:
+                await self.send_many()
 
 
     async def send_single(self):
@@ -206,36 +206,19 @@ class CashOut(Window):
             operation, _= await self.rpc.z_sendMany(self.uaddress, self.destination_address, self.amount, self.txfee)
             if operation:
                 self.app.console.info_log(f"Operation: {operation}")
-                transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-                if isinstance(transaction_status, list) and transaction_status:
-                    status = transaction_status[0].get('status')
-                    if status == "failed":
-                        self.operation_status.text = self.tr.text("send_failed")
-                    elif status == "executing":
-                        self.operation_status.text = self.tr.text("send_executing")
-                    if status == "executing" or status =="success":
-                        await asyncio.sleep(1)
-                        while True:
-                            transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                            if isinstance(transaction_result, list) and transaction_result:
-                                status = transaction_result[0].get('status')
-                                result = transaction_result[0].get('result', {})
-                                txid = result.get('txid')
-                                if status == "failed":
-                                    self.operation_status.text = self.tr.text("send_failed")
-                                    self.enable_send()
-                                    return
-                                elif status == "executing":
-                                    self.operation_status.text = self.tr.text("send_executing")
-                                elif status == "success":
-                                    self.app.console.info_log(f"TX: {txid}")
-                                if self.uaddress.startswith('z'):
-                                    self.store_shielded_transaction(self.uaddress, txid, self.amount, self.txfee)
-                                self.app.loop.create_task(self.show_success_result())
-                                return
-                            await asyncio.sleep(3)
-                    else:
-                        self.enable_send()
+                self.operation_status.text = self.tr.text("send_executing")
+                transaction_result = await self.rpc.operations.wait(operation)
+                status = transaction_result.get('status')
+                if status != "success":
+                    self.operation_status.text = self.tr.text("send_failed")
+                    self.enable_send()
+                    return
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                self.app.console.info_log(f"TX: {txid}")
+                if self.uaddress.startswith('z'):
+                    await self.store_shielded_transaction(self.uaddress, txid, self.amount, self.txfee)
+                self.app.loop.create_task(self.show_success_result())
             else:
                 self.enable_send()
         except Exception as e:
@@ -248,37 +231,19 @@ class CashOut(Window):
             operation, _= await self.rpc.z_sendToManyAddresses(self.uaddress, self.destination_addresses)
             if operation:
                 self.app.console.info_log(f"Operation: {operation}")
-                transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-                if isinstance(transaction_status, list) and transaction_status:
-                    status = transaction_status[0].get('status')
-                    if status == "failed":
-                        self.operation_status.text = self.tr.text("send_failed")
-                    elif status == "executing":
-                        self.operation_status.text = self.tr.text("send_executing")
-                    self.operation_status.text = status
-                    if status == "executing" or status =="success":
-                        await asyncio.sleep(1)
-                        while True:
-                            transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                            if isinstance(transaction_result, list) and transaction_result:
-                                status = transaction_status[0].get('status')
-                                result = transaction_result[0].get('result', {})
-                                txid = result.get('txid')
-                                if status == "failed":
-                                    self.operation_status.text = self.tr.text("send_failed")
-                                    self.enable_send()
-                                    return
-                                elif status == "executing":
-                                    self.operation_status.text = self.tr.text("send_executing")
-                                elif status == "success":
-                                    self.app.console.info_log(f"TX: {txid}")
-                                if self.uaddress.startswith('z'):
-                                    self.store_shielded_transaction(self.uaddress, txid, self.total_amount, 0.0001)
-                                self.app.loop.create_task(self.show_success_result())
-                                return
-                            await asyncio.sleep(3)
-                    else:
-                        self.enable_send()
+                self.operation_status.text = self.tr.text("send_executing")
+                transaction_result = await self.rpc.operations.wait(operation)
+                status = transaction_result.get('status')
+                if status != "success":
+                    self.operation_status.text = self.tr.text("send_failed")
+                    self.enable_send()
+                    return
+                result = transaction_result.get('result') or {}
+                txid = result.get('txid')
+                self.app.console.info_log(f"TX: {txid}")
+                if self.uaddress.startswith('z'):
+                    await self.store_shielded_transaction(self.uaddress, txid, self.total_amount, 0.0001)
+                self.app.loop.create_task(self.show_success_result())
             else:
                 self.enable_send()
         except Exception as e:
@@ -286,13 +251,13 @@ class CashOut(Window):
             self.app.console.error_log(f"Cashout : {e}")
 
 
-    def store_shielded_transaction(self, address, txid, amount, fee):
+    async def store_shielded_transaction(self, address, txid, amount, fee):
         tx_type = "shielded"
         category = "send"
         amount = float(amount)
         blocks = self.main.home_page.current_blocks
         timesent = int(datetime.now().timestamp())
-        self.storagetxs.insert_transaction(tx_type, category, address, txid, -amount, blocks, fee, timesent)
+        await self.main.async_storage.txs.insert_transaction(tx_type, category, address, txid, -amount, blocks, fee, timesent)
 
 
     async def show_success_result(self):
@@ -1,5 +1,4 @@
 
-import asyncio
 import json
 import time
 from datetime import datetime, timedelta, timezone
@@ -14,6 +13,10 @@ from collections import deque
 
 from toga import App
 from ..framework import Sys
+from .client import RPC_PRIORITY_MOBILE
+from .search import TransactionQuery, SEARCH_PAGE_SIZE, SEARCH_PAGE_LIMIT
+from .timeline import BalanceHistory, BALANCE_TYPES
+from .index import INDEX_MEMOS
 
 
 def get_secret(id, storage):
@@ -192,6 +195,7 @@ class MobileServer():
         )
 
         self.broker = SSEBroker()
+        self.balance_history = BalanceHistory(self.txs_storage)
 
         self.add_rules()
 
@@ -204,6 +208,7 @@ class MobileServer():
         self.flask.add_url_rule('/balances', 'balances', self.handle_balances)
         self.flask.add_url_rule('/mining', 'mining', self.handle_mining)
         self.flask.add_url_rule('/transactions', 'transactions', self.handle_transactions)
+        self.flask.add_url_rule('/history', 'history', self.handle_history)
         self.flask.add_url_rule('/cashout', 'cashout', self.handle_cashout)
         self.flask.add_url_rule('/contacts', 'contacts', self.handle_contacts)
         self.flask.add_url_rule('/messages', 'messages', self.handle_messages)
@@ -211,6 +216,7 @@ class MobileServer():
 
 
     def log_request(self):
+        self.rpc.set_priority(RPC_PRIORITY_MOBILE)
         self.app.add_background_task(self.get_request_log)
 
     def get_request_log(self, widget):
@@ -337,7 +343,7 @@ class MobileServer():
             if name in address_book:
                 return jsonify({"error": "Name is already exists"}), 400
             
-            self.addresses_storage.insert_book(name, address)
+            await self.main.async_storage.addresses.insert_book(name, address)
             self.broker.push("update_book")
             return jsonify({"result": "success"}), 200
     
@@ -382,6 +388,8 @@ class MobileServer():
         result = []
         mobile_id = request.headers.get('Authorization')
         addresses = self.mobile_storage.get_device_addresses(mobile_id)
+        if "query" in request.args:
+            return self.search_transactions(mobile_id, addresses)
         for address in addresses:
             address_data = self.txs_storage.get_mobile_transactions(address)
             for data in address_data:
@@ -389,20 +397,74 @@ class MobileServer():
 
         if transactions_data:
             for data in transactions_data:
-                tx_dict = {
-                    "type": data[0],
-                    "category": data[1],
-                    "address": data[2],
-                    "txid": data[3],
-                    "amount": data[4],
-                    "blocks": data[5],
-                    "fee": data[6],
-                    "timestamp": data[7]
-                }
-                result.append(tx_dict)
+                result.append(self.transaction_dict(data))
                 
         encrypted_data = encrypt_data(mobile_id, self.mobile_storage, self.units, json.dumps(result))
         return jsonify({"data": encrypted_data}), 200
+
+
+    def search_transactions(self, mobile_id, addresses):
+        addresses = [address for address in addresses if address]
+        if not addresses:
+            return jsonify({"error": "No addresses for this device"}), 404
+        try:
+            query = TransactionQuery.parse(request.args.get("query", ""), addresses)
+            position = None
+            after = request.args.get("after")
+            if after:
+                timestamp, rowid = after.split(":")
+                position = (int(timestamp), int(rowid))
+            limit = min(max(int(request.args.get("limit", SEARCH_PAGE_SIZE)), 1), SEARCH_PAGE_LIMIT)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        rows = self.txs_storage.get_transactions_after(position, limit, query)
+        next_position = None
+        if len(rows) == limit:
+            next_position = f"{rows[-1][7]}:{rows[-1][8]}"
+        result = {
+            "transactions": [self.transaction_dict(data) for data in rows],
+            "next": next_position
+        }
+        encrypted_data = encrypt_data(mobile_id, self.mobile_storage, self.units, json.dumps(result))
+        return jsonify({"data": encrypted_data}), 200
+
+
+    def handle_history(self):
+        mobile_ids = self.mobile_storage.get_auth_ids()
+        valid, response = verify_signature(mobile_ids, self.mobile_storage)
+        if not valid:
+            return response
+        self.update_device_status()
+        mobile_id = request.headers.get('Authorization')
+        taddress, zaddress = self.mobile_storage.get_device_addresses(mobile_id)
+        resolution = request.args.get("resolution", "day")
+        try:
+            start = request.args.get("from")
+            start = int(start) if start else None
+            points = self.balance_history.series(resolution, start, (taddress, zaddress))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        data = {
+            "resolution": resolution,
+            "columns": ["timestamp", *BALANCE_TYPES],
+            "points": points
+        }
+        encrypted_data = encrypt_data(mobile_id, self.mobile_storage, self.units, json.dumps(data))
+        return jsonify({"data": encrypted_data}), 200
+
+
+    def transaction_dict(self, data):
+        return {
+            "type": data[0],
+            "category": data[1],
+            "address": data[2],
+            "txid": data[3],
+            "amount": data[4],
+            "blocks": data[5],
+            "fee": data[6],
+            "timestamp": data[7]
+        }
     
 
     async def handle_cashout(self):
@@ -546,8 +608,8 @@ class MobileServer():
             if not address:
                 return jsonify({"error": "Pending not found"}), 400
             
-            self.messages_storage.ban(address[0])
-            self.messages_storage.delete_pending(address[0])
+            await self.main.async_storage.messages.ban(address[0])
+            await self.main.async_storage.messages.delete_pending(address[0])
 
             return jsonify({"result": "success"}), 200
         
@@ -558,8 +620,8 @@ class MobileServer():
             if address[0] in banned:
                 return jsonify({"error": "Contact already banned"})
             
-            self.messages_storage.ban(address[0])
-            self.messages_storage.delete_contact(address[0])
+            await self.main.async_storage.messages.ban(address[0])
+            await self.main.async_storage.messages.delete_contact(address[0])
 
             return jsonify({"result": "success"}), 200
         
@@ -626,8 +688,8 @@ class MobileServer():
                     timestamp = data[3]
                     edited = data[4]
                     replied = data[5]
-                    self.messages_storage.message(clean_id, author, text, amount, timestamp, edited, replied)
-                self.messages_storage.delete_unread(clean_id)
+                    await self.main.async_storage.messages.message(clean_id, author, text, amount, timestamp, edited, replied)
+                await self.main.async_storage.messages.delete_unread(clean_id)
             return jsonify({"result": "success"}), 200
         
         elif "send" in params:
@@ -694,68 +756,59 @@ class MobileServer():
             operation, _= await self.rpc.z_sendMany(from_address, address, amount, txfee)
         if not operation:
             return jsonify({"error": "Unable to create operation. Please try again later."}), 500
-        transaction_status, _= await self.rpc.z_getOperationStatus(operation)
-        if isinstance(transaction_status, list) and transaction_status:
-            status = transaction_status[0].get('status')
-            if status not in ["executing", "success"]:
-                return jsonify({"error": f"Operation could not start. Status: {status}"}), 500
-            await asyncio.sleep(1)
-            while True:
-                transaction_result, _= await self.rpc.z_getOperationResult(operation)
-                if isinstance(transaction_result, list) and transaction_result:
-                    status = transaction_result[0].get('status')
-                    result = transaction_result[0].get('result', {})
-                    txid = result.get('txid')
-                    if status == "failed":
-                        return jsonify({"error": "Transaction failed"}), 500
-                    elif status == "success":
-                        if not option:
-                            category = "send"
-                            if from_address.startswith('z'):
-                                tx_type = "shielded"
-                                blocks = self.main.home_page.current_blocks
-                            elif from_address.startswith("t"):
-                                tx_type = "transparent"
-                                blocks = 0
-                            amount = float(amount)
-                            self.store_transaction(tx_type, category, from_address, txid, -amount, blocks, txfee)
-                            self.broker.push("update_transactions")
-
-                            return jsonify({"result": "success"}), 200
-                        else:
-                            if option == "request":
-                                self.messages_storage.tx(txid)
-                                self.messages_storage.add_request(id, address)
-
-                                return jsonify({"result": "success"}), 200
-
-                            elif option == "accept":
-                                category = data[0]
-                                contact_id = data[1]
-                                username = data[2]
-                                address = data[3]
-                                self.messages_storage.tx(txid)
-                                self.messages_storage.delete_pending(address)
-                                self.messages_storage.add_contact(category, id, contact_id, username, address)
-                                self.broker.push("update_contacts")
-
-                                return jsonify({"result": "success"}), 200
-
-                            elif option == "message":
-                                author = data[0]
-                                message = data[1]
-                                timestamp = data[2]
-                                self.messages_storage.message(id, author, message, amount, timestamp)
-                                self.broker.push("update_messages")
-
-                                return jsonify({"result": "success", "timestamp": timestamp}), 200
-                                
-                await asyncio.sleep(3)
+        transaction_result = await self.rpc.operations.wait(operation)
+        status = transaction_result.get('status')
+        result = transaction_result.get('result') or {}
+        txid = result.get('txid')
+        if status != "success":
+            return jsonify({"error": "Transaction failed"}), 500
+        if not option:
+            category = "send"
+            if from_address.startswith('z'):
+                tx_type = "shielded"
+                blocks = self.main.home_page.current_blocks
+            elif from_address.startswith("t"):
+                tx_type = "transparent"
+                blocks = 0
+            amount = float(amount)
+            await self.store_transaction(tx_type, category, from_address, txid, -amount, blocks, txfee)
+            self.broker.push("update_transactions")
+
+            return jsonify({"result": "success"}), 200
+        else:
+            if option == "request":
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
+                await self.main.async_storage.messages.add_request(id, address)
+
+                return jsonify({"result": "success"}), 200
+
+            elif option == "accept":
+                category = data[0]
+                contact_id = data[1]
+                username = data[2]
+                address = data[3]
+                await self.main.async_storage.messages.tx(txid)
+                self.main.tx_index.add(INDEX_MEMOS, txid)
+                await self.main.async_storage.messages.delete_pending(address)
+                await self.main.async_storage.messages.add_contact(category, id, contact_id, username, address)
+                self.broker.push("update_contacts")
+
+                return jsonify({"result": "success"}), 200
+
+            elif option == "message":
+                author = data[0]
+                message = data[1]
+                timestamp = data[2]
+                await self.main.async_storage.messages.message(id, author, message, amount, timestamp)
+                self.broker.push("update_messages")
+
+                return jsonify({"result": "success", "timestamp": timestamp}), 200
         
 
-    def store_transaction(self, tx_type, category, from_address, txid, amount, blocks, txfee):
+    async def store_transaction(self, tx_type, category, from_address, txid, amount, blocks, txfee):
         timesent = int(datetime.now(timezone.utc).timestamp())
-        self.txs_storage.insert_transaction(tx_type, category, from_address, txid, amount, blocks, txfee, timesent)
+        await self.main.async_storage.txs.insert_transaction(tx_type, category, from_address, txid, amount, blocks, txfee, timesent)
 
     
     async def is_valid(self, address, z_only=False):
@@ -790,7 +843,7 @@ class MobileServer():
     def update_device_status(self):
         mobile_id = request.headers.get('Authorization')
         timestamp = int(datetime.now(timezone.utc).timestamp())
-        self.mobile_storage.update_device_connected(mobile_id, timestamp)
+        self.main.async_storage.post(self.mobile_storage.update_device_connected, mobile_id, timestamp)
         
     
     def start(self):
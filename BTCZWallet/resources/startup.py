@@ -217,6 +217,7 @@ class BTCZSetup(Box):
                     await self.check_binary_files()
             
         await asyncio.sleep(1)
+        await self.rpc.open_session()
         self.node_status = await self.is_bitcoinz_running()
         self.app.console.info_log(f"Node status : {self.node_status}")
         self.tor_enabled = self.settings.tor_network()
@@ -596,6 +597,7 @@ class BTCZSetup(Box):
                         else:
                             mediantime_date = "N/A"
                     if error_message:
+                        await self.rpc.close_session()
                         self.app.exit()
                         return
 
@@ -10,6 +10,9 @@ from ..framework import (
 from toga.style.pack import Pack
 from toga.constants import ROW, BOTTOM
 
+from .events import NEW_BLOCK
+from .scheduler import TASK_PRIORITY_HIGH, TASK_PRIORITY_LOW
+
 
 class AppStatusBar(Box):
     def __init__(self, app:App, main:Window, settings, utils, units, rpc, tr, font):
@@ -187,42 +190,48 @@ class AppStatusBar(Box):
 
     
     def run_statusbar_tasks(self):
-        self.app.loop.create_task(self.update_blockchaininfo())
-        self.app.loop.create_task(self.update_networkhash())
-        self.app.loop.create_task(self.update_connections_count())
+        self.rpc.tip_watcher.start()
+        scheduler = self.main.scheduler
+        scheduler.register(
+            "Blockchain info", self.update_blockchaininfo, 15, TASK_PRIORITY_HIGH,
+            needs_node=True, events=(NEW_BLOCK,), max_interval=15
+        )
+        scheduler.register(
+            "Network Hash", self.update_networkhash, 60, TASK_PRIORITY_LOW,
+            needs_ui=True, needs_node=True, events=(NEW_BLOCK,)
+        )
+        scheduler.register(
+            "Peer count", self.update_connections_count, 5, TASK_PRIORITY_LOW,
+            needs_ui=True, needs_node=True
+        )
         self.app.loop.create_task(self.update_deprecationinfo())
 
 
     async def update_blockchaininfo(self):
-        self.app.console.event_log(f"✔: Blockchain info")
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            blockchaininfo,_ = await self.rpc.getBlockchainInfo()
-            if blockchaininfo is not None:
-                self.node_status = True
-                blocks = blockchaininfo.get('blocks')
-                self.main.home_page.current_blocks = blocks
-                self.main.mobile_server.current_blocks = blocks
-                sync = blockchaininfo.get('verificationprogress')
-                sync_percentage = float(sync) * 100
-                sync_str = f"{sync_percentage:.2f}"
-                mediantime = blockchaininfo.get('mediantime')
-                mediantime_date = datetime.fromtimestamp(mediantime).strftime('%Y-%m-%d %H:%M:%S')
-                status_icon = "images/on.png"
-                if self.latest_blocks and blocks > self.latest_blocks:
-                    self.main.mobile_server.broker.push("update_info")
-                    self.app.console.info_log(f"🧊: New Block {blocks}")
-                self.latest_blocks = blocks
-            else:
-                self.node_status = None
-                status_icon = "images/off.png"
+        blockchaininfo,_ = await self.rpc.getBlockchainInfo()
+        if blockchaininfo is not None:
+            self.node_status = True
+            blocks = blockchaininfo.get('blocks')
+            self.main.home_page.current_blocks = blocks
+            self.main.mobile_server.current_blocks = blocks
+            sync = blockchaininfo.get('verificationprogress')
+            sync_percentage = float(sync) * 100
+            sync_str = f"{sync_percentage:.2f}"
+            mediantime = blockchaininfo.get('mediantime')
+            mediantime_date = datetime.fromtimestamp(mediantime).strftime('%Y-%m-%d %H:%M:%S')
+            status_icon = "images/on.png"
+            if self.latest_blocks and blocks > self.latest_blocks:
+                self.main.mobile_server.broker.push("update_info")
+                self.app.console.info_log(f"🧊: New Block {blocks}")
+            self.latest_blocks = blocks
+        else:
+            self.node_status = None
+            status_icon = "images/off.png"
 
-            bitcoinz_size = int(self.utils.get_bitcoinz_size())
+        bitcoinz_size = int(self.utils.get_bitcoinz_size())
 
-            await self.update_statusbar(status_icon, blocks, sync_str, mediantime_date, bitcoinz_size)
-            await asyncio.sleep(5)
+        await self.update_statusbar(status_icon, blocks, sync_str, mediantime_date, bitcoinz_size)
+        return blocks
 
 
     async def update_statusbar(self, status_icon, blocks, sync, mediantime, bitcoinz_size):
@@ -245,42 +254,33 @@ class AppStatusBar(Box):
             restart = self.utils.restart_app()
             if restart:
                 self.main.notify.hide()
+                await self.main.async_storage.close()
+                await self.rpc.close_session()
                 self.app.exit()
                 return
 
 
     async def update_networkhash(self):
-        self.app.console.event_log(f"✔: Network Hash")
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            networksol,_ = await self.rpc.getNetworkSolps()
-            if networksol is not None:
-                if self.rtl:
-                    netsol = self.units.arabic_digits(str(networksol))
-                    netsol_text = f"{netsol} سول/ث"
-                else:
-                    netsol_text = f"{networksol} Sol/s"
-                self.network_value.text = netsol_text
-            await asyncio.sleep(5)
+        networksol,_ = await self.rpc.getNetworkSolps()
+        if networksol is not None:
+            if self.rtl:
+                netsol = self.units.arabic_digits(str(networksol))
+                netsol_text = f"{netsol} سول/ث"
+            else:
+                netsol_text = f"{networksol} Sol/s"
+            self.network_value.text = netsol_text
+        return networksol
 
-    
-    async def update_connections_count(self):
-        self.app.console.event_log(f"✔: Peer count")
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            connection_count,_ = await self.rpc.getConnectionCount()
-            if connection_count is not None:
-                if self.rtl:
-                    connection_count = self.units.arabic_digits(str(connection_count))
-                else:
-                    connection_count = str(connection_count)
-                self.connections_value.text = connection_count
 
-            await asyncio.sleep(5)
+    async def update_connections_count(self):
+        connection_count,_ = await self.rpc.getConnectionCount()
+        if connection_count is not None:
+            if self.rtl:
+                connection_count = self.units.arabic_digits(str(connection_count))
+            else:
+                connection_count = str(connection_count)
+            self.connections_value.text = connection_count
+        return connection_count
 
 
     async def update_deprecationinfo(self):
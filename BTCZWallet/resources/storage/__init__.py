@@ -1,4 +1,6 @@
 from .s_mobile import StorageMobile
 from .s_txs import StorageTxs
 from .s_messages import StorageMessages
-from .s_addresses import StorageAddresses
\ No newline at end of file
+from .s_addresses import StorageAddresses
+from .s_blocks import StorageBlocks
+from .facade import AsyncStorage
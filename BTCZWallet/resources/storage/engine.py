@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+
+
+STORAGE_TIMEOUT = 10
+STORAGE_CACHED_STATEMENTS = 256
+STORAGE_CACHE_SIZE = -16384
+STORAGE_MMAP_SIZE = 268435456
+STORAGE_IDLE_CONNECTIONS = 4
+
+
+class ThreadConnections():
+    def __init__(self, engine):
+        super().__init__()
+
+        self.engine = engine
+        self.connections = {}
+
+
+    def __del__(self):
+        try:
+            self.engine.release(self.connections)
+        except Exception:
+            pass
+
+
+class StorageEngine():
+    def __init__(self):
+        super().__init__()
+
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.opened = 0
+        self.reused = 0
+
+
+    def thread_connections(self):
+        thread = getattr(self.local, "thread", None)
+        if thread is None:
+            thread = self.local.thread = ThreadConnections(self)
+        return thread.connections
+
+
+    def connect(self, path):
+        connections = self.thread_connections()
+        conn = connections.get(path)
+        if conn is None:
+            with self.lock:
+                idle = self.idle.get(path)
+                if idle:
+                    conn = idle.pop()
+                    self.reused += 1
+            if conn is None:
+                conn = self.open(path)
+            connections[path] = conn
+        return conn
+
+
+    def open(self, path):
+        conn = sqlite3.connect(
+            path,
+            timeout=STORAGE_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STORAGE_CACHED_STATEMENTS
+        )
+        cursor = conn.cursor()
+        try:
+            cursor.execute('PRAGMA journal_mode = WAL')
+        except sqlite3.OperationalError:
+            pass
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.execute(f'PRAGMA cache_size = {STORAGE_CACHE_SIZE}')
+        cursor.execute(f'PRAGMA mmap_size = {STORAGE_MMAP_SIZE}')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        with self.lock:
+            self.opened += 1
+        return conn
+
+
+    def release(self, connections):
+        for path, conn in connections.items():
+            if conn.in_transaction:
+                conn.rollback()
+            with self.lock:
+                idle = self.idle.setdefault(path, [])
+                if len(idle) < STORAGE_IDLE_CONNECTIONS:
+                    idle.append(conn)
+                    continue
+            conn.close()
+        connections.clear()
+
+
+    def close(self):
+        thread = getattr(self.local, "thread", None)
+        if thread is not None:
+            for conn in thread.connections.values():
+                conn.close()
+            thread.connections.clear()
+        with self.lock:
+            for idle in self.idle.values():
+                for conn in idle:
+                    conn.close()
+            self.idle.clear()
+
+
+engine = StorageEngine()
+
+
+def connect(path):
+    return engine.connect(path)
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from toga import App
+
+from .engine import engine
+from .s_txs import StorageTxs
+from .s_addresses import StorageAddresses
+from .s_messages import StorageMessages
+from .s_mobile import StorageMobile
+from .s_blocks import StorageBlocks
+
+
+STORAGE_READERS = 4
+STORAGE_READ_PREFIXES = ("get_", "count_", "is_")
+
+
+class StorageJob():
+    def __init__(self, function, args, kwargs):
+        super().__init__()
+
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+        self.lock = threading.Lock()
+        self.connections = None
+
+
+    def run(self):
+        with self.lock:
+            self.connections = engine.thread_connections()
+        try:
+            return self.function(*self.args, **self.kwargs)
+        finally:
+            with self.lock:
+                self.connections = None
+
+
+    def interrupt(self):
+        with self.lock:
+            if self.connections:
+                for conn in self.connections.values():
+                    conn.interrupt()
+
+
+class StorageProxy():
+    def __init__(self, facade, storage):
+        super().__init__()
+
+        self.facade = facade
+        self.storage = storage
+
+
+    def __getattr__(self, name):
+        method = getattr(self.storage, name)
+        if name.startswith(STORAGE_READ_PREFIXES):
+            submit = self.facade.read
+        else:
+            submit = self.facade.write
+
+        async def call(*args, **kwargs):
+            return await submit(method, *args, **kwargs)
+        return call
+
+
+class AsyncStorage():
+    def __init__(self, app:App, readers = STORAGE_READERS):
+        super().__init__()
+
+        self.app = app
+        self.writer = ThreadPoolExecutor(1, "storage-writer")
+        self.readers = ThreadPoolExecutor(readers, "storage-reader")
+
+        self.txs = StorageProxy(self, StorageTxs(self.app))
+        self.addresses = StorageProxy(self, StorageAddresses(self.app))
+        self.messages = StorageProxy(self, StorageMessages(self.app))
+        self.mobile = StorageProxy(self, StorageMobile(self.app))
+        self.blocks = StorageProxy(self, StorageBlocks(self.app))
+
+
+    async def read(self, function, *args, **kwargs):
+        job = StorageJob(function, args, kwargs)
+        future = asyncio.wrap_future(self.readers.submit(job.run))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            job.interrupt()
+            raise
+
+
+    def post(self, function, *args, **kwargs):
+        job = StorageJob(function, args, kwargs)
+        return self.writer.submit(job.run)
+
+
+    async def write(self, function, *args, **kwargs):
+        future = self.post(function, *args, **kwargs)
+        try:
+            return await asyncio.shield(asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+
+    async def flush(self):
+        await self.write(lambda: None)
+
+
+    async def close(self):
+        await self.flush()
+        self.writer.shutdown(wait=False, cancel_futures=True)
+        self.readers.shutdown(wait=False, cancel_futures=True)
+
+
+    def shutdown(self):
+        self.writer.shutdown(wait=True)
+        self.readers.shutdown(wait=False, cancel_futures=True)
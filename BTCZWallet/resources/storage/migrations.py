@@ -0,0 +1,39 @@
+import os
+import threading
+import time
+
+from .engine import connect
+
+
+migrations_lock = threading.Lock()
+migrations_applied = {}
+
+
+def migrate(path, migrations):
+    with migrations_lock:
+        if path in migrations_applied:
+            return migrations_applied[path]
+        conn = connect(path)
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+        applied = []
+        for number, migration in enumerate(migrations, 1):
+            if number <= version:
+                continue
+            started = time.perf_counter()
+            with conn:
+                cursor.execute('BEGIN IMMEDIATE')
+                migration(cursor)
+                cursor.execute(f'PRAGMA user_version = {number}')
+            applied.append((number, migration.__name__, time.perf_counter() - started))
+        migrations_applied[path] = applied
+        return applied
+
+
+def get_migrations():
+    with migrations_lock:
+        return {
+            os.path.basename(path): list(applied)
+            for path, applied in migrations_applied.items()
+        }
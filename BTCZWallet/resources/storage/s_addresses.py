@@ -4,6 +4,8 @@ import sqlite3
 from toga import App
 from ...framework import Os
 
+from .engine import connect
+from .migrations import migrate
 
 
 
@@ -20,57 +22,99 @@ class StorageAddresses:
             Os.FileAccess.ReadWrite,
             Os.FileShare.ReadWrite
         )
+        self.migrate()
 
 
-    def create_addresses_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
+    def migrate(self):
+        self.migrations = migrate(self.data, (self.create_addresses_tables,))
+
+
+    def create_addresses_tables(self, cursor):
+        self.create_addresses_table(cursor)
+        self.create_address_book_table(cursor)
+        cursor.execute(
+            '''
+            DELETE FROM addresses WHERE rowid NOT IN (
+                SELECT MIN(rowid) FROM addresses GROUP BY address
+            )
+            '''
+        )
+        for column in ("address", "name"):
             cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS addresses (
-                    type TEXT,
-                    change TEXT,
-                    address TEXT,
-                    balance REAL
+                f'''
+                DELETE FROM address_book WHERE rowid NOT IN (
+                    SELECT MIN(rowid) FROM address_book GROUP BY {column}
                 )
                 '''
             )
+        self.create_addresses_indexes(cursor)
 
 
-    def create_address_book_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS address_book (
-                    name TEXT,
-                    address TEXT
-                )
-                '''
+    def create_addresses_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS addresses (
+                type TEXT,
+                change TEXT,
+                address TEXT,
+                balance REAL
+            )
+            '''
+        )
+
+
+    def create_address_book_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS address_book (
+                name TEXT,
+                address TEXT
             )
+            '''
+        )
+
+
+    def create_addresses_indexes(self, cursor):
+        cursor.execute(
+            'CREATE UNIQUE INDEX IF NOT EXISTS addresses_address ON addresses (address)'
+        )
+        cursor.execute(
+            'CREATE UNIQUE INDEX IF NOT EXISTS address_book_name ON address_book (name)'
+        )
+        cursor.execute(
+            'CREATE UNIQUE INDEX IF NOT EXISTS address_book_address ON address_book (address)'
+        )
 
 
     def insert_address(self, address_type, change, address, balance):
-        self.create_addresses_table()
-        with sqlite3.connect(self.data) as conn:
+        self.bulk_upsert_balances([(address_type, change, address, balance)])
+
+
+    def bulk_upsert_balances(self, rows):
+        with connect(self.data) as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 '''
                 INSERT INTO addresses (type, change, address, balance)
                 VALUES (?, ?, ?, ?)
+                ON CONFLICT (address) DO UPDATE SET
+                    type = excluded.type,
+                    change = COALESCE(excluded.change, change),
+                    balance = excluded.balance
                 ''',
-                (address_type, change, address, balance)
+                rows
             )
+            return cursor.rowcount
 
 
     def insert_book(self, name, address):
-        self.create_address_book_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
                 INSERT INTO address_book (name, address)
                 VALUES (?, ?)
+                ON CONFLICT (address) DO UPDATE SET name = excluded.name
                 ''',
                 (name, address)
             )
@@ -78,7 +122,7 @@ class StorageAddresses:
 
     def get_addresses(self, full = None ,address_type = None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if address_type:
                     cursor.execute(
@@ -99,7 +143,7 @@ class StorageAddresses:
 
     def get_address_balance(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT balance FROM addresses WHERE address = ?',
@@ -115,7 +159,7 @@ class StorageAddresses:
 
     def get_address_book(self, option=None, name = None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if name:
                     cursor.execute(
@@ -140,7 +184,7 @@ class StorageAddresses:
 
 
     def update_balance(self, address, balance):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -153,7 +197,7 @@ class StorageAddresses:
 
     def delete_address_book(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -0,0 +1,71 @@
+import sqlite3
+
+from toga import App
+from ...framework import Os
+
+from .engine import connect
+from .migrations import migrate
+
+
+
+class StorageBlocks:
+    def __init__(self, app:App):
+        super().__init__()
+
+        self.app = app
+        self.app_data = self.app.paths.data
+        self.data = Os.Path.Combine(str(self.app_data), 'blocks.dat')
+        Os.FileStream(
+            self.data,
+            Os.FileMode.OpenOrCreate,
+            Os.FileAccess.ReadWrite,
+            Os.FileShare.ReadWrite
+        )
+        self.migrate()
+
+
+    def migrate(self):
+        self.migrations = migrate(self.data, (self.create_blocks_table,))
+
+
+    def create_blocks_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS blocks (
+                hash TEXT PRIMARY KEY,
+                height INTEGER UNIQUE,
+                time INTEGER
+            )
+            '''
+        )
+
+
+    def insert_blocks(self, blocks):
+        with connect(self.data) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                '''
+                INSERT OR REPLACE INTO blocks (hash, height, time)
+                VALUES (?, ?, ?)
+                ''',
+                blocks
+            )
+
+
+    def get_block(self, blockhash = None, height = None):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                if blockhash:
+                    cursor.execute(
+                        'SELECT hash, height, time FROM blocks WHERE hash = ?',
+                        (blockhash,)
+                    )
+                else:
+                    cursor.execute(
+                        'SELECT hash, height, time FROM blocks WHERE height = ?',
+                        (height,)
+                    )
+                return cursor.fetchone()
+        except sqlite3.OperationalError:
+            return None
@@ -4,6 +4,9 @@ import sqlite3
 from toga import App
 from ...framework import Os
 
+from .engine import connect
+from .migrations import migrate
+
 
 
 class StorageMessages:
@@ -19,6 +22,38 @@ class StorageMessages:
             Os.FileAccess.ReadWrite,
             Os.FileShare.ReadWrite
         )
+        self.migrate()
+
+
+    def migrate(self):
+        self.migrations = migrate(
+            self.data,
+            (
+                self.create_messages_tables,
+                self.add_messages_columns
+            )
+        )
+
+
+    def create_messages_tables(self, cursor):
+        self.create_identity_table(cursor)
+        self.create_contacts_table(cursor)
+        self.create_pending_table(cursor)
+        self.create_requests_table(cursor)
+        self.create_key_table(cursor)
+        self.create_messages_table(cursor)
+        self.create_unread_messages_table(cursor)
+        self.create_banned_table(cursor)
+        self.create_txs_table(cursor)
+        self.create_market_table(cursor)
+
+
+    def add_messages_columns(self, cursor):
+        self.add_column(cursor, 'messages', 'edited', 'INTEGER')
+        self.add_column(cursor, 'messages', 'replied', 'INTEGER')
+        self.add_column(cursor, 'unread_messages', 'edited', 'INTEGER')
+        self.add_column(cursor, 'unread_messages', 'replied', 'INTEGER')
+        self.add_column(cursor, 'banned', 'username', 'TEXT')
 
 
     def is_exists(self):
@@ -28,8 +63,7 @@ class StorageMessages:
 
 
     def identity(self, category, username, address):
-        self.create_identity_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -42,7 +76,7 @@ class StorageMessages:
 
     def get_identity(self, option = None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if option == "category":
                     cursor.execute(
@@ -70,8 +104,7 @@ class StorageMessages:
 
 
     def add_contact(self, category, id, contact_id, username, address):
-        self.create_contacts_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -83,8 +116,7 @@ class StorageMessages:
 
 
     def add_pending(self, category, id, username, address):
-        self.create_pending_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -95,8 +127,7 @@ class StorageMessages:
             )
 
     def add_request(self, id, address):
-        self.create_requests_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -107,8 +138,7 @@ class StorageMessages:
             )
 
     def key(self, prv_key):
-        self.create_key_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -119,10 +149,7 @@ class StorageMessages:
             )
 
     def message(self, id, author, message, amount, timestamp, edited=None, replied = None):
-        self.create_messages_table()
-        self.add_column('messages', 'edited', 'INTEGER')
-        self.add_column('messages', 'replied', 'INTEGER')
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -134,10 +161,7 @@ class StorageMessages:
 
 
     def unread_message(self, id, author, message, amount, timestamp, edited=None, replied = None):
-        self.create_unread_messages_table()
-        self.add_column('unread_messages', 'edited', 'INTEGER')
-        self.add_column('unread_messages', 'replied', 'INTEGER')
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -149,9 +173,7 @@ class StorageMessages:
 
 
     def ban(self, address, username):
-        self.create_banned_table()
-        self.add_column('banned', 'username', 'TEXT')
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -163,8 +185,7 @@ class StorageMessages:
 
 
     def tx(self, txid):
-        self.create_txs_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -176,8 +197,7 @@ class StorageMessages:
 
 
     def insert_market(self, contact_id, hostname, secret):
-        self.create_market_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -190,7 +210,7 @@ class StorageMessages:
 
     def get_hostname(self, contact_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT hostname, secret_key FROM market WHERE contact_id = ?',
@@ -204,7 +224,7 @@ class StorageMessages:
 
     def get_txs(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT txid FROM txs')
                 txs = [row[0] for row in cursor.fetchall()]
@@ -215,7 +235,7 @@ class StorageMessages:
 
     def get_contacts(self, option = None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if option == "address":
                     cursor.execute('SELECT address FROM contacts')
@@ -233,7 +253,7 @@ class StorageMessages:
 
     def get_contact(self, contact_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT * FROM contacts WHERE contact_id = ?',
@@ -247,7 +267,7 @@ class StorageMessages:
 
     def get_contact_username(self, contact_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT username FROM contacts WHERE contact_id = ?',
@@ -261,7 +281,7 @@ class StorageMessages:
 
     def get_contact_address(self, contact_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT address FROM contacts WHERE contact_id = ?',
@@ -275,7 +295,7 @@ class StorageMessages:
 
     def get_id_contact(self, contact_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT id FROM contacts WHERE contact_id = ?',
@@ -289,7 +309,7 @@ class StorageMessages:
 
     def get_ids_contacts(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT id FROM contacts')
                 data = cursor.fetchall()
@@ -300,7 +320,7 @@ class StorageMessages:
 
     def get_pending(self, option = None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if option == "address":
                     cursor.execute("SELECT address FROM pending")
@@ -315,7 +335,7 @@ class StorageMessages:
 
     def get_pending_single(self, pending_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT * FROM pending WHERE id = ?',
@@ -329,7 +349,7 @@ class StorageMessages:
 
     def get_requests(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT address FROM requests')
                 txs = [row[0] for row in cursor.fetchall()]
@@ -340,7 +360,7 @@ class StorageMessages:
 
     def get_request(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT id FROM requests WHERE address = ?',
@@ -354,9 +374,7 @@ class StorageMessages:
 
     def get_messages(self, contact_id = None):
         try:
-            self.add_column('messages', 'edited', 'INTEGER')
-            self.add_column('messages', 'replied', 'INTEGER')
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if contact_id:
                     cursor.execute(
@@ -373,9 +391,7 @@ class StorageMessages:
 
     def get_message(self, contact_id = None, timestamp=None):
         try:
-            self.add_column('messages', 'edited', 'INTEGER')
-            self.add_column('messages', 'replied', 'INTEGER')
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if not contact_id:
                     cursor.execute(
@@ -394,7 +410,7 @@ class StorageMessages:
 
 
     def update_message(self, contact_id, message, timestamp, edit_timestamp):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -407,9 +423,7 @@ class StorageMessages:
 
     def get_unread_messages(self, contact_id=None):
         try:
-            self.add_column('unread_messages', 'edited', 'INTEGER')
-            self.add_column('unread_messages', 'replied', 'INTEGER')
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if contact_id:
                     cursor.execute(
@@ -426,9 +440,7 @@ class StorageMessages:
 
     def get_unread_message(self, contact_id=None, timestamp=None):
         try:
-            self.add_column('unread_messages', 'edited', 'INTEGER')
-            self.add_column('unread_messages', 'replied', 'INTEGER')
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if not contact_id:
                     cursor.execute(
@@ -447,7 +459,7 @@ class StorageMessages:
 
 
     def update_unread_message(self, contact_id, message, timestamp, edit_timestamp):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -460,8 +472,7 @@ class StorageMessages:
 
     def get_banned(self, option=None):
         try:
-            self.add_column('banned', 'username', 'TEXT')
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if option:
                     cursor.execute('SELECT address FROM banned')
@@ -476,7 +487,7 @@ class StorageMessages:
 
     def delete_pending(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -490,7 +501,7 @@ class StorageMessages:
 
     def delete_contact(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -504,7 +515,7 @@ class StorageMessages:
 
     def delete_request(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -518,7 +529,7 @@ class StorageMessages:
 
     def delete_unread(self, contact_id=None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if contact_id:
                     cursor.execute(
@@ -535,7 +546,7 @@ class StorageMessages:
 
     def delete_ban(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -547,22 +558,20 @@ class StorageMessages:
             print(f"Error deleting banned contact: {e}")
 
 
-    def create_identity_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS identity (
-                    category TEXT,
-                    username TEXT,
-                    address TEXT
-                )
-                '''
+    def create_identity_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS identity (
+                category TEXT,
+                username TEXT,
+                address TEXT
             )
+            '''
+        )
 
 
     def edit_username(self, old_username, new_username):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -573,23 +582,21 @@ class StorageMessages:
             )
 
 
-    def create_contacts_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS contacts (
-                    category TEXT,
-                    id TEXT,
-                    contact_id TEXT,
-                    username TEXT,
-                    address TEXT
-                )
-                '''
+    def create_contacts_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS contacts (
+                category TEXT,
+                id TEXT,
+                contact_id TEXT,
+                username TEXT,
+                address TEXT
             )
+            '''
+        )
 
     def update_contact_username(self, username, contact_id):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -600,7 +607,7 @@ class StorageMessages:
             )
 
     def update_market(self, contact_id, hostname, secret):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -610,120 +617,102 @@ class StorageMessages:
                 ''', (hostname, secret, contact_id)
             )
 
-    def create_pending_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS pending (
-                    category TEXT,
-                    id TEXT,
-                    username TEXT,
-                    address TEXT
-                )
-                '''
+    def create_pending_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS pending (
+                category TEXT,
+                id TEXT,
+                username TEXT,
+                address TEXT
             )
+            '''
+        )
 
-    def create_messages_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS messages (
-                    id TEXT,
-                    author TEXT,
-                    message TEXT,
-                    amount REAL,
-                    timestamp INTEGER,
-                    edited INTEGER,
-                    replied INTEGER
-                )
-                '''
+    def create_messages_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS messages (
+                id TEXT,
+                author TEXT,
+                message TEXT,
+                amount REAL,
+                timestamp INTEGER,
+                edited INTEGER,
+                replied INTEGER
             )
+            '''
+        )
 
-    def create_unread_messages_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS unread_messages (
-                    id TEXT,
-                    author TEXT,
-                    message TEXT,
-                    amount REAL,
-                    timestamp INTEGER,
-                    edited INTEGER,
-                    replied INTEGER
-                )
-                '''
+    def create_unread_messages_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS unread_messages (
+                id TEXT,
+                author TEXT,
+                message TEXT,
+                amount REAL,
+                timestamp INTEGER,
+                edited INTEGER,
+                replied INTEGER
             )
+            '''
+        )
 
-    def create_txs_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS txs (
-                    txid TEXT
-                )
-                '''
+    def create_txs_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS txs (
+                txid TEXT
             )
+            '''
+        )
 
-    def create_key_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS key (
-                    prv_key TEXT
-                )
-                '''
+    def create_key_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS key (
+                prv_key TEXT
             )
+            '''
+        )
 
-    def create_requests_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS requests (
-                    id TEXT,
-                    address TEXT
-                )
-                '''
+    def create_requests_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS requests (
+                id TEXT,
+                address TEXT
             )
+            '''
+        )
 
-    def create_banned_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS banned (
-                    address TEXT,
-                    username TEXT
-                )
-                '''
+    def create_banned_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS banned (
+                address TEXT,
+                username TEXT
             )
+            '''
+        )
 
 
-    def create_market_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS market (
-                    contact_id TEXT,
-                    hostname TEXT,
-                    secret_key TEXT
-                )
-                '''
+    def create_market_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS market (
+                contact_id TEXT,
+                hostname TEXT,
+                secret_key TEXT
             )
+            '''
+        )
 
 
-    def add_column(self, table_name, column_name, column_type):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [row[1] for row in cursor.fetchall()]
+    def add_column(self, cursor, table_name, column_name, column_type):
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        columns = [row[1] for row in cursor.fetchall()]
 
-            if column_name not in columns:
-                cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+        if column_name not in columns:
+            cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
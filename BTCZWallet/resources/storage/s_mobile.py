@@ -3,6 +3,9 @@ import sqlite3
 from toga import App
 from ...framework import Os
 
+from .engine import connect
+from .migrations import migrate
+
 
 
 class StorageMobile:
@@ -18,61 +21,65 @@ class StorageMobile:
             Os.FileAccess.ReadWrite,
             Os.FileShare.ReadWrite
         )
+        self.migrate()
 
 
-    def create_mobile_devices_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS mobile_devices (
-                    id TEXT,
-                    name TEXT,
-                    taddress TEXT,
-                    zaddress TEXT,
-                    timestamp INTEGER
-                )
-                '''
+    def migrate(self):
+        self.migrations = migrate(self.data, (self.create_mobile_tables,))
+
+
+    def create_mobile_tables(self, cursor):
+        self.create_mobile_devices_table(cursor)
+        self.create_secret_keys_table(cursor)
+        self.create_mining_table(cursor)
+
+
+    def create_mobile_devices_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS mobile_devices (
+                id TEXT,
+                name TEXT,
+                taddress TEXT,
+                zaddress TEXT,
+                timestamp INTEGER
             )
+            '''
+        )
 
-    def create_secret_keys_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS secret_keys (
-                    id TEXT,
-                    secret_key TEXT
-                )
-                '''
+    def create_secret_keys_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS secret_keys (
+                id TEXT,
+                secret_key TEXT
             )
+            '''
+        )
 
 
-    def create_mining_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS mining (
-                    miner TEXT,
-                    address TEXT,
-                    pool TEXT,
-                    region TEXT,
-                    worker TEXT,
-                    shares REAL,
-                    balance REAL,
-                    immature REAL,
-                    paid REAL,
-                    solutions REAL,
-                    reward REAL
-                )
-                '''
+    def create_mining_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS mining (
+                miner TEXT,
+                address TEXT,
+                pool TEXT,
+                region TEXT,
+                worker TEXT,
+                shares REAL,
+                balance REAL,
+                immature REAL,
+                paid REAL,
+                solutions REAL,
+                reward REAL
             )
+            '''
+        )
 
 
     def insert_device(self, id, name, taddress, zaddress):
-        self.create_mobile_devices_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -84,8 +91,7 @@ class StorageMobile:
 
 
     def insert_secret(self, device_id, secret):
-        self.create_secret_keys_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -97,8 +103,7 @@ class StorageMobile:
 
 
     def insert_mining_stats(self, miner, address, pool, region, worker, shares, balance, immature, paid, solutions, reward):
-        self.create_mining_table()
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -111,7 +116,7 @@ class StorageMobile:
 
     def get_secret(self, device_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT secret_key FROM secret_keys WHERE id = ?',
@@ -125,7 +130,7 @@ class StorageMobile:
 
     def get_mining_stats(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT * FROM mining')
                 data = cursor.fetchone()
@@ -135,7 +140,7 @@ class StorageMobile:
 
 
     def update_mining_stats(self, miner, address, pool, region, worker, shares, balance, immature, paid, solutions, reward):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -148,7 +153,7 @@ class StorageMobile:
 
     def delete_device(self, device_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -162,7 +167,7 @@ class StorageMobile:
 
     def delete_secret(self, device_id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     '''
@@ -175,7 +180,7 @@ class StorageMobile:
 
 
     def update_device_addresses(self, id, taddress, zaddress):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -187,7 +192,7 @@ class StorageMobile:
 
 
     def update_device_connected(self, id, timestamp):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -200,7 +205,7 @@ class StorageMobile:
 
     def get_auth_ids(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT id FROM mobile_devices')
                 data = cursor.fetchall()
@@ -211,7 +216,7 @@ class StorageMobile:
 
     def get_devices(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT * FROM mobile_devices')
                 data = cursor.fetchall()
@@ -222,7 +227,7 @@ class StorageMobile:
 
     def get_device_addresses(self, id):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT taddress, zaddress FROM mobile_devices WHERE id = ?',
@@ -236,7 +241,7 @@ class StorageMobile:
 
     def get_addresses_list(self, address_type):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(f'SELECT {address_type} FROM mobile_devices')
                 data = cursor.fetchall()
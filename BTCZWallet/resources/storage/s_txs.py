@@ -4,6 +4,16 @@ import sqlite3
 from toga import App
 from ...framework import Os
 
+from .engine import connect
+from .migrations import migrate
+
+
+TXS_PROBE_LIMIT = 2000
+
+BALANCE_RESOLUTIONS = {"day": 86400, "hour": 3600}
+BALANCE_HISTORY_STATE = "balance_history"
+BALANCE_HISTORY_STALE = "stale"
+BALANCE_VALUE = "CASE WHEN {0}.blocks >= 0 THEN {0}.amount - ABS(COALESCE({0}.fee, 0)) ELSE 0 END"
 
 
 class StorageTxs:
@@ -19,43 +29,218 @@ class StorageTxs:
             Os.FileAccess.ReadWrite,
             Os.FileShare.ReadWrite
         )
+        self.migrate()
 
 
-    def create_transactions_table(self):
-        with sqlite3.connect(self.data) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS transactions (
-                    type TEXT,
-                    category TEXT,
-                    address TEXT,
-                    txid TEXT,
-                    amount REAL,
-                    blocks INTEGER,
-                    fee INTEGER,
-                    timestamp INTEGER
+    def migrate(self):
+        self.migrations = migrate(
+            self.data,
+            (
+                self.create_transactions_table,
+                self.create_amount_index,
+                self.create_balance_history_table,
+                self.create_shielded_checkpoints_table,
+                self.recreate_balance_history_triggers
+            )
+        )
+
+
+    def create_transactions_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS transactions (
+                type TEXT,
+                category TEXT,
+                address TEXT,
+                txid TEXT,
+                amount REAL,
+                blocks INTEGER,
+                fee INTEGER,
+                timestamp INTEGER
+            )
+            '''
+        )
+        cursor.execute(
+            '''
+            DELETE FROM transactions WHERE rowid NOT IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (
+                        PARTITION BY txid, address, category, amount
+                        ORDER BY blocks = 0, rowid
+                    ) AS position
+                    FROM transactions
                 )
-                '''
+                WHERE position = 1
             )
+            '''
+        )
+        cursor.execute(
+            '''
+            UPDATE transactions SET amount = outputs.amount
+            FROM (
+                SELECT id, amount FROM (
+                    SELECT rowid AS id,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY txid, address, category
+                            ORDER BY blocks = 0, rowid
+                        ) AS position,
+                        COUNT(*) OVER (PARTITION BY txid, address, category) AS outputs,
+                        round(SUM(amount) OVER (PARTITION BY txid, address, category), 8) AS amount
+                    FROM transactions
+                )
+                WHERE position = 1 AND outputs > 1
+            ) AS outputs
+            WHERE transactions.rowid = outputs.id
+            '''
+        )
+        cursor.execute(
+            '''
+            DELETE FROM transactions WHERE rowid NOT IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (
+                        PARTITION BY txid, address, category
+                        ORDER BY blocks = 0, rowid
+                    ) AS position
+                    FROM transactions
+                )
+                WHERE position = 1
+            )
+            '''
+        )
+        self.create_transactions_indexes(cursor)
+
+
+    def create_transactions_indexes(self, cursor):
+        cursor.execute(
+            '''
+            CREATE UNIQUE INDEX IF NOT EXISTS transactions_key
+            ON transactions (txid, address, category)
+            '''
+        )
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS transactions_timestamp ON transactions (timestamp DESC)'
+        )
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS transactions_address ON transactions (address, timestamp)'
+        )
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS transactions_type ON transactions (type)'
+        )
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS transactions_unconfirmed ON transactions (txid) WHERE blocks = 0'
+        )
+
+
+    def create_amount_index(self, cursor):
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS transactions_amount ON transactions (abs(amount), timestamp)'
+        )
+
+
+    def create_balance_history_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS balance_history (
+                resolution TEXT,
+                type TEXT,
+                bucket INTEGER,
+                delta REAL,
+                PRIMARY KEY (resolution, type, bucket)
+            ) WITHOUT ROWID
+            '''
+        )
+        cursor.execute(
+            f'''
+            CREATE TRIGGER IF NOT EXISTS balance_history_insert
+            AFTER INSERT ON transactions
+            WHEN NEW.timestamp IS NOT NULL
+            BEGIN
+                {self.balance_history_upsert('NEW', '+')}
+            END
+            '''
+        )
+        cursor.execute(
+            f'''
+            CREATE TRIGGER IF NOT EXISTS balance_history_update
+            AFTER UPDATE OF type, amount, blocks, fee, timestamp ON transactions
+            WHEN OLD.timestamp IS NOT NULL AND NEW.timestamp IS NOT NULL AND (
+                {BALANCE_VALUE.format('OLD')} != {BALANCE_VALUE.format('NEW')}
+                OR OLD.timestamp != NEW.timestamp OR OLD.type IS NOT NEW.type
+            )
+            BEGIN
+                {self.balance_history_upsert('OLD', '-')}
+                {self.balance_history_upsert('NEW', '+')}
+            END
+            '''
+        )
+        cursor.execute(
+            f'''
+            CREATE TRIGGER IF NOT EXISTS balance_history_delete
+            AFTER DELETE ON transactions
+            WHEN OLD.timestamp IS NOT NULL
+            BEGIN
+                {self.balance_history_upsert('OLD', '-')}
+            END
+            '''
+        )
+        self.create_sync_state_table(cursor)
+        cursor.execute(
+            'INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)',
+            (BALANCE_HISTORY_STATE, BALANCE_HISTORY_STALE)
+        )
+
+
+    def recreate_balance_history_triggers(self, cursor):
+        for name in ("insert", "update", "delete"):
+            cursor.execute(f'DROP TRIGGER IF EXISTS balance_history_{name}')
+        cursor.execute(
+            '''
+            DELETE FROM transactions
+            WHERE type = 'shielded' AND category = 'receive' AND EXISTS (
+                SELECT 1 FROM transactions AS sent
+                WHERE sent.txid = transactions.txid AND sent.address = transactions.address
+                AND sent.category = 'send'
+            )
+            '''
+        )
+        self.create_balance_history_table(cursor)
+
+
+    def balance_history_upsert(self, row, sign):
+        values = ', '.join(
+            f"('{resolution}', {row}.type, {row}.timestamp - {row}.timestamp % {size}, "
+            f"{sign}({BALANCE_VALUE.format(row)}))"
+            for resolution, size in BALANCE_RESOLUTIONS.items()
+        )
+        return f'''
+            INSERT INTO balance_history (resolution, type, bucket, delta) VALUES {values}
+            ON CONFLICT (resolution, type, bucket) DO UPDATE SET delta = delta + excluded.delta;
+        '''
 
 
     def insert_transaction(self, tx_type, category, address, txid, amount, blocks, fee, timestamp):
-        self.create_transactions_table()
-        with sqlite3.connect(self.data) as conn:
+        self.insert_transactions([(tx_type, category, address, txid, amount, blocks, fee, timestamp)])
+
+
+    def insert_transactions(self, rows):
+        with connect(self.data) as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 '''
                 INSERT INTO transactions (type, category, address, txid, amount, blocks, fee, timestamp)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (txid, address, category) DO UPDATE SET
+                    amount = excluded.amount,
+                    blocks = CASE WHEN excluded.blocks > 0 THEN excluded.blocks ELSE transactions.blocks END,
+                    fee = COALESCE(excluded.fee, transactions.fee)
                 ''',
-                (tx_type, category, address, txid, amount, blocks, fee, timestamp)
+                rows
             )
 
 
     def get_transaction(self, txid):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     'SELECT * FROM transactions WHERE txid = ?',
@@ -69,7 +254,7 @@ class StorageTxs:
 
     def get_transactions(self, option = None, tx_type = None):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 if option:
                     cursor.execute(
@@ -78,19 +263,230 @@ class StorageTxs:
                     )
                     transactions = [row[0] for row in cursor.fetchall()]
                 else:
-                    cursor.execute('SELECT * FROM transactions')
+                    cursor.execute('SELECT * FROM transactions ORDER BY timestamp DESC')
                     transactions = cursor.fetchall()
                 return transactions
         except sqlite3.OperationalError:
             return []
 
 
+    def get_transactions_page(self, limit, offset):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT * FROM transactions ORDER BY timestamp DESC LIMIT ? OFFSET ?',
+                    (limit, offset)
+                )
+                return cursor.fetchall()
+        except sqlite3.OperationalError:
+            return []
+
+
+    def count_transactions(self, tx_type = None):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                if tx_type:
+                    cursor.execute(
+                        'SELECT COUNT(*) FROM transactions WHERE type = ?',
+                        (tx_type,)
+                    )
+                else:
+                    cursor.execute('SELECT COUNT(*) FROM transactions')
+                return cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+
+
+    def iter_transaction_keys(self, tx_type):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT txid, category, address FROM transactions WHERE type = ?',
+                    (tx_type,)
+                )
+                for row in cursor:
+                    yield row
+        except sqlite3.OperationalError:
+            return
+
+
+    def count_export_transactions(self, start = None, end = None, address = None):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f'''
+                    SELECT COUNT(*) FROM transactions
+                    WHERE {'address = ? AND' if address else ''}
+                    (? IS NULL OR timestamp >= ?)
+                    AND (? IS NULL OR timestamp < ?)
+                    ''',
+                    ((address,) if address else ()) + (start, start, end, end)
+                )
+                return cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+
+
+    def iter_export_transactions(self, start = None, end = None, address = None, chunk = 5000):
+        value = BALANCE_VALUE.format('transactions')
+        with connect(self.data) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f'''
+                SELECT type, category, address, txid, amount, blocks, fee, timestamp,
+                    strftime('%Y-%m-%d %H:%M:%S', timestamp, 'unixepoch', 'localtime'),
+                    ROUND(address_balance, 8), ROUND(type_balance, 8)
+                FROM (
+                    SELECT *, rowid AS position,
+                        SUM({value}) OVER (
+                            PARTITION BY address ORDER BY timestamp, rowid
+                            ROWS UNBOUNDED PRECEDING
+                        ) AS address_balance,
+                        SUM({value}) OVER (
+                            PARTITION BY type ORDER BY timestamp, rowid
+                            ROWS UNBOUNDED PRECEDING
+                        ) AS type_balance
+                    FROM transactions
+                    {'WHERE address = ?' if address else ''}
+                )
+                WHERE (? IS NULL OR timestamp >= ?)
+                AND (? IS NULL OR timestamp < ?)
+                ORDER BY timestamp, position
+                ''',
+                ((address,) if address else ()) + (start, start, end, end)
+            )
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                yield rows
+
+
+    def get_transactions_after(self, position, limit, query = None):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                conditions, params = self.search_conditions(cursor, query)
+                if position is not None:
+                    timestamp, rowid = position
+                    conditions.append('timestamp <= ? AND (timestamp < ? OR rowid > ?)')
+                    params.extend((timestamp, timestamp, rowid))
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(
+                    f'''
+                    SELECT *, rowid FROM transactions
+                    {where}
+                    ORDER BY timestamp DESC, rowid ASC
+                    LIMIT ?
+                    ''',
+                    params + [limit]
+                )
+                return cursor.fetchall()
+        except sqlite3.OperationalError:
+            return []
+
+
+    def get_transaction_position(self, offset, query = None):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                conditions, params = self.search_conditions(cursor, query)
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(
+                    f'''
+                    SELECT timestamp, rowid FROM transactions
+                    {where}
+                    ORDER BY timestamp DESC, rowid ASC
+                    LIMIT 1 OFFSET ?
+                    ''',
+                    params + [offset]
+                )
+                return cursor.fetchone()
+        except sqlite3.OperationalError:
+            return None
+
+
+    def count_search_transactions(self, query, limit):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                conditions, params = self.search_conditions(cursor, query)
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(
+                    f'SELECT COUNT(*) FROM (SELECT 1 FROM transactions {where} LIMIT ?)',
+                    params + [limit]
+                )
+                return cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+
+
+    def search_conditions(self, cursor, query):
+        conditions = []
+        params = []
+        if query is None:
+            return conditions, params
+        if query.address:
+            conditions.append('address = ?')
+            params.append(query.address)
+        if query.addresses:
+            conditions.append(f"address IN ({', '.join('?' * len(query.addresses))})")
+            params.extend(query.addresses)
+
+        ranges = []
+        if query.txid:
+            ranges.append(('txid', '{0} >= ? AND {0} < ?', [query.txid, query.txid + 'g']))
+        if query.min_amount is not None or query.max_amount is not None:
+            low = query.min_amount if query.min_amount is not None else 0
+            high = query.max_amount if query.max_amount is not None else float('inf')
+            ranges.append(('abs(amount)', '{0} BETWEEN ? AND ?', [low, high]))
+        driving = None
+        if not query.address and not query.addresses and ranges:
+            driving = self.probe_ranges(cursor, ranges)
+        for index, (column, condition, values) in enumerate(ranges):
+            conditions.append(condition.format(column if index == driving else f'+{column}'))
+            params.extend(values)
+
+        if query.start is not None:
+            conditions.append('timestamp >= ?')
+            params.append(query.start)
+        if query.end is not None:
+            conditions.append('timestamp < ?')
+            params.append(query.end)
+        if query.category:
+            conditions.append('category = ?')
+            params.append(query.category)
+        if query.tx_type:
+            conditions.append('+type = ?')
+            params.append(query.tx_type)
+        return conditions, params
+
+
+    def probe_ranges(self, cursor, ranges):
+        driving = None
+        smallest = TXS_PROBE_LIMIT
+        for index, (column, condition, values) in enumerate(ranges):
+            cursor.execute(
+                f'SELECT COUNT(*) FROM (SELECT 1 FROM transactions WHERE {condition.format(column)} LIMIT ?)',
+                values + [TXS_PROBE_LIMIT]
+            )
+            count = cursor.fetchone()[0]
+            if count < smallest:
+                driving = index
+                smallest = count
+        return driving
+
+
     def get_mobile_transactions(self, address):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    'SELECT * FROM transactions WHERE address = ?',
+                    'SELECT * FROM transactions WHERE address = ? ORDER BY timestamp DESC',
                     (address,)
                 )
                 transactions = cursor.fetchall()
@@ -101,7 +497,7 @@ class StorageTxs:
 
     def get_unconfirmed_transactions(self):
         try:
-            with sqlite3.connect(self.data) as conn:
+            with connect(self.data) as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT txid FROM transactions WHERE blocks = 0')
                 transactions = [row[0] for row in cursor.fetchall()]
@@ -111,7 +507,7 @@ class StorageTxs:
 
 
     def update_transaction(self, txid, blocks):
-        with sqlite3.connect(self.data) as conn:
+        with connect(self.data) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''
@@ -120,3 +516,239 @@ class StorageTxs:
                 WHERE txid = ?
                 ''', (blocks, txid)
             )
+
+
+    def create_sync_state_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+            '''
+        )
+
+
+    def get_sync_state(self, key):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT value FROM sync_state WHERE key = ?',
+                    (key,)
+                )
+                state = cursor.fetchone()
+                return state[0] if state else None
+        except sqlite3.OperationalError:
+            return None
+
+
+    def set_sync_state(self, key, value):
+        with connect(self.data) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                INSERT OR REPLACE INTO sync_state (key, value)
+                VALUES (?, ?)
+                ''',
+                (key, str(value))
+            )
+
+
+    def delete_sync_state(self, key):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'DELETE FROM sync_state WHERE key = ?',
+                    (key,)
+                )
+        except sqlite3.OperationalError:
+            pass
+
+
+    def get_transaction_keys(self, txids, tx_type):
+        txids = list(set(txids))
+        keys = set()
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(txids), 500):
+                    chunk = txids[start:start + 500]
+                    cursor.execute(
+                        f'''
+                        SELECT txid, category, address FROM transactions
+                        WHERE +type = ? AND txid IN ({", ".join("?" * len(chunk))})
+                        ''',
+                        (tx_type, *chunk)
+                    )
+                    keys.update(cursor.fetchall())
+            return keys
+        except sqlite3.OperationalError:
+            return keys
+
+
+    def rewind_transactions(self, tx_type, height):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'DELETE FROM transactions WHERE type = ? AND blocks > ?',
+                    (tx_type, height)
+                )
+                return cursor.rowcount
+        except sqlite3.OperationalError:
+            return 0
+
+
+    def create_shielded_checkpoints_table(self, cursor):
+        cursor.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS shielded_checkpoints (
+                address TEXT PRIMARY KEY,
+                height INTEGER,
+                notes INTEGER,
+                balance REAL
+            )
+            '''
+        )
+
+
+    def get_shielded_checkpoints(self):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT address, height, notes, balance FROM shielded_checkpoints')
+                return {row[0]: row[1:] for row in cursor.fetchall()}
+        except sqlite3.OperationalError:
+            return {}
+
+
+    def set_shielded_checkpoint(self, address, height, notes, balance):
+        with connect(self.data) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                INSERT OR REPLACE INTO shielded_checkpoints (address, height, notes, balance)
+                VALUES (?, ?, ?, ?)
+                ''',
+                (address, height, notes, balance)
+            )
+
+
+    def update_transactions(self, updates):
+        with connect(self.data) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                '''
+                UPDATE transactions
+                SET blocks = ?
+                WHERE txid = ?
+                ''', updates
+            )
+
+
+    def rebuild_balance_history(self):
+        with connect(self.data) as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM balance_history')
+            buckets = 0
+            for resolution, size in BALANCE_RESOLUTIONS.items():
+                cursor.execute(
+                    f'''
+                    INSERT INTO balance_history (resolution, type, bucket, delta)
+                    SELECT ?, type, timestamp - timestamp % ?, SUM({BALANCE_VALUE.format('transactions')})
+                    FROM transactions
+                    WHERE timestamp IS NOT NULL
+                    GROUP BY type, timestamp - timestamp % ?
+                    ''',
+                    (resolution, size, size)
+                )
+                buckets += cursor.rowcount
+            cursor.execute('DELETE FROM sync_state WHERE key = ?', (BALANCE_HISTORY_STATE,))
+            return buckets
+
+
+    def get_balance_history(self, resolution, start = None):
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                if start is None:
+                    cursor.execute(
+                        '''
+                        SELECT bucket, type, ROUND(SUM(delta) OVER (
+                            PARTITION BY type ORDER BY bucket
+                            ROWS UNBOUNDED PRECEDING
+                        ), 8)
+                        FROM balance_history
+                        WHERE resolution = ?
+                        ORDER BY bucket
+                        ''',
+                        (resolution,)
+                    )
+                    return cursor.fetchall()
+                day = start - start % BALANCE_RESOLUTIONS["day"]
+                cursor.execute(
+                    '''
+                    WITH opening AS (
+                        SELECT type, SUM(delta) AS balance FROM (
+                            SELECT type, delta FROM balance_history
+                            WHERE resolution = 'day' AND type IN ('transparent', 'shielded') AND bucket < ?
+                            UNION ALL
+                            SELECT type, delta FROM balance_history
+                            WHERE resolution = 'hour' AND type IN ('transparent', 'shielded')
+                            AND bucket >= ? AND bucket < ?
+                        )
+                        GROUP BY type
+                    )
+                    SELECT ?, type, ROUND(balance, 8), 0 FROM opening
+                    UNION ALL
+                    SELECT bucket, type, ROUND(
+                        COALESCE((SELECT balance FROM opening WHERE opening.type = history.type), 0)
+                        + SUM(delta) OVER (PARTITION BY type ORDER BY bucket ROWS UNBOUNDED PRECEDING), 8
+                    ), 1
+                    FROM balance_history AS history
+                    WHERE resolution = ? AND type IN ('transparent', 'shielded') AND bucket >= ?
+                    ORDER BY 1, 4
+                    ''',
+                    (day, day, start, start, resolution, start)
+                )
+                return [row[:3] for row in cursor.fetchall()]
+        except sqlite3.OperationalError:
+            return []
+
+
+    def get_address_balance_history(self, resolution, addresses, start = None):
+        placeholders = ', '.join('?' for _ in addresses)
+        value = BALANCE_VALUE.format('transactions')
+        try:
+            with connect(self.data) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f'''
+                    WITH opening AS (
+                        SELECT type, SUM({value}) AS balance
+                        FROM transactions
+                        WHERE address IN ({placeholders}) AND timestamp < ?
+                        GROUP BY type
+                    ),
+                    history AS (
+                        SELECT timestamp - timestamp % ? AS bucket, type, SUM({value}) AS delta
+                        FROM transactions
+                        WHERE address IN ({placeholders}) AND timestamp >= COALESCE(?, 0)
+                        GROUP BY 1, 2
+                    )
+                    SELECT ?, type, ROUND(balance, 8), 0 FROM opening
+                    UNION ALL
+                    SELECT bucket, type, ROUND(
+                        COALESCE((SELECT balance FROM opening WHERE opening.type = history.type), 0)
+                        + SUM(delta) OVER (PARTITION BY type ORDER BY bucket ROWS UNBOUNDED PRECEDING), 8
+                    ), 1
+                    FROM history
+                    ORDER BY 1, 4
+                    ''',
+                    (*addresses, start, BALANCE_RESOLUTIONS[resolution], *addresses, start, start)
+                )
+                return [row[:3] for row in cursor.fetchall()]
+        except sqlite3.OperationalError:
+            return []
@@ -0,0 +1,33 @@
+from .storage.s_txs import BALANCE_RESOLUTIONS, BALANCE_HISTORY_STATE
+
+
+BALANCE_TYPES = ("transparent", "shielded")
+
+
+class BalanceHistory():
+    def __init__(self, storage):
+        super().__init__()
+
+        self.storage = storage
+
+
+    def is_stale(self):
+        return self.storage.get_sync_state(BALANCE_HISTORY_STATE) is not None
+
+
+    def series(self, resolution = "day", start = None, addresses = None):
+        if resolution not in BALANCE_RESOLUTIONS:
+            raise ValueError(f"Invalid resolution '{resolution}'")
+        if addresses is None:
+            history = self.storage.get_balance_history(resolution, start)
+        else:
+            history = self.storage.get_address_balance_history(resolution, addresses, start)
+        points = []
+        balances = dict.fromkeys(BALANCE_TYPES, 0)
+        for bucket, tx_type, balance in history:
+            balances[tx_type] = balance
+            if points and points[-1][0] == bucket:
+                points[-1] = [bucket] + [balances[name] for name in BALANCE_TYPES]
+            else:
+                points.append([bucket] + [balances[name] for name in BALANCE_TYPES])
+        return points
@@ -1,10 +1,10 @@
 
 import asyncio
-import operator
+import time
 from datetime import datetime
 import webbrowser
 
-from toga import App, Box, Label, Window, Button
+from toga import App, Box, Label, Window, Button, TextInput
 from ..framework import (
     Table, Command, Color, DockStyle,
     AlignTable, SelectMode, BorderStyle,
@@ -15,6 +15,27 @@ from toga.colors import rgb, GRAY, WHITE, GREEN, RED, ORANGE, BLACK
 from toga.constants import COLUMN, CENTER, BOLD, ROW
 
 from .storage import StorageMessages, StorageTxs, StorageMobile
+from .blocks import BlockCache
+from .history import TransactionHistory
+from .rows import RowCache
+from .timeline import BalanceHistory
+from .scheduler import TASK_PRIORITY_LOW
+from .search import TransactionQuery, SEARCH_DELAY
+from .confirmations import ConfirmationTracker
+from .index import INDEX_TRANSPARENT, INDEX_SHIELDED, INDEX_MOBILE_TADDRESS, INDEX_MOBILE_ZADDRESS
+from .events import (
+    NEW_BLOCK, MEMPOOL_CHANGED, WALLET_CHANGED, TRANSACTIONS_CHANGED, SAFETY_POLL_INTERVAL
+)
+
+
+TRANSPARENT_SYNC_BLOCK = "transparent_lastblock"
+TRANSPARENT_BACKFILL = "transparent_backfill"
+BACKFILL_DONE = "done"
+BACKFILL_PAGE_SIZE = 1000
+TRANSPARENT_CATEGORIES = ("send", "receive")
+SHIELDED_SCAN_BATCH = 20
+SHIELDED_SCAN_CONCURRENCY = 3
+SHIELDED_FULL_SCAN_INTERVAL = 600
 
 
 
@@ -295,7 +316,7 @@ class Txid(Window):
                 if not self.updating_txid:
                     return
                 if self.address.startswith("z"):
-                    transaction_info = self.storagetxs.get_transaction(self.txid)
+                    transaction_info = await self.main.async_storage.txs.get_transaction(self.txid)
                     tx_type, category, address, txid, amount_val, blocks, fee_val, timestamp = transaction_info
 
                     amount = self.units.format_balance(amount_val)
@@ -414,19 +435,24 @@ class Transactions(Box):
         self.storagemsgs = StorageMessages(self.app)
         self.storagetxs = StorageTxs(self.app)
         self.storage_mobile = StorageMobile(self.app)
+        self.block_cache = BlockCache(self.app, self.rpc, self.main.async_storage.blocks)
+        self.history = TransactionHistory(self.main.async_storage.txs)
+        self.confirmations = ConfirmationTracker(self.app, self.rpc, self.main.async_storage.txs)
+        self.balance_history = BalanceHistory(self.storagetxs)
         self.clipboard = ClipBoard()
         self.notify = self.main.notify
 
         self.transactions_toggle = None
         self.no_transaction_toggle = None
-        self.no_more_transactions = None
-        self.scroll_toggle = None
+        self.table_toggle = None
         self.txid_toggle = None
 
-        self.transactions_count = 50
-        self.transactions_from = 0
-        self.transactions_ids = []
-        self.transactions_data = []
+        self.transactions_ids = set()
+        self.shielded_full_scan = None
+        self.search_handle = None
+        self.extend_handle = None
+        self.hidden_balances = self.settings.hidden_balances()
+        self.row_cache = RowCache(self.format_row)
 
         self.rtl = None
         lang = self.settings.language()
@@ -497,7 +523,6 @@ class Transactions(Box):
                 self.copy_address_cmd,
                 self.explorer_cmd
             ],
-            on_scroll=self.on_scroll_table,
             on_double_click=self.transactions_table_double_click,
             font=self.font.get(7, True),
             cell_font=self.font.get(9, True),
@@ -505,6 +530,19 @@ class Transactions(Box):
         )
         self.transactions_table.KeyDown += self.table_keydown
 
+        self.search_input = TextInput(
+            placeholder=self.tr.text("search_input"),
+            style=Pack(
+                color = WHITE,
+                background_color = rgb(30,33,36)
+            ),
+            on_change=self.on_search_change,
+            on_confirm=self.on_search_confirm
+        )
+        self.search_input._impl.native.Font = self.font.get(9)
+        self.search_input._impl.native.BorderStyle = BorderStyle.NONE
+        self.search_input._impl.native.Dock = DockStyle.TOP
+
         self.no_transaction = Label(
             text="No Transactions found.",
             style=Pack(
@@ -519,37 +557,53 @@ class Transactions(Box):
 
 
     async def run_tasks(self):
-        self.app.loop.create_task(self.gather_transparent_transactions())
-        await asyncio.sleep(0.5)
-        self.app.loop.create_task(self.update_unconfirmed_transactions())
-        await asyncio.sleep(0.5)
-        self.app.loop.create_task(self.gather_shielded_transactions())
-        await asyncio.sleep(1)
-        self.app.loop.create_task(self.update_transactions_table())
+        for data in await self.main.async_storage.txs.get_transactions_after(None, 50):
+            txid = data[3]
+            self.transactions_ids.add(txid)
+        scheduler = self.main.scheduler
+        scheduler.register(
+            "Transparent transactions", self.sync_transparent_transactions, SAFETY_POLL_INTERVAL,
+            needs_node=True, events=(WALLET_CHANGED,)
+        )
+        scheduler.register(
+            "Unconfirmed transactions", self.sync_unconfirmed_transactions, SAFETY_POLL_INTERVAL,
+            events=(NEW_BLOCK, MEMPOOL_CHANGED)
+        )
+        scheduler.register(
+            "Shielded transactions", self.sync_shielded_transactions, SAFETY_POLL_INTERVAL,
+            needs_node=True, events=(WALLET_CHANGED,)
+        )
+        scheduler.register(
+            "Transactions list", self.update_transactions_table, 6,
+            events=(TRANSACTIONS_CHANGED,)
+        )
+        scheduler.register(
+            "Balance history", self.rebuild_balance_history, 300, TASK_PRIORITY_LOW
+        )
 
 
     def insert_widgets(self):
         if not self.transactions_toggle:
-            sorted_transactions = self.get_transactions(self.transactions_count, self.transactions_from)
-            if sorted_transactions:
-                self._impl.native.Controls.Add(self.transactions_table)
-                self.create_rows(sorted_transactions)
-            else:
-                self.no_transactions_found()
             self.transactions_toggle = True
+            self.app.loop.create_task(self.refresh_transactions())
 
 
-    def get_transactions(self, limit, offset):
-        transactions_list = self.storagetxs.get_transactions()
-        if not transactions_list:
-            return []
-        sorted_transactions = sorted(
-            transactions_list,
-            key=operator.itemgetter(7),
-            reverse=True
-        )
-        transactions = sorted_transactions[offset:offset + limit]
-        return transactions
+    def add_transactions_table(self):
+        self.table_toggle = True
+        self._impl.native.Controls.Add(self.transactions_table)
+        self._impl.native.Controls.Add(self.search_input._impl.native)
+        self.set_table_source()
+
+
+    def set_table_source(self):
+        columns = {
+            self.tr.text("column_category"): True,
+            self.tr.text("column_address"): False,
+            self.tr.text("column_amount"): False,
+            self.tr.text("column_time"): False,
+            'TxID': False
+        }
+        self.transactions_table.set_virtual_source(columns, self.history.count, self.get_cell_value)
 
     
     def no_transactions_found(self):
@@ -557,42 +611,53 @@ class Transactions(Box):
         self.no_transaction_toggle = True
 
 
-    def create_rows(self, sorted_transactions):
-        
-        for data in sorted_transactions:
-            tx_type = data[0]
-            category = data[1]
-            address = data[2]
-            if category == "send":
-                if tx_type == "shielded":
-                    icon = "images/tx_send_shielded.png"
-                else:
-                    icon = "images/tx_send_transparent.png"
-            elif category == "receive":
-                if tx_type == "shielded":
-                    icon = "images/tx_receive_shielded.png"
-                else:
-                    icon = "images/tx_receive_transparent.png"
+    def get_cell_value(self, row, column):
+        if self.history.wants_more(row) and not self.extend_handle:
+            self.extend_handle = self.app.loop.create_task(self.extend_search())
+        data = self.history.get_row(row)
+        if data is None:
+            if self.history.is_missing(row):
+                self.app.loop.create_task(self.load_rows(row))
+            return None
+        return self.row_cache.get(data)[column]
 
-            txid = data[3]
-            amount = data[4]
-            if self.settings.hidden_balances():
-                amount = "*.********"
-            timereceived = data[7]
-            formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
-            if self.rtl:
-                amount = self.units.arabic_digits(str(amount))
-                formatted_timereceived = self.units.arabic_digits(formatted_timereceived)
-            row = {
-                self.tr.text("column_category"): icon,
-                self.tr.text("column_address"): address,
-                self.tr.text("column_amount"): amount,
-                self.tr.text("column_time"): formatted_timereceived,
-                'TxID': txid,
-            }
-            self.transactions_data.append(row)
-        
-        self.transactions_table.data_source = self.transactions_data
+
+    async def load_rows(self, row):
+        if await self.history.load(row):
+            self.transactions_table.update_row_count(self.history.count)
+
+
+    def format_row(self, data):
+        tx_type = data[0]
+        category = data[1]
+        address = data[2]
+        if category == "send":
+            if tx_type == "shielded":
+                icon = "images/tx_send_shielded.png"
+            else:
+                icon = "images/tx_send_transparent.png"
+        elif category == "receive":
+            if tx_type == "shielded":
+                icon = "images/tx_receive_shielded.png"
+            else:
+                icon = "images/tx_receive_transparent.png"
+
+        txid = data[3]
+        amount = data[4]
+        if self.hidden_balances:
+            amount = "*.********"
+        timereceived = data[7]
+        formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
+        if self.rtl:
+            amount = self.units.arabic_digits(str(amount))
+            formatted_timereceived = self.units.arabic_digits(formatted_timereceived)
+        return [icon, address, amount, formatted_timereceived, txid]
+
+
+    def set_hidden_balances(self, hidden):
+        self.hidden_balances = hidden
+        self.row_cache.invalidate()
+        self.reload_transactions()
 
 
     def table_keydown(self, sender, e):
@@ -602,204 +667,391 @@ class Transactions(Box):
 
     def reload_transactions(self):
         if self.transactions_toggle:
-            self.transactions_from = 0
-            self.no_more_transactions = None
-            sorted_transactions = self.get_transactions(self.transactions_count, self.transactions_from)
-            if sorted_transactions:
-                if self.no_transaction_toggle:
-                    self.remove(self.no_transaction)
-                    self._impl.native.Controls.Add(self.transactions_table)
+            self.app.loop.create_task(self.refresh_transactions())
 
-                self.transactions_table.data_source.clear()
-                self.create_rows(sorted_transactions)
 
+    async def refresh_transactions(self):
+        if not self.transactions_toggle:
+            return
+        count = await self.history.refresh()
+        if self.table_toggle:
+            self.transactions_table.update_row_count(count)
+        elif count:
+            if self.no_transaction_toggle:
+                self.remove(self.no_transaction)
+                self.no_transaction_toggle = None
+            self.add_transactions_table()
+        elif not self.no_transaction_toggle:
+            self.no_transactions_found()
+
+
+    async def extend_search(self):
+        try:
+            count = await self.history.extend()
+            self.transactions_table.update_row_count(count)
+        finally:
+            self.extend_handle = None
+
+
+    def on_search_change(self, input):
+        if self.search_handle:
+            self.search_handle.cancel()
+        self.search_handle = self.app.loop.call_later(SEARCH_DELAY, self.apply_search)
 
-    async def gather_transparent_transactions(self):
-        self.app.console.event_log(f"✔: Transparent transactions")
-        tx_type = "transparent"
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            new_mobile_tx = False
-            new_transactions = await self.get_transaparent_transactions(9999, 0)
-            if new_transactions:
-                stored_transactions = self.storagetxs.get_transactions(True, "transparent")
-                for data in new_transactions:
-                    txid = data["txid"]
-                    address = data.get("address", "Shielded")
-                    category = data["category"]
-                    amount = data["amount"]
-                    timereceived = data["timereceived"]
-                    fee = 0
-                    if "fee" in data:
-                        fee = data["fee"]
-                    if txid not in stored_transactions:
-                        mobile_addresses = self.storage_mobile.get_addresses_list("taddress")
-                        if address in mobile_addresses:
-                            new_mobile_tx = True
-                        if "blockhash" not in data:
-                            blocks = 0
-                            self.storagetxs.insert_transaction(tx_type, category, address, txid, amount, blocks, fee, timereceived)
-                        else:
-                            blockhash = data["blockhash"]
-                            asyncio.create_task((self.get_block_height(blockhash, tx_type, category, address, txid, amount, fee, timereceived)))
 
-                if new_mobile_tx:
-                    self.main.mobile_server.broker.push("update_transactions")
-                        
-            await asyncio.sleep(10)
-            
+    def on_search_confirm(self, input):
+        if self.search_handle:
+            self.search_handle.cancel()
+        self.apply_search()
 
 
-    async def update_unconfirmed_transactions(self):
-        self.app.console.event_log(f"✔: Unconfirmed transactions")
+    def apply_search(self):
+        self.search_handle = None
+        text = self.search_input.value.strip()
+        try:
+            query = TransactionQuery.parse(text) if text else None
+        except ValueError:
+            self.search_input.style.color = RED
+            return
+        self.search_input.style.color = WHITE
+        self.app.loop.create_task(self.search_transactions(query))
+
+
+    async def search_transactions(self, query):
+        count = await self.history.set_query(query)
+        self.transactions_table.update_row_count(count)
+
+
+    async def sync_transparent_transactions(self):
+        inserted = 0
+        last_block = await self.main.async_storage.txs.get_sync_state(TRANSPARENT_SYNC_BLOCK)
+        if last_block is None:
+            last_block,_ = await self.rpc.getBestBlockHash()
+            if not last_block:
+                return None
+            await self.main.async_storage.txs.set_sync_state(TRANSPARENT_SYNC_BLOCK, last_block)
+            await self.main.async_storage.txs.set_sync_state(TRANSPARENT_BACKFILL, 0)
+
+        backfill = await self.main.async_storage.txs.get_sync_state(TRANSPARENT_BACKFILL)
+        if backfill is not None and backfill != BACKFILL_DONE:
+            inserted += await self.backfill_transparent_transactions(int(backfill))
+
+        results = await self.rpc.batch(
+            [
+                ("getblockheader", [last_block, True]),
+                ("listsinceblock", [last_block, 1])
+            ]
+        )
+        (header, header_error), (since_block, _) = results
+        if not header or header.get("confirmations", -1) < 0:
+            if not header and "not found" not in str(header_error).lower():
+                return inserted
+            last_block = await self.rewind_transparent_transactions(header)
+            if last_block is None:
+                return inserted
+            since_block,_ = await self.rpc.listSinceBlock(last_block)
+
+        if since_block:
+            stored, complete = await self.store_transparent_transactions(since_block["transactions"])
+            inserted += stored
+            if complete and since_block.get("lastblock"):
+                await self.main.async_storage.txs.set_sync_state(TRANSPARENT_SYNC_BLOCK, since_block["lastblock"])
+
+        if inserted:
+            self.rpc.events.emit(TRANSACTIONS_CHANGED)
+        return inserted
+
+
+    async def backfill_transparent_transactions(self, offset):
+        inserted = 0
         while True:
-            unconfirmed_transactions = self.storagetxs.get_unconfirmed_transactions()
-            if unconfirmed_transactions:
-                for txid in unconfirmed_transactions:
-                    result,_ = await self.rpc.getTransaction(txid)
-                    if "blockhash" in result:
-                        blockhash = result["blockhash"]
-                        result,_ = await self.rpc.getBlock(blockhash)
-                        if result:
-                            height = result.get("height")
-                            self.storagetxs.update_transaction(txid, height)
+            transactions,_ = await self.rpc.listTransactions(BACKFILL_PAGE_SIZE, offset)
+            if transactions is None:
+                return inserted
+            if len(transactions) < BACKFILL_PAGE_SIZE:
+                page = transactions
+            else:
+                page = self.whole_transactions(transactions)
+            stored, complete = await self.store_transparent_transactions(page)
+            inserted += stored
+            if not complete:
+                return inserted
+            if len(transactions) < BACKFILL_PAGE_SIZE:
+                await self.main.async_storage.txs.set_sync_state(TRANSPARENT_BACKFILL, BACKFILL_DONE)
+                return inserted
+            offset += len(page)
+            await self.main.async_storage.txs.set_sync_state(TRANSPARENT_BACKFILL, offset)
+
+
+    def whole_transactions(self, transactions):
+        oldest_txid = transactions[0]["txid"]
+        split = 0
+        while split < len(transactions) and transactions[split]["txid"] == oldest_txid:
+            split += 1
+        if split == len(transactions):
+            return transactions
+        return transactions[split:]
+
+
+    async def rewind_transparent_transactions(self, header):
+        while header and header.get("confirmations", -1) < 0:
+            header,_ = await self.rpc.getBlockHeader(header["previousblockhash"])
+        if not header:
+            await self.main.async_storage.txs.delete_sync_state(TRANSPARENT_SYNC_BLOCK)
+            await self.main.async_storage.txs.delete_sync_state(TRANSPARENT_BACKFILL)
+            self.app.console.info_log(f"Transparent sync checkpoint lost, resyncing history")
+            return None
+        height = header["height"]
+        removed = await self.main.async_storage.txs.rewind_transactions("transparent", height)
+        self.main.tx_index.invalidate(INDEX_TRANSPARENT)
+        await self.main.async_storage.txs.set_sync_state(TRANSPARENT_SYNC_BLOCK, header["hash"])
+        self.app.console.info_log(f"Chain reorg, transparent transactions rewound to block {height}")
+        if removed:
+            self.rpc.events.emit(TRANSACTIONS_CHANGED)
+        return header["hash"]
+
+
+    async def store_transparent_transactions(self, transactions):
+        tx_type = "transparent"
+        new_mobile_tx = False
+        mobile_addresses = None
+        inserted = 0
+        complete = True
+        outputs = {}
+        for data in transactions:
+            if data["category"] not in TRANSPARENT_CATEGORIES:
+                continue
+            key = (data["txid"], data["category"], data.get("address", "Shielded"))
+            if key in outputs:
+                outputs[key][0] += data["amount"]
+            else:
+                outputs[key] = [data["amount"], data]
+        if not outputs:
+            return inserted, complete
+        tx_index = self.main.tx_index
+        stored_transactions = await tx_index.known(INDEX_TRANSPARENT, outputs)
+        rows = []
+        confirmed = []
+        for (txid, category, address), (amount, data) in outputs.items():
+            if (txid, category, address) in stored_transactions:
+                continue
+            amount = round(amount, 8)
+            timereceived = data["timereceived"]
+            fee = data.get("fee", 0)
+            if mobile_addresses is None:
+                mobile_addresses = await tx_index.members(INDEX_MOBILE_TADDRESS)
+            if address in mobile_addresses:
+                new_mobile_tx = True
+            if "blockhash" not in data:
+                rows.append((tx_type, category, address, txid, amount, 0, fee, timereceived))
+            else:
+                confirmed.append(
+                    (data["blockhash"], (category, address, txid, amount, fee, timereceived))
+                )
+
+        if confirmed:
+            blocks = await self.block_cache.get_blocks(blockhash for blockhash, _ in confirmed)
+            for (_, transaction), block in zip(confirmed, blocks):
+                if block:
+                    category, address, txid, amount, fee, timereceived = transaction
+                    rows.append((tx_type, category, address, txid, amount, block[1], fee, timereceived))
+                else:
+                    complete = False
 
-            await asyncio.sleep(10)
+        if rows:
+            await self.main.async_storage.txs.insert_transactions(rows)
+            for _, category, address, txid, _, blocks, _, _ in rows:
+                tx_index.add(INDEX_TRANSPARENT, (txid, category, address))
+                if not blocks:
+                    self.confirmations.track(txid)
+            inserted += len(rows)
 
+        if new_mobile_tx:
+            self.main.mobile_server.broker.push("update_transactions")
+        return inserted, complete
 
 
-    async def get_block_height(self, blockhash, tx_type, category, address, txid, amount, fee, timereceived):
-        result,_ = await self.rpc.getBlock(blockhash)
-        if result:
-            height = result.get("height")
-            self.storagetxs.insert_transaction(tx_type, category, address, txid, amount, height, fee, timereceived)
+    async def sync_unconfirmed_transactions(self):
+        return await self.confirmations.check()
 
 
-    async def get_transaparent_transactions(self, count, tx_from):
-        transactions,_ = await self.rpc.listTransactions(
-            count, tx_from
+    async def sync_shielded_transactions(self):
+        results = await self.rpc.batch(
+            [
+                ("z_listaddresses", []),
+                ("z_listunspent", [0, 9999999, True])
+            ]
         )
-        if transactions:
-            return transactions
-        return None
+        (addresses_data, _), (unspent_notes, _) = results
+        if addresses_data is None or unspent_notes is None:
+            return None
+
+        message_address = await self.main.async_storage.messages.get_identity("address")
+        if message_address:
+            address_items = {address for address in addresses_data if address != message_address[0]}
+        else:
+            address_items = set(addresses_data)
+        states = {address: [0, 0] for address in address_items}
+        for note in unspent_notes:
+            state = states.get(note["address"])
+            if state is not None:
+                state[0] += 1
+                state[1] += note["amount"]
+
+        checkpoints = await self.main.async_storage.txs.get_shielded_checkpoints()
+        now = time.monotonic()
+        if self.shielded_full_scan is None:
+            self.shielded_full_scan = now
+        if now - self.shielded_full_scan >= SHIELDED_FULL_SCAN_INTERVAL:
+            self.shielded_full_scan = now
+            changed = list(states)
+        else:
+            changed = [
+                address for address, (notes, balance) in states.items()
+                if checkpoints.get(address, (None, None, None))[1:] != (notes, round(balance, 8))
+            ]
+        if not changed:
+            return 0
+
+        chunks = [
+            changed[start:start + SHIELDED_SCAN_BATCH]
+            for start in range(0, len(changed), SHIELDED_SCAN_BATCH)
+        ]
+        semaphore = asyncio.Semaphore(SHIELDED_SCAN_CONCURRENCY)
+        scanned = await asyncio.gather(
+            *(self.scan_shielded_addresses(semaphore, chunk) for chunk in chunks)
+        )
+        received = {}
+        for chunk, results in zip(chunks, scanned):
+            for address, (notes, _) in zip(chunk, results):
+                if notes is not None:
+                    received[address] = notes
+
+        inserted = await self.store_shielded_transactions(received, checkpoints, states)
+        if inserted:
+            self.rpc.events.emit(TRANSACTIONS_CHANGED)
+        return inserted
+
+
+    async def scan_shielded_addresses(self, semaphore, addresses):
+        async with semaphore:
+            return await self.rpc.batch(
+                ("z_listreceivedbyaddress", [address, 0]) for address in addresses
+            )
 
 
-    async def gather_shielded_transactions(self):
-        self.app.console.event_log(f"✔: Shielded transactions")
+    async def store_shielded_transactions(self, received, checkpoints, states):
         tx_type = "shielded"
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            new_mobile_tx = False
-            new_transactions = await self.get_shielded_transactions()
-            if new_transactions:
-                stored_transactions = self.storagetxs.get_transactions(True, "shielded")
-                for tx_list in new_transactions:
-                    for data in tx_list:
-                        txid = data['txid']
-                        confirmations = data["confirmations"]
-                        address = data["address"]
-                        category = "receive"
-                        amount = data["amount"]
-                        if confirmations > 0:
-                            blocks = self.main.home_page.current_blocks - confirmations
-                        elif confirmations == 0:
-                            blocks = self.main.home_page.current_blocks
-                        if txid not in stored_transactions:
-                            mobile_addresses = self.storage_mobile.get_addresses_list("zaddress")
-                            if address in mobile_addresses:
-                                new_mobile_tx = True
-                            asyncio.create_task(self.get_block_timestamp(blocks, tx_type, category, address, txid, amount))
-
-                if new_mobile_tx:
-                    self.main.mobile_server.broker.push("update_transactions")
-                            
-            await asyncio.sleep(10)
-
-
-    async def get_block_timestamp(self, height, tx_type, category, address, txid, amount):
-        result,_ = await self.rpc.getBlock(height)
-        if result:
-            timereceived = result.get("time")
-            self.storagetxs.insert_transaction(tx_type, category, address, txid, amount, height, None, timereceived)
-
-
-    async def get_shielded_transactions(self):
-        transactions_data = []
-        addresses_data,_ = await self.rpc.z_listAddresses()
-        if addresses_data:
-            message_address = self.storagemsgs.get_identity("address")
-            if message_address:
-                address_items = {address_info for address_info in addresses_data if address_info != message_address[0]}
-            else:
-                address_items = {address_info for address_info in addresses_data}
-        else:
-            address_items = []
-        for address in address_items:
-            listunspent,_ = await self.rpc.z_listUnspent(address, 0)
-            if listunspent:
-                transactions_data.append(listunspent)
+        category = "receive"
+        new_mobile_tx = False
+        mobile_addresses = None
+        inserted = 0
+        current_blocks = self.main.home_page.current_blocks
+        timestamp = int(time.time())
+
+        notes = {}
+        heights = {}
+        for address, address_notes in received.items():
+            checkpoint = checkpoints.get(address, (0, None, None))[0] or 0
+            heights[address] = checkpoint
+            for data in address_notes:
+                confirmations = data.get("confirmations", 0)
+                if confirmations > 0:
+                    height = data.get("blockheight", current_blocks - confirmations + 1)
+                    heights[address] = max(heights[address], height)
+                    if height <= checkpoint:
+                        continue
+                else:
+                    height = 0
+                if data.get("change"):
+                    continue
+                key = (data["txid"], category, address)
+                if key in notes:
+                    notes[key][0] += data["amount"]
+                else:
+                    notes[key] = [data["amount"], height, data.get("blocktime")]
+
+        tx_index = self.main.tx_index
+        stored_transactions = await tx_index.known(INDEX_SHIELDED, notes)
+        notes = {key: note for key, note in notes.items() if key not in stored_transactions}
+        missing = list(dict.fromkeys(
+            height for _, height, blocktime in notes.values() if height and blocktime is None
+        ))
+        blocks = dict(zip(missing, await self.block_cache.get_blocks(missing))) if missing else {}
+
+        rows = []
+        incomplete = set()
+        for (txid, _, address), (amount, height, blocktime) in notes.items():
+            if not height:
+                blocktime = timestamp
+            elif blocktime is None:
+                block = blocks.get(height)
+                if not block:
+                    incomplete.add(address)
+                    continue
+                blocktime = block[2]
+            if mobile_addresses is None:
+                mobile_addresses = await tx_index.members(INDEX_MOBILE_ZADDRESS)
+            if address in mobile_addresses:
+                new_mobile_tx = True
+            rows.append((tx_type, category, address, txid, round(amount, 8), height, None, blocktime))
+
+        if rows:
+            await self.main.async_storage.txs.insert_transactions(rows)
+            for _, _, address, txid, _, height, _, _ in rows:
+                tx_index.add(INDEX_SHIELDED, (txid, category, address))
+                if not height:
+                    self.confirmations.track(txid)
+            inserted += len(rows)
+
+        for address in received:
+            if address not in incomplete:
+                notes_count, balance = states[address]
+                await self.main.async_storage.txs.set_shielded_checkpoint(address, heights[address], notes_count, round(balance, 8))
+
+        if new_mobile_tx:
+            self.main.mobile_server.broker.push("update_transactions")
+        return inserted
 
-        return transactions_data
-    
-    
 
     async def update_transactions_table(self):
-        sorted_transactions = self.get_transactions(self.transactions_count, self.transactions_from)
-        for data in sorted_transactions:
+        added = 0
+        notifications = None
+        for data in await self.main.async_storage.txs.get_transactions_after(None, 50):
             txid = data[3]
-            self.transactions_ids.append(txid)
-        self.app.console.event_log(f"✔: Transactions list")
-        while True:
-            sorted_transactions = self.get_transactions(50, 0)
-            if sorted_transactions:
-                for data in sorted_transactions:
-                    txid = data[3]
-                    if txid not in self.transactions_ids:
-                        data = self.storagetxs.get_transaction(txid)
-                        tx_type = data[0]
-                        category = data[1]
-                        if category == "send":
-                            if tx_type == "shielded":
-                                icon = "images/tx_send_shielded.png"
-                            else:
-                                icon = "images/tx_send_transparent.png"
-                            notify_categoty = self.tr.text("notify_send")
-                        elif category == "receive":
-                            if tx_type == "shielded":
-                                icon = "images/tx_receive_shielded.png"
-                            else:
-                                icon = "images/tx_receive_transparent.png"
-                            notify_categoty = self.tr.text("notify_receive")
-
-                        address = data[2]
-                        amount = data[4]
-                        if self.settings.hidden_balances():
-                            amount = "*.********"
-                        timereceived = data[7]
-                        formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
-                        if self.rtl:
-                            amount = self.units.arabic_digits(str(amount))
-                            formatted_timereceived = self.units.arabic_digits(formatted_timereceived)
-                        row = {
-                            self.tr.text("column_category"): icon,
-                            self.tr.text("column_address"): address,
-                            self.tr.text("column_amount"): amount,
-                            self.tr.text("column_time"): formatted_timereceived,
-                            'TxID': txid,
-                        }
-                        self.transactions_ids.append(txid)
-                        self.add_transaction(0, row)
-                        if self.settings.notification_txs():
-                            self.notify.send_note(
-                                title=f"{notify_categoty} : {amount} BTCZ",
-                                text=f"TxID : {txid}"
-                            )
-
-            await asyncio.sleep(6)
+            if txid in self.transactions_ids:
+                continue
+            self.transactions_ids.add(txid)
+            added += 1
+            if notifications is None:
+                notifications = self.settings.notification_txs()
+            if notifications:
+                category = data[1]
+                if category == "send":
+                    notify_categoty = self.tr.text("notify_send")
+                elif category == "receive":
+                    notify_categoty = self.tr.text("notify_receive")
+                amount = data[4]
+                if self.hidden_balances:
+                    amount = "*.********"
+                if self.rtl:
+                    amount = self.units.arabic_digits(str(amount))
+                self.notify.send_note(
+                    title=f"{notify_categoty} : {amount} BTCZ",
+                    text=f"TxID : {txid}"
+                )
+        if added:
+            await self.refresh_transactions()
+        return added
+
+
+    async def rebuild_balance_history(self):
+        if not self.balance_history.is_stale():
+            return None
+        buckets = await self.main.async_storage.txs.rebuild_balance_history()
+        self.app.console.info_log(f"Balance history rebuilt : {buckets} buckets")
+        self.rpc.events.emit(TRANSACTIONS_CHANGED)
+        return buckets
 
 
     def show_transaction_info(self, txid, address):
@@ -809,17 +1061,6 @@ class Transactions(Box):
         self.transactions_info._impl.native.ShowDialog(self.main._impl.native)
 
 
-    def add_transaction(self, index, row):
-        if self.no_transaction_toggle:
-            self.remove(self.no_transaction)
-            self._impl.native.Controls.Add(self.transactions_table)
-            self.transactions_table.data_source = self.transactions_data
-            self.no_transaction_toggle = None
-        else:
-            if self.transactions_toggle and not self.no_transaction_toggle:
-                self.transactions_table.add_row(index=index, row_data=row)
-
-
     def copy_transaction_id(self):
         selected_cells = self.transactions_table.selected_cells
         for cell in selected_cells:
@@ -854,71 +1095,6 @@ class Transactions(Box):
                 webbrowser.open(transaction_url)
 
 
-    def on_scroll_table(self, event):
-        try:
-            if self.no_more_transactions or self.scroll_toggle:
-                return
-            first_row = self.transactions_table.FirstDisplayedScrollingRowIndex
-            if first_row < 0:
-                return
-            rows_visible = self.transactions_table.DisplayedRowCount(True)
-            last_visible_row = first_row + rows_visible - 1
-            total_rows = self.transactions_table.RowCount
-            threshold = 5  
-            if last_visible_row >= total_rows - 1 - threshold:
-                self.scroll_toggle = True
-                self.transactions_from += 50
-                self.app.loop.create_task(self.get_transactions_archive())
-        except Exception as e:
-            print(f"Error: {e}")
-
-
-
-    async def get_transactions_archive(self):
-        try:
-            sorted_transactions = self.get_transactions(self.transactions_count, self.transactions_from)
-            if not sorted_transactions:
-                self.no_more_transactions = True
-                return
-            for data in sorted_transactions:
-                tx_type = data[0]
-                category = data[1]
-                if category == "send":
-                    if tx_type == "shielded":
-                        icon = "images/tx_send_shielded.png"
-                    else:
-                        icon = "images/tx_send_transparent.png"
-                elif category == "receive":
-                    if tx_type == "shielded":
-                        icon = "images/tx_receive_shielded.png"
-                    else:
-                        icon = "images/tx_receive_transparent.png"
-
-                address = data[2]
-                txid = data[3]
-                amount = data[4]
-                if self.settings.hidden_balances():
-                    amount = "*.********"
-                timereceived = data[7]
-                formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
-                if self.rtl:
-                    amount = self.units.arabic_digits(str(amount))
-                    formatted_timereceived = self.units.arabic_digits(formatted_timereceived)
-                row = {
-                    self.tr.text("column_category"): icon,
-                    self.tr.text("column_address"): address,
-                    self.tr.text("column_amount"): amount,
-                    self.tr.text("column_time"): formatted_timereceived,
-                    'TxID': txid,
-                }
-                last_index = self.transactions_table.RowCount
-                self.add_transaction(last_index, row)
-        except Exception as e:
-            print(f"Error: {e}")
-        finally:
-            self.scroll_toggle = None
-
-
     def transactions_table_double_click(self, sender, event):
         row_index = event.RowIndex
         txid = sender.Rows[row_index].Cells[4].Value
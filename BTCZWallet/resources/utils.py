@@ -1,4 +1,5 @@
 
+import os
 import asyncio
 import aiohttp
 import zipfile
@@ -19,6 +20,7 @@ import io
 from PIL import Image, ImageFilter
 import ssl
 import certifi
+from collections import namedtuple
 
 from toga import App
 from ..framework import (
@@ -28,6 +30,12 @@ from ..framework import (
 
 COINGECKO_API = "https://api.coingecko.com/api/v3/coins/bitcoinz/market_chart"
 
+RPCCredentials = namedtuple(
+    "RPCCredentials",
+    ["user", "password", "port", "url", "authorization", "threads", "zmq_hashblock", "zmq_hashtx"],
+    defaults=[None, None]
+)
+
 
 class Utils():
     def __init__(self, app:App, settings = None, units=None, tr=None):
@@ -43,6 +51,9 @@ class Utils():
         self.units = units
         self.tr = tr
 
+        self.rpc_credentials = None
+        self.rpc_config_stat = None
+
         self.rtl = None
         if self.settings:
             lang = self.settings.language()
@@ -383,8 +394,31 @@ class Utils():
     
 
     def get_rpc_config(self):
+        credentials = self.get_rpc_credentials()
+        return credentials.user, credentials.password, credentials.port
+
+
+    def get_rpc_credentials(self):
         config_path = self.get_config_path()
-        rpcuser, rpcpassword, rpcport = None, None, None
+        try:
+            stat = os.stat(config_path)
+            config_stat = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            config_stat = None
+        if self.rpc_credentials is None or config_stat != self.rpc_config_stat:
+            self.rpc_credentials = self.load_rpc_credentials(config_path)
+            self.rpc_config_stat = config_stat
+        return self.rpc_credentials
+
+
+    def invalidate_rpc_credentials(self):
+        self.rpc_credentials = None
+        self.rpc_config_stat = None
+
+
+    def load_rpc_credentials(self, config_path):
+        rpcuser, rpcpassword, rpcport, rpcthreads = None, None, None, None
+        zmq_hashblock, zmq_hashtx = None, None
         if Os.File.Exists(config_path):
             with open(config_path, "r") as f:
                 for line in f:
@@ -397,10 +431,27 @@ class Utils():
                         rpcpassword = line.split("=", 1)[1].strip()
                     elif line.startswith("rpcport="):
                         rpcport = line.split("=", 1)[1].strip()
+                    elif line.startswith("rpcthreads="):
+                        rpcthreads = line.split("=", 1)[1].strip()
+                    elif line.startswith("zmqpubhashblock="):
+                        zmq_hashblock = line.split("=", 1)[1].strip()
+                    elif line.startswith("zmqpubhashtx="):
+                        zmq_hashtx = line.split("=", 1)[1].strip()
         if not rpcport:
             rpcport = 1979
+        try:
+            rpcthreads = max(1, int(rpcthreads))
+        except (TypeError, ValueError):
+            rpcthreads = 4
+
+        authorization = None
+        if rpcuser is not None and rpcpassword is not None:
+            authorization = aiohttp.BasicAuth(rpcuser, rpcpassword).encode()
 
-        return rpcuser, rpcpassword, rpcport
+        return RPCCredentials(
+            rpcuser, rpcpassword, rpcport, f"http://localhost:{rpcport}/", authorization, rpcthreads,
+            zmq_hashblock, zmq_hashtx
+        )
 
     
     
@@ -435,6 +486,7 @@ class Utils():
             updated_lines.append(f"exportdir={path}\n")
         with open(config_file_path, 'w') as file:
             file.writelines(updated_lines)
+        self.invalidate_rpc_credentials()
     
     def windows_screen_center(self, main, window):
         screen = Forms.Screen.FromControl(main._impl.native)
@@ -948,6 +1000,7 @@ addnode=37.187.76.80:1989
 sendchangeback=1
 """
                 config_file.write(config_content)
+            self.invalidate_rpc_credentials()
         except Exception as e:
             self.app.console.error_log(f"{e}")
 
@@ -20,6 +20,9 @@ from toga.constants import (
 )
 
 from .storage import StorageAddresses
+from .events import NEW_BLOCK, WALLET_CHANGED, BALANCES_CHANGED, SAFETY_POLL_INTERVAL
+from .balances import BalanceEngine
+from .scheduler import TASK_PRIORITY_HIGH
 
 
 
@@ -44,7 +47,7 @@ class Wallet(Box):
         self.tr = tr
         self.font = font
 
-        self.addresses_storage = StorageAddresses(self.app)
+        self.balances = BalanceEngine(self.app, self.rpc, self.main.async_storage.addresses)
 
         self.rtl = None
         lang = self.settings.language()
@@ -135,9 +138,20 @@ class Wallet(Box):
         )
 
         self.app.loop.create_task(self.get_node_version())
-        self.app.loop.create_task(self.update_total_balances())
-        self.app.loop.create_task(self.update_transparent_addresses())
-        self.app.loop.create_task(self.update_shielded_addresses())
+        scheduler = self.main.scheduler
+        scheduler.register(
+            "Total balances", self.sync_total_balances, SAFETY_POLL_INTERVAL, TASK_PRIORITY_HIGH,
+            needs_ui=True, needs_node=True, events=(NEW_BLOCK, WALLET_CHANGED)
+        )
+        scheduler.register(
+            "Sync transparent addresses", self.sync_transparent_addresses, SAFETY_POLL_INTERVAL,
+            needs_node=True, events=(NEW_BLOCK, WALLET_CHANGED)
+        )
+        scheduler.register(
+            "Sync shielded addresses", self.sync_shielded_addresses, SAFETY_POLL_INTERVAL,
+            needs_node=True, events=(NEW_BLOCK, WALLET_CHANGED)
+        )
+        self.rpc.events.subscribe(BALANCES_CHANGED, self.on_balances_changed)
 
 
     async def get_node_version(self):
@@ -161,143 +175,48 @@ class Wallet(Box):
         )
 
 
-    async def update_total_balances(self):
-        self.app.console.event_log(f"✔: Total balances")
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            balances,_ = await self.rpc.z_getTotalBalance()
-            if balances:
-                totalbalance = self.units.format_balance(float(balances.get('total')))
-                transparentbalance = self.units.format_balance(float(balances.get('transparent')))
-                shieldedbalance = self.units.format_balance(float(balances.get('private')))
-                if self.rtl:
-                    totalbalance = self.units.arabic_digits(totalbalance)
-                    transparentbalance = self.units.arabic_digits(transparentbalance)
-                    shieldedbalance = self.units.arabic_digits(shieldedbalance)
-                if self.settings.hidden_balances():
-                    totalbalance = "*.********"
-                    transparentbalance = "*.********"
-                    shieldedbalance = "*.********"
-                js_code = f'setBalances("{totalbalance}", "{transparentbalance}", "{shieldedbalance}");'
-                self.balances_output.control.CoreWebView2.ExecuteScriptAsync(js_code)
-            
-            unconfirmed_balance,_ = await self.rpc.getUnconfirmedBalance()
-            unconfirmed = self.units.format_balance(float(unconfirmed_balance))
-            if float(unconfirmed) > 0:
-                if self.rtl:
-                    unconfirmed = self.units.arabic_digits(unconfirmed)
-                if self.settings.hidden_balances():
-                    unconfirmed = "*.********"
-            else:
-                unconfirmed = 0
-            js_unconfirmed = f'setUnconfirmedBalance("{unconfirmed}");'
-            self.balances_output.control.CoreWebView2.ExecuteScriptAsync(js_unconfirmed)
-            
-            await asyncio.sleep(4)
-
-
-    async def update_transparent_addresses(self):
-        self.app.console.event_log("✔: Sync transparent addresses")
-        address_type = "transparent"
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            stored_addresses = self.addresses_storage.get_addresses(address_type=address_type)
-            stored_dict = {data[2]: data[3] for data in stored_addresses}
-
-            addresses_data,_ = await self.rpc.ListAddresses()
-            addresses_group,_ = await self.rpc.listAddressgroupPings()
-
-            global_balance_change = False
-
-            for group in addresses_group:
-                for entry in group:
-                    address = entry[0]
-                    balance = entry[1] if len(entry) > 1 else 0.0
-
-                    if address not in addresses_data:
-                        is_change_address = True
-                    else:
-                        is_change_address = None
-                    if address not in stored_dict:
-                        self.addresses_storage.insert_address(address_type, is_change_address, address, balance)
-                    else:
-                        old_balance = stored_dict[address]
-                        if old_balance != balance:
-                            self.addresses_storage.update_balance(address, balance)
-                            global_balance_change = True
-
-            stored_addresses = self.addresses_storage.get_addresses(address_type=address_type)
-            stored_set = {data[2] for data in stored_addresses}
-
-            for address in addresses_data:
-                if address not in stored_set:
-                    option = "insert"
-                else:
-                    option = "update"
-                await self.insert_address(address_type, address, option)
-            
-            if global_balance_change:
-                self.main.receive_page.reload_addresses()
-                self.main.mobile_server.broker.push("update_balances")
-
-            await asyncio.sleep(10)
-
-
-    async def update_shielded_addresses(self):
-        self.app.console.event_log("✔: Sync shielded addresses")
-        address_type = "shielded"
-
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-
-            stored_addresses = self.addresses_storage.get_addresses(address_type=address_type)
-            stored_dict = {data[2]: data[3] for data in stored_addresses}
-
-            addresses_data, _ = await self.rpc.z_listAddresses()
-
-            global_balance_change = False
-
-            if addresses_data:
-                for address_info in addresses_data:
-                    if isinstance(address_info, dict):
-                        address = address_info.get("address")
-                        balance = address_info.get("balance", 0.0)
-                    else:
-                        address = address_info
-                        balance, _ = await self.rpc.z_getBalance(address)
-                    if address not in stored_dict:
-                        option = "insert"
-                        self.addresses_storage.insert_address(address_type, None, address, balance)
-                    else:
-                        option = "update"
-                        old_balance = stored_dict[address]
-                        if old_balance != balance:
-                            self.addresses_storage.update_balance(address, balance)
-                            global_balance_change = True
+    async def sync_total_balances(self):
+        balances,_ = await self.rpc.z_getTotalBalance()
+        if balances:
+            totalbalance = self.units.format_balance(float(balances.get('total')))
+            transparentbalance = self.units.format_balance(float(balances.get('transparent')))
+            shieldedbalance = self.units.format_balance(float(balances.get('private')))
+            if self.rtl:
+                totalbalance = self.units.arabic_digits(totalbalance)
+                transparentbalance = self.units.arabic_digits(transparentbalance)
+                shieldedbalance = self.units.arabic_digits(shieldedbalance)
+            if self.settings.hidden_balances():
+                totalbalance = "*.********"
+                transparentbalance = "*.********"
+                shieldedbalance = "*.********"
+            js_code = f'setBalances("{totalbalance}", "{transparentbalance}", "{shieldedbalance}");'
+            self.balances_output.control.CoreWebView2.ExecuteScriptAsync(js_code)
+
+        unconfirmed_balance,_ = await self.rpc.getUnconfirmedBalance()
+        unconfirmed = self.units.format_balance(float(unconfirmed_balance))
+        if float(unconfirmed) > 0:
+            if self.rtl:
+                unconfirmed = self.units.arabic_digits(unconfirmed)
+            if self.settings.hidden_balances():
+                unconfirmed = "*.********"
+        else:
+            unconfirmed = 0
+        js_unconfirmed = f'setUnconfirmedBalance("{unconfirmed}");'
+        self.balances_output.control.CoreWebView2.ExecuteScriptAsync(js_unconfirmed)
+        return balances, unconfirmed_balance
 
-                    await self.insert_address(address_type, address, option, balance)
 
-                if global_balance_change:
-                    self.main.receive_page.reload_addresses()
-                    self.main.mobile_server.broker.push("update_balances")
+    async def sync_transparent_addresses(self):
+        return await self.balances.sync_transparent()
 
-            await asyncio.sleep(20)
 
+    async def sync_shielded_addresses(self):
+        return await self.balances.sync_shielded()
 
-    async def insert_address(self, address_type, address, option, balance=None):
-        if balance is None:
-            balance, _ = await self.rpc.z_getBalance(address)
 
-        if option == "insert":
-            self.addresses_storage.insert_address(address_type, None, address, balance)
-        elif option == "update":
-            self.addresses_storage.update_balance(address, balance)
+    def on_balances_changed(self, event, **data):
+        self.main.receive_page.reload_addresses()
+        self.main.mobile_server.broker.push("update_balances")
 
 
 
@@ -504,7 +423,7 @@ class AddAddress(Window):
                 message="This name is already exists"
             )
             return
-        self.storage.insert_book(name, address)
+        await self.main.async_storage.addresses.insert_book(name, address)
         self.main.mobile_server.broker.push("update_book")
         self.close()
         self.book_window.realod_address_book()
@@ -801,11 +720,14 @@ class AddressBook(Window):
 
     def remove_address(self):
         selected_cells = self.book_table.selected_cells
-        for cell in selected_cells:
-            if cell.ColumnIndex == 1:
-                address = cell.Value
-                self.storage.delete_address_book(address)
-                self.main.mobile_server.broker.push("update_book")
+        addresses = [cell.Value for cell in selected_cells if cell.ColumnIndex == 1]
+        self.app.loop.create_task(self.delete_addresses(addresses))
+
+
+    async def delete_addresses(self, addresses):
+        for address in addresses:
+            await self.main.async_storage.addresses.delete_address_book(address)
+            self.main.mobile_server.broker.push("update_book")
         self.realod_address_book()
 
 
@@ -202,6 +202,7 @@ translations = {
     "column_address": {"text": "العنوان"},
     "column_amount": {"text": "الكمية"},
     "column_time": {"text": "الوقت"},
+    "search_input": {"text": "...send ،from:2024-01-01 ،amount:>5 ،بحث عن معرف المعاملة، العنوان"},
     "notify_send" : {"text": "صرف"},
     "notify_receive" : {"text": "استلام"},
     "notify_mining": {"text": "تعدين"},
@@ -201,6 +201,7 @@ translations = {
     "column_address": {"text": "Address"},
     "column_amount": {"text": "Amount"},
     "column_time": {"text": "Time"},
+    "search_input": {"text": "Search txid, address, amount:>5, from:2024-01-01, send..."},
     "notify_send" : {"text": "Send"},
     "notify_receive" : {"text": "Receive"},
     "notify_mining": {"text": "Mining"},
@@ -202,6 +202,7 @@ translations = {
     "column_address": {"text": "Address"},
     "column_amount": {"text": "Montant"},
     "column_time": {"text": "Temps"},
+    "search_input": {"text": "Rechercher txid, adresse, amount:>5, from:2024-01-01, send..."},
     "notify_send" : {"text": "Envoyer"},
     "notify_receive" : {"text": "Recevoir"},
     "notify_mining": {"text": "Minière"},
@@ -0,0 +1,568 @@
+import asyncio
+import binascii
+import hashlib
+import json
+import random
+from collections import Counter
+
+from aiohttp import web
+
+
+GENESIS_TIME = 1478403829
+BLOCK_INTERVAL = 150
+START_HEIGHT = 1500000
+
+
+class Simulator():
+    def __init__(
+        self,
+        transparent_addresses = 20,
+        shielded_addresses = 5,
+        transactions = 1000,
+        shielded_notes = 200,
+        memos = 0,
+        height = START_HEIGHT,
+        latency = 0,
+        seed = 1
+    ):
+        super().__init__()
+
+        self.random = random.Random(seed)
+        self.latency = latency
+        self.height = height
+        self.forks = {}
+        self.orphans = {}
+        self.parents = {}
+        self.dropped = set()
+        self.index = None
+
+        self.runner = None
+        self.port = None
+        self.calls = Counter()
+        self.requests = 0
+
+        self.taddresses = [self.make_address("t1", i) for i in range(transparent_addresses)]
+        self.zaddresses = [self.make_address("zs1", i) for i in range(shielded_addresses)]
+        self.messages_address = self.make_address("zs1", "messages")
+        self.transactions = []
+        self.notes = []
+        self.operations = {}
+        self.operation_count = 0
+
+        for index in range(transactions):
+            self.add_transaction(
+                self.random.choice(self.taddresses),
+                self.random.choice(("receive", "send")),
+                round(self.random.uniform(0.001, 5000), 8),
+                self.height - transactions + index + 1 if index < transactions - 5 else None
+            )
+        for index in range(shielded_notes):
+            self.add_note(
+                self.random.choice(self.zaddresses),
+                round(self.random.uniform(0.001, 5000), 8),
+                self.height - shielded_notes + index + 1
+            )
+        for index in range(memos):
+            self.add_memo(
+                {
+                    "type": "message",
+                    "id": f"contact{index % 10}",
+                    "username": f"user{index % 10}",
+                    "text": f"message {index}",
+                    "timestamp": GENESIS_TIME + index
+                },
+                self.height - memos + index + 1
+            )
+
+
+    def make_address(self, prefix, index):
+        digest = hashlib.sha256(f"{prefix}:{index}".encode()).hexdigest()
+        length = 33 if prefix == "t1" else 75
+        return (prefix + digest * 3)[:length]
+
+
+    def make_txid(self):
+        return hashlib.sha256(f"tx:{len(self.transactions)}:{len(self.notes)}:{self.random.random()}".encode()).hexdigest()
+
+
+    def block_hash(self, height):
+        return hashlib.sha256(f"block:{height}:{self.forks.get(height, 0)}".encode()).hexdigest()
+
+
+    def block_time(self, height):
+        return GENESIS_TIME + height * BLOCK_INTERVAL
+
+
+    def block_height(self, block):
+        if isinstance(block, int) or (isinstance(block, str) and block.isdigit() and len(block) < 64):
+            height = int(block)
+            if 0 <= height <= self.height:
+                return height
+            return None
+        if block in self.orphans:
+            return None
+        if self.index is None:
+            heights = {tx["height"] for tx in self.transactions + self.notes}
+            heights.update(range(max(self.height - 100, 0), self.height + 1))
+            heights.discard(None)
+            self.index = {self.block_hash(height): height for height in heights}
+        return self.index.get(block)
+
+
+    def confirmations(self, height):
+        if height is None:
+            return 0
+        return self.height - height + 1
+
+
+    def add_transaction(self, address, category, amount, height = None, txid = None):
+        transaction = {
+            "txid": txid or self.make_txid(),
+            "address": address,
+            "category": category,
+            "amount": amount if category == "receive" else -amount,
+            "fee": -0.0001 if category == "send" else None,
+            "height": height,
+            "time": self.block_time(height) if height else self.block_time(self.height)
+        }
+        self.transactions.append(transaction)
+        return transaction
+
+
+    def add_note(self, address, amount, height = None, memo = "f6", txid = None, change = False):
+        note = {
+            "txid": txid or self.make_txid(),
+            "address": address,
+            "amount": amount,
+            "memo": memo,
+            "height": height,
+            "outindex": 0,
+            "spent": False,
+            "change": change
+        }
+        self.notes.append(note)
+        return note
+
+
+    def add_memo(self, form, height = None, amount = 0.0001):
+        memo = binascii.hexlify(json.dumps(form).encode()).decode()
+        return self.add_note(self.messages_address, amount, height, memo)
+
+
+    def spend_note(self, note):
+        note["spent"] = True
+
+
+    def drop_transaction(self, txid):
+        self.dropped.add(txid)
+
+
+    def mine(self, count = 1):
+        for _ in range(count):
+            self.height += 1
+        for item in self.transactions + self.notes:
+            if item["height"] is None and item["txid"] not in self.dropped:
+                item["height"] = self.height
+                item["time"] = self.block_time(self.height)
+        self.index = None
+
+
+    def reorg(self, depth):
+        heights = range(self.height - depth + 1, self.height + 1)
+        for height in heights:
+            self.parents[self.block_hash(height)] = self.block_hash(height - 1)
+        for height in heights:
+            self.orphans[self.block_hash(height)] = height
+            self.forks[height] = self.forks.get(height, 0) + 1
+        self.index = None
+
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.requests = 0
+
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/", self.handle_request)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "localhost", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+    async def handle_request(self, request):
+        self.requests += 1
+        payload = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if isinstance(payload, list):
+            return web.json_response([self.dispatch(item) for item in payload])
+        response = self.dispatch(payload)
+        status = 500 if response["error"] else 200
+        return web.json_response(response, status=status)
+
+
+    def dispatch(self, payload):
+        method = payload.get("method")
+        params = payload.get("params") or []
+        self.calls[method] += 1
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            return {
+                "result": None,
+                "error": {"code": -32601, "message": "Method not found"},
+                "id": payload.get("id")
+            }
+        try:
+            result = handler(*params)
+        except LookupError as e:
+            return {
+                "result": None,
+                "error": {"code": -5, "message": str(e)},
+                "id": payload.get("id")
+            }
+        return {"result": result, "error": None, "id": payload.get("id")}
+
+
+    def rpc_getinfo(self):
+        return {
+            "version": 2010050,
+            "subversion": "/MagicBean:2.1.0/",
+            "build": "v2.1.0-simulator",
+            "blocks": self.height,
+            "connections": 8,
+            "difficulty": 1024.0
+        }
+
+
+    def rpc_getblockchaininfo(self):
+        return {
+            "chain": "main",
+            "blocks": self.height,
+            "headers": self.height,
+            "bestblockhash": self.block_hash(self.height),
+            "verificationprogress": 1.0,
+            "mediantime": self.block_time(self.height),
+            "size_on_disk": 8000000000
+        }
+
+
+    def rpc_getbestblockhash(self):
+        return self.block_hash(self.height)
+
+
+    def rpc_getblockcount(self):
+        return self.height
+
+
+    def rpc_getblockhash(self, height):
+        if not 0 <= int(height) <= self.height:
+            raise LookupError("Block height out of range")
+        return self.block_hash(int(height))
+
+
+    def rpc_getblockheader(self, blockhash, verbose = True):
+        if blockhash in self.orphans:
+            height = self.orphans[blockhash]
+            return {
+                "hash": blockhash,
+                "confirmations": -1,
+                "height": height,
+                "time": self.block_time(height),
+                "previousblockhash": self.parents[blockhash]
+            }
+        height = self.block_height(blockhash)
+        if height is None:
+            raise LookupError("Block not found")
+        return {
+            "hash": self.block_hash(height),
+            "confirmations": self.confirmations(height),
+            "height": height,
+            "time": self.block_time(height),
+            "previousblockhash": self.block_hash(height - 1)
+        }
+
+
+    def rpc_getblock(self, block, verbosity = 1):
+        header = self.rpc_getblockheader(block)
+        header["tx"] = [
+            tx["txid"] for tx in self.transactions + self.notes
+            if tx["height"] == header["height"]
+        ]
+        return header
+
+
+    def rpc_getwalletinfo(self):
+        transparent, shielded = self.balances()
+        return {
+            "walletversion": 60000,
+            "balance": round(sum(transparent.values()), 8),
+            "unconfirmed_balance": self.rpc_getunconfirmedbalance(),
+            "shielded_balance": f"{sum(shielded.values()):.8f}",
+            "txcount": len({tx["txid"] for tx in self.transactions + self.notes})
+        }
+
+
+    def rpc_getmempoolinfo(self):
+        size = len({tx["txid"] for tx in self.transactions + self.notes if tx["height"] is None})
+        return {"size": size, "bytes": size * 2500, "usage": size * 4000}
+
+
+    def rpc_getnetworksolps(self):
+        return 2500000
+
+
+    def rpc_getpeerinfo(self):
+        return [{"id": index, "addr": f"10.0.0.{index}:1989"} for index in range(8)]
+
+
+    def rpc_getconnectioncount(self):
+        return 8
+
+
+    def rpc_getdeprecationinfo(self):
+        return {"version": 2010050, "subversion": "/MagicBean:2.1.0/", "deprecationheight": self.height + 100000}
+
+
+    def balances(self):
+        transparent = {address: 0.0 for address in self.taddresses}
+        for tx in self.transactions:
+            if tx["height"] is not None:
+                transparent[tx["address"]] = transparent.get(tx["address"], 0.0) + tx["amount"]
+        shielded = {address: 0.0 for address in self.zaddresses}
+        for note in self.notes:
+            if note["height"] is not None and not note["spent"]:
+                shielded[note["address"]] = shielded.get(note["address"], 0.0) + note["amount"]
+        return transparent, shielded
+
+
+    def rpc_z_gettotalbalance(self, minconf = 1):
+        transparent, shielded = self.balances()
+        transparent = sum(transparent.values())
+        private = sum(shielded.values())
+        return {
+            "transparent": f"{transparent:.8f}",
+            "private": f"{private:.8f}",
+            "total": f"{transparent + private:.8f}"
+        }
+
+
+    def rpc_getunconfirmedbalance(self):
+        return round(sum(
+            tx["amount"] for tx in self.transactions
+            if tx["height"] is None and tx["category"] == "receive"
+        ), 8)
+
+
+    def rpc_listaddressgroupings(self):
+        transparent, _ = self.balances()
+        return [[[address, round(balance, 8), ""]] for address, balance in transparent.items()]
+
+
+    def rpc_listaddresses(self):
+        return list(self.taddresses)
+
+
+    def rpc_z_listaddresses(self):
+        return list(self.zaddresses)
+
+
+    def rpc_z_getbalance(self, address, minconf = 1):
+        transparent, shielded = self.balances()
+        if address in transparent:
+            return round(transparent[address], 8)
+        if address in shielded:
+            return round(shielded[address], 8)
+        if address == self.messages_address:
+            return round(sum(
+                note["amount"] for note in self.notes if note["address"] == address
+            ), 8)
+        raise LookupError("Invalid address")
+
+
+    def transaction_entry(self, tx):
+        entry = {
+            "address": tx["address"],
+            "category": tx["category"],
+            "amount": tx["amount"],
+            "confirmations": self.confirmations(tx["height"]),
+            "txid": tx["txid"],
+            "time": tx["time"],
+            "timereceived": tx["time"]
+        }
+        if tx["fee"] is not None:
+            entry["fee"] = tx["fee"]
+        if tx["height"] is not None:
+            entry["blockhash"] = self.block_hash(tx["height"])
+            entry["blockheight"] = tx["height"]
+            entry["blocktime"] = self.block_time(tx["height"])
+        return entry
+
+
+    def rpc_gettransaction(self, txid, include_watchonly = False):
+        for tx in self.transactions + self.notes:
+            if tx["txid"] == txid:
+                entry = {
+                    "txid": txid,
+                    "amount": tx["amount"],
+                    "confirmations": -1 if txid in self.dropped else self.confirmations(tx["height"]),
+                    "time": self.block_time(tx["height"] or self.height),
+                    "timereceived": self.block_time(tx["height"] or self.height),
+                    "details": []
+                }
+                if tx["height"] is not None:
+                    entry["blockhash"] = self.block_hash(tx["height"])
+                    entry["blocktime"] = self.block_time(tx["height"])
+                return entry
+        raise LookupError("Invalid or non-wallet transaction id")
+
+
+    def rpc_listtransactions(self, account = "*", count = 10, skip = 0, include_watchonly = False):
+        end = len(self.transactions) - skip
+        start = max(end - count, 0)
+        return [self.transaction_entry(tx) for tx in self.transactions[start:max(end, 0)]]
+
+
+    def rpc_listsinceblock(self, blockhash = "", target_confirmations = 1, include_watchonly = False):
+        since = -1
+        if blockhash:
+            if blockhash in self.orphans:
+                since = self.orphans[blockhash] - 1
+                while since >= 0 and self.block_hash(since) in self.orphans:
+                    since -= 1
+            else:
+                since = self.block_height(blockhash)
+                if since is None:
+                    raise LookupError("Block not found")
+        transactions = [
+            self.transaction_entry(tx) for tx in self.transactions
+            if tx["height"] is None or tx["height"] > since
+        ]
+        lastblock = self.block_hash(max(self.height - target_confirmations + 1, 0))
+        return {"transactions": transactions, "removed": [], "lastblock": lastblock}
+
+
+    def note_entry(self, note):
+        return {
+            "txid": note["txid"],
+            "outindex": note["outindex"],
+            "confirmations": self.confirmations(note["height"]),
+            "spendable": True,
+            "address": note["address"],
+            "amount": note["amount"],
+            "memo": note["memo"],
+            "change": note["change"]
+        }
+
+
+    def rpc_z_listunspent(self, minconf = 1, maxconf = 9999999, include_watchonly = False, addresses = None):
+        return [
+            self.note_entry(note) for note in self.notes
+            if not note["spent"]
+            and (not addresses or note["address"] in addresses)
+            and minconf <= self.confirmations(note["height"]) <= maxconf
+        ]
+
+
+    def rpc_z_listreceivedbyaddress(self, address, minconf = 1):
+        received = []
+        for note in self.notes:
+            if note["address"] != address:
+                continue
+            if self.confirmations(note["height"]) < minconf:
+                continue
+            entry = self.note_entry(note)
+            del entry["address"], entry["spendable"]
+            if note["height"] is not None:
+                entry["blockheight"] = note["height"]
+                entry["blocktime"] = self.block_time(note["height"])
+            received.append(entry)
+        return received
+
+
+    def rpc_z_sendmany(self, fromaddress, amounts, minconf = 1, fee = 0.0001):
+        self.operation_count += 1
+        opid = f"opid-{self.operation_count:08d}"
+        txid = self.make_txid()
+        owned = set(self.zaddresses) | {self.messages_address}
+        for output in amounts:
+            if output["address"].startswith("t1"):
+                self.add_transaction(output["address"], "send", float(output["amount"]), txid=txid)
+            elif output["address"] in owned:
+                self.add_note(output["address"], float(output["amount"]), memo=output.get("memo", "f6"), txid=txid)
+        if fromaddress in owned:
+            required = round(sum(float(output["amount"]) for output in amounts) + float(fee), 8)
+            spent = 0.0
+            for note in self.notes:
+                if spent >= required:
+                    break
+                if note["address"] == fromaddress and not note["spent"] and note["height"] is not None:
+                    self.spend_note(note)
+                    spent += note["amount"]
+            if spent > required:
+                self.add_note(fromaddress, round(spent - required, 8), txid=txid, change=True)
+        self.operations[opid] = {
+            "id": opid,
+            "status": "success",
+            "creation_time": self.block_time(self.height),
+            "result": {"txid": txid},
+            "method": "z_sendmany"
+        }
+        return opid
+
+
+    def rpc_sendtoaddress(self, address, amount, *args):
+        return self.add_transaction(address, "send", float(amount))["txid"]
+
+
+    def rpc_z_getoperationstatus(self, operation_ids = None):
+        return [
+            {key: value for key, value in self.operations[opid].items() if key != "result"}
+            for opid in operation_ids or list(self.operations)
+            if opid in self.operations
+        ]
+
+
+    def rpc_z_getoperationresult(self, operation_ids = None):
+        return [
+            self.operations.pop(opid)
+            for opid in list(operation_ids or self.operations)
+            if opid in self.operations
+        ]
+
+
+    def rpc_validateaddress(self, address):
+        return {
+            "isvalid": address.startswith("t1"),
+            "address": address,
+            "ismine": address in self.taddresses
+        }
+
+
+    def rpc_z_validateaddress(self, address):
+        return {
+            "isvalid": address.startswith("zs1"),
+            "address": address,
+            "ismine": address in self.zaddresses or address == self.messages_address
+        }
+
+
+    def rpc_getnewaddress(self):
+        address = self.make_address("t1", len(self.taddresses))
+        self.taddresses.append(address)
+        return address
+
+
+    def rpc_z_getnewaddress(self, address_type = "sapling"):
+        address = self.make_address("zs1", len(self.zaddresses))
+        self.zaddresses.append(address)
+        return address
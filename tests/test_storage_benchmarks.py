@@ -0,0 +1,397 @@
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("toga")
+pytest.importorskip("pytest_benchmark")
+
+from BTCZWallet.resources.storage import (
+    AsyncStorage, StorageTxs, StorageAddresses, StorageMessages, StorageMobile,
+    s_txs, s_addresses, s_messages, s_mobile
+)
+from BTCZWallet.resources.storage.engine import engine, connect
+from BTCZWallet.resources.index import TxIndex, INDEX_TRANSPARENT
+from BTCZWallet.resources.export import TransactionExporter, pyarrow
+
+
+ROUNDS = 5
+LEGACY_ROWS = 20000
+LEGACY_ADDRESSES = 500
+DUPLICATES = 0.01
+UNCONFIRMED = 0.001
+INDEX_ENTRIES = 50
+ADDRESSES = 2000
+ADDRESS_DUPLICATES = 100
+LOOKUPS = 500
+ENGINE_CALLS = 200
+ENGINE_THREADS = 20
+ENGINE_MODULES = (s_txs, s_addresses, s_messages, s_mobile)
+FACADE_ROUNDS = 5
+FACADE_INSERTS = 50
+TICK = 0.005
+
+
+def storage_app(folder):
+    return SimpleNamespace(paths=SimpleNamespace(data=folder))
+
+
+def create_legacy_table(path, rows):
+    generator = random.Random(1)
+    addresses = [f"t1{index:033d}" for index in range(LEGACY_ADDRESSES)]
+    transactions = []
+    for index in range(rows):
+        blocks = 0 if generator.random() < UNCONFIRMED else 1000000 + index
+        transactions.append(
+            (
+                generator.choice(("transparent", "shielded")),
+                generator.choice(("receive", "send")),
+                generator.choice(addresses),
+                f"{index:064x}",
+                round(generator.uniform(0.001, 5000), 8),
+                blocks,
+                0,
+                1500000000 + index * 150
+            )
+        )
+    transactions.extend(generator.sample(transactions, int(rows * DUPLICATES)))
+    with sqlite3.connect(path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            '''
+            CREATE TABLE transactions (
+                type TEXT,
+                category TEXT,
+                address TEXT,
+                txid TEXT,
+                amount REAL,
+                blocks INTEGER,
+                fee INTEGER,
+                timestamp INTEGER
+            )
+            '''
+        )
+        cursor.executemany(
+            'INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            transactions
+        )
+    return addresses
+
+
+def create_legacy_addresses(path, rows):
+    with sqlite3.connect(path) as conn:
+        cursor = conn.cursor()
+        cursor.execute('CREATE TABLE addresses (type TEXT, change TEXT, address TEXT, balance REAL)')
+        cursor.execute('CREATE TABLE address_book (name TEXT, address TEXT)')
+        cursor.executemany('INSERT INTO addresses VALUES (?, ?, ?, ?)', rows + rows[:ADDRESS_DUPLICATES])
+
+
+def address_rows(seed):
+    generator = random.Random(seed)
+    return [
+        ("transparent" if index % 2 else "shielded", None, f"addr{index:06d}", round(generator.uniform(0, 1000), 8))
+        for index in range(ADDRESSES)
+    ]
+
+
+def legacy_storage(cls, path):
+    storage = cls.__new__(cls)
+    storage.data = path
+    return storage
+
+
+class StorageEnvironment():
+    def __init__(self, folder):
+        self.folder = folder
+        self.app = storage_app(folder)
+        self.loop = asyncio.new_event_loop()
+        self.async_storage = AsyncStorage(self.app)
+
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+
+    def close(self):
+        self.run(self.async_storage.close())
+        self.loop.close()
+        engine.close()
+
+
+@pytest.fixture
+def legacy(tmp_path):
+    path = os.path.join(str(tmp_path), "transactions.dat")
+    addresses = create_legacy_table(path, LEGACY_ROWS)
+    yield SimpleNamespace(folder=tmp_path, path=path, addresses=addresses)
+    engine.close()
+
+
+def schema_queries(storage, addresses, generator):
+    storage.get_transaction(f"{generator.randrange(LEGACY_ROWS):064x}")
+    storage.get_mobile_transactions(generator.choice(addresses))
+    storage.get_transactions(True, "shielded")
+    storage.get_unconfirmed_transactions()
+    storage.get_transactions_page(50, generator.randrange(LEGACY_ROWS - 50))
+
+
+@pytest.mark.benchmark(group="txs-schema")
+@pytest.mark.parametrize("mode", ("legacy", "migrated"))
+def test_txs_schema_queries(benchmark, legacy, mode):
+    if mode == "legacy":
+        storage = legacy_storage(StorageTxs, legacy.path)
+    else:
+        storage = StorageTxs(storage_app(legacy.folder))
+    generator = random.Random(2)
+    benchmark.pedantic(schema_queries, args=(storage, legacy.addresses, generator), rounds=ROUNDS, iterations=1)
+
+
+def test_txs_schema_migration(benchmark, tmp_path):
+    rounds = iter(range(ROUNDS))
+    folders = []
+
+    def setup():
+        folder = tmp_path / f"round{next(rounds)}"
+        folder.mkdir()
+        create_legacy_table(os.path.join(str(folder), "transactions.dat"), LEGACY_ROWS)
+        folders.append(folder)
+        return (storage_app(folder),), {}
+
+    benchmark.pedantic(StorageTxs, setup=setup, rounds=ROUNDS, iterations=1)
+    engine.close()
+    with sqlite3.connect(os.path.join(str(folders[-1]), "transactions.dat")) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == LEGACY_ROWS
+
+
+def index_keys(storage):
+    generator = random.Random(4)
+    stored = storage.get_transactions_after(None, INDEX_ENTRIES // 2)
+    keys = [(row[3], row[1], row[2]) for row in stored if row[0] == INDEX_TRANSPARENT]
+    keys += [(f"{generator.getrandbits(256):064x}", "receive", "t1new") for _ in range(INDEX_ENTRIES - len(keys))]
+    return keys
+
+
+@pytest.mark.benchmark(group="tx-index")
+@pytest.mark.parametrize("mode", ("list", "index"))
+def test_tx_index_cycle(benchmark, legacy, mode):
+    env = StorageEnvironment(legacy.folder)
+    try:
+        storage = StorageTxs(env.app)
+        keys = index_keys(storage)
+        if mode == "list":
+            def cycle():
+                stored_transactions = storage.get_transactions(True, INDEX_TRANSPARENT)
+                return [key for key in keys if key[0] not in stored_transactions]
+        else:
+            tx_index = TxIndex(env.app, env.async_storage)
+            tracemalloc.start()
+            started = time.perf_counter()
+            env.run(tx_index.load(INDEX_TRANSPARENT))
+            benchmark.extra_info["load_seconds"] = time.perf_counter() - started
+            benchmark.extra_info["memory_mib"] = tracemalloc.get_traced_memory()[0] / 1048576
+            tracemalloc.stop()
+
+            def cycle():
+                stored_transactions = env.run(tx_index.known(INDEX_TRANSPARENT, keys))
+                return [key for key in keys if key not in stored_transactions]
+        missing = benchmark.pedantic(cycle, rounds=ROUNDS, iterations=1)
+        assert len(missing) == INDEX_ENTRIES - len([key for key in keys if key[2] != "t1new"])
+    finally:
+        env.close()
+
+
+@pytest.mark.benchmark(group="txs-export")
+@pytest.mark.parametrize("extension", ("csv", "jsonl", "parquet"))
+def test_txs_export(benchmark, legacy, extension):
+    if extension == "parquet" and pyarrow is None:
+        pytest.skip("pyarrow is not installed")
+    exporter = TransactionExporter(StorageTxs(storage_app(legacy.folder)))
+    path = os.path.join(str(legacy.folder), f"export.{extension}")
+    written = benchmark.pedantic(exporter.export, args=(path,), rounds=ROUNDS, iterations=1)
+    assert written == LEGACY_ROWS
+
+    started = time.perf_counter()
+    exporter.export(path)
+    benchmark.extra_info["rows_per_second"] = written / (time.perf_counter() - started)
+    tracemalloc.start()
+    exporter.export(path)
+    benchmark.extra_info["peak_mib"] = tracemalloc.get_traced_memory()[1] / 1048576
+    tracemalloc.stop()
+    benchmark.extra_info["file_mib"] = os.path.getsize(path) / 1048576
+
+
+def legacy_address_writes(path, rows):
+    for row in rows:
+        with sqlite3.connect(path) as conn:
+            conn.execute('UPDATE addresses SET balance = ? WHERE address = ?', (row[3], row[2]))
+
+
+@pytest.mark.benchmark(group="address-writes")
+@pytest.mark.parametrize("mode", ("legacy", "bulk"))
+def test_address_writes(benchmark, tmp_path, mode):
+    rows = address_rows(1)
+    updated = address_rows(2)
+    if mode == "legacy":
+        path = os.path.join(str(tmp_path), "addresses.dat")
+        create_legacy_addresses(path, rows)
+        benchmark.pedantic(legacy_address_writes, args=(path, updated), rounds=ROUNDS, iterations=1)
+    else:
+        storage = StorageAddresses(storage_app(tmp_path))
+        storage.bulk_upsert_balances(rows)
+        benchmark.pedantic(storage.bulk_upsert_balances, args=(updated,), rounds=ROUNDS, iterations=1)
+        assert storage.get_address_balance(updated[7][2]) == updated[7][3]
+    engine.close()
+
+
+@pytest.mark.benchmark(group="address-lookup")
+@pytest.mark.parametrize("mode", ("scan", "indexed"))
+def test_address_lookup(benchmark, tmp_path, mode):
+    rows = address_rows(1)
+    path = os.path.join(str(tmp_path), "addresses.dat")
+    create_legacy_addresses(path, rows)
+    storage = legacy_storage(StorageAddresses, path)
+    if mode == "indexed":
+        storage.migrate()
+        with sqlite3.connect(path) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM addresses').fetchone()[0] == ADDRESSES
+    generator = random.Random(3)
+
+    def lookups():
+        for _ in range(LOOKUPS):
+            storage.get_address_balance(generator.choice(rows)[2])
+
+    benchmark.pedantic(lookups, rounds=ROUNDS, iterations=1)
+    engine.close()
+
+
+def populate_engine(folder):
+    create_legacy_table(os.path.join(str(folder), "transactions.dat"), LEGACY_ROWS // 100)
+    app = storage_app(folder)
+    txs = StorageTxs(app)
+    addresses = StorageAddresses(app)
+    messages = StorageMessages(app)
+    mobile = StorageMobile(app)
+    addresses.bulk_upsert_balances(address_rows(1))
+    for index in range(ENGINE_CALLS):
+        messages.tx(f"{index:064x}")
+    mobile.insert_secret("device", "secret")
+    return (
+        lambda: addresses.get_address_balance(f"addr{ADDRESSES // 2:06d}"),
+        lambda: txs.get_transactions(True, "transparent"),
+        messages.get_txs,
+        lambda: mobile.get_secret("device")
+    )
+
+
+@pytest.mark.benchmark(group="storage-engine")
+@pytest.mark.parametrize("mode", ("fresh", "shared"))
+def test_storage_engine(benchmark, tmp_path, monkeypatch, mode):
+    for module in ENGINE_MODULES:
+        monkeypatch.setattr(module, "connect", sqlite3.connect if mode == "fresh" else connect)
+    calls = populate_engine(tmp_path)
+
+    def cycle():
+        for call in calls:
+            for _ in range(ENGINE_CALLS):
+                call()
+            for _ in range(ENGINE_THREADS):
+                thread = threading.Thread(target=call)
+                thread.start()
+                thread.join()
+
+    opened, reused = engine.opened, engine.reused
+    benchmark.pedantic(cycle, rounds=ROUNDS, iterations=1)
+    benchmark.extra_info["connections_opened"] = engine.opened - opened
+    benchmark.extra_info["connections_reused"] = engine.reused - reused
+    engine.close()
+
+
+async def ticker(lags, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def direct_workload(env, start):
+    storage = StorageTxs(env.app)
+    for index in range(FACADE_ROUNDS):
+        storage.get_transactions()
+        storage.count_transactions()
+        storage.get_balance_history("hour", start)
+        for number in range(FACADE_INSERTS):
+            storage.insert_transaction(
+                "transparent", "receive", "t1", f"direct{index}-{number}", 1.0, 0, 0, start
+            )
+        await asyncio.sleep(0)
+
+
+async def facade_workload(env, start):
+    txs = env.async_storage.txs
+    for index in range(FACADE_ROUNDS):
+        await asyncio.gather(
+            txs.get_transactions(),
+            txs.count_transactions(),
+            txs.get_balance_history("hour", start)
+        )
+        for number in range(FACADE_INSERTS):
+            await txs.insert_transaction(
+                "transparent", "receive", "t1", f"facade{index}-{number}", 1.0, 0, 0, start
+            )
+
+
+async def measure_lag(workload):
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0)
+    await workload
+    stop.set()
+    await tick
+    return lags
+
+
+@pytest.mark.benchmark(group="storage-facade")
+@pytest.mark.parametrize("mode", ("direct", "facade"))
+def test_storage_facade_loop_lag(benchmark, legacy, mode):
+    env = StorageEnvironment(legacy.folder)
+    workload = direct_workload if mode == "direct" else facade_workload
+    start = int(time.time()) - 7 * 86400
+    lags = []
+    try:
+        def cycle():
+            lags.extend(env.run(measure_lag(workload(env, start))))
+
+        benchmark.pedantic(cycle, rounds=ROUNDS, iterations=1)
+    finally:
+        env.close()
+    lags.sort()
+    benchmark.extra_info["lag_max_ms"] = lags[-1] * 1000
+    benchmark.extra_info["lag_p99_ms"] = lags[int(len(lags) * 0.99) - 1] * 1000
+    benchmark.extra_info["lag_median_ms"] = statistics.median(lags) * 1000
+
+
+def test_storage_facade_cancellation(legacy):
+    env = StorageEnvironment(legacy.folder)
+    facade = AsyncStorage(env.app, readers=1)
+    try:
+        async def cancel():
+            task = asyncio.create_task(facade.txs.get_transactions())
+            await asyncio.sleep(0.005)
+            started = time.perf_counter()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert await facade.txs.get_transaction(f"{0:064x}")
+            return time.perf_counter() - started
+
+        assert env.run(cancel()) < 1
+        env.run(facade.close())
+    finally:
+        env.close()
@@ -0,0 +1,685 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("toga")
+pytest.importorskip("aiohttp")
+pytest.importorskip("pytest_benchmark")
+
+import aiohttp
+
+from BTCZWallet.resources.client import RPC
+from BTCZWallet.resources.utils import Utils, RPCCredentials
+from BTCZWallet.resources.units import Units
+from BTCZWallet.resources.blocks import BlockCache
+from BTCZWallet.resources.confirmations import ConfirmationTracker
+from BTCZWallet.resources.index import TxIndex, INDEX_MEMOS, INDEX_TRANSPARENT
+from BTCZWallet.resources.search import TransactionQuery, SEARCH_COUNT_LIMIT
+from BTCZWallet.resources.history import TransactionHistory
+from BTCZWallet.resources.txs import Transactions, TRANSPARENT_SYNC_BLOCK, BACKFILL_PAGE_SIZE
+from BTCZWallet.resources.wallet import Wallet
+from BTCZWallet.resources.send import CashOut
+from BTCZWallet.resources.timeline import BalanceHistory
+from BTCZWallet.resources.export import TransactionExporter
+from BTCZWallet.resources.storage import AsyncStorage
+from BTCZWallet.resources.messages import Chat
+from BTCZWallet.resources.balances import BalanceEngine
+from BTCZWallet.resources.events import NEW_BLOCK, WALLET_CHANGED, BALANCES_CHANGED
+from BTCZWallet.resources.storage import s_txs
+from BTCZWallet.resources.storage.engine import connect as engine_connect
+from BTCZWallet.resources.storage import (
+    StorageTxs, StorageMobile, StorageMessages, StorageAddresses
+)
+
+from .simulator import Simulator
+
+
+RPC_USER = "bench"
+RPC_PASSWORD = "bench"
+ROUNDS = 5
+RPC_CALLS = 200
+RPC_CONCURRENCY = 8
+RPC_CONFIG = (
+    "# BitcoinZ configuration file\n"
+    "rpcuser=benchuser\n"
+    "rpcpassword=benchpasswordbenchpassword\n"
+    "addnode=178.193.205.17:1989\n"
+    "addnode=51.222.50.26:1989\n"
+    "sendchangeback=1\n"
+)
+
+
+class SimulatorUtils():
+    def __init__(self, port):
+        self.credentials = RPCCredentials(
+            RPC_USER, RPC_PASSWORD, port, f"http://localhost:{port}/",
+            aiohttp.BasicAuth(RPC_USER, RPC_PASSWORD).encode(), 4
+        )
+
+    def get_rpc_credentials(self):
+        return self.credentials
+
+
+class ConfigUtils(Utils):
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.rpc_credentials = None
+        self.rpc_config_stat = None
+
+    def get_config_path(self):
+        return self.config_path
+
+
+class HeadlessTransactions():
+    sync_transparent_transactions = Transactions.sync_transparent_transactions
+    sync_unconfirmed_transactions = Transactions.sync_unconfirmed_transactions
+    sync_shielded_transactions = Transactions.sync_shielded_transactions
+    backfill_transparent_transactions = Transactions.backfill_transparent_transactions
+    whole_transactions = Transactions.whole_transactions
+    rewind_transparent_transactions = Transactions.rewind_transparent_transactions
+    store_transparent_transactions = Transactions.store_transparent_transactions
+    scan_shielded_addresses = Transactions.scan_shielded_addresses
+    store_shielded_transactions = Transactions.store_shielded_transactions
+
+    def __init__(self, app, main, rpc):
+        self.app = app
+        self.main = main
+        self.rpc = rpc
+        self.storagetxs = StorageTxs(app)
+        self.storage_mobile = StorageMobile(app)
+        self.storagemsgs = StorageMessages(app)
+        self.block_cache = BlockCache(app, rpc, main.async_storage.blocks)
+        self.confirmations = ConfirmationTracker(app, rpc, main.async_storage.txs)
+        self.shielded_full_scan = None
+
+
+class HeadlessWallet():
+    sync_total_balances = Wallet.sync_total_balances
+    sync_transparent_addresses = Wallet.sync_transparent_addresses
+    sync_shielded_addresses = Wallet.sync_shielded_addresses
+    on_balances_changed = Wallet.on_balances_changed
+
+    def __init__(self, app, main, rpc):
+        self.app = app
+        self.main = main
+        self.rpc = rpc
+        self.rtl = None
+        self.units = Units(app)
+        self.settings = SimpleNamespace(hidden_balances=lambda: False)
+        self.balances = BalanceEngine(app, rpc, main.async_storage.addresses)
+        self.rpc.events.subscribe(BALANCES_CHANGED, self.on_balances_changed)
+        self.scripts = []
+        self.balances_output = SimpleNamespace(
+            control=SimpleNamespace(
+                CoreWebView2=SimpleNamespace(ExecuteScriptAsync=self.scripts.append)
+            )
+        )
+
+
+class HeadlessChat():
+    sync_new_memos = Chat.sync_new_memos
+    count_list_unspent = Chat.count_list_unspent
+    merge_utxos = Chat.merge_utxos
+    unhexlify_memo = Chat.unhexlify_memo
+    get_identity = Chat.get_identity
+    get_message = Chat.get_message
+    edit_message = Chat.edit_message
+    get_request = Chat.get_request
+
+    def __init__(self, app, main, rpc):
+        self.app = app
+        self.main = main
+        self.rpc = rpc
+        self.storage = StorageMessages(app)
+        self.list_unspent_utxos = SimpleNamespace(style=SimpleNamespace(color=None), text=None)
+
+
+class HeadlessCashOut():
+    store_shielded_transaction = CashOut.store_shielded_transaction
+
+    def __init__(self, main):
+        self.main = main
+
+
+class Environment():
+    def __init__(self, path, simulator):
+        self.path = path
+        self.simulator = simulator
+        self.loop = asyncio.new_event_loop()
+        self.pushed = []
+        self.app = SimpleNamespace(
+            loop=self.loop,
+            paths=SimpleNamespace(data=path),
+            console=SimpleNamespace(
+                event_log=lambda *args: None,
+                info_log=lambda *args: None,
+                error_log=lambda *args: None
+            )
+        )
+        self.main = SimpleNamespace(
+            import_key_toggle=None,
+            home_page=SimpleNamespace(current_blocks=simulator.height),
+            receive_page=SimpleNamespace(reload_addresses=lambda: None),
+            mobile_server=SimpleNamespace(broker=SimpleNamespace(push=self.pushed.append)),
+            async_storage=AsyncStorage(self.app)
+        )
+        self.main.tx_index = TxIndex(self.app, self.main.async_storage)
+        port = self.loop.run_until_complete(simulator.start())
+        self.rpc = RPC(self.app, SimulatorUtils(port))
+        self.loop.run_until_complete(self.rpc.open_session())
+
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+
+    def close(self):
+        self.run(self.main.async_storage.close())
+        self.run(self.rpc.close_session())
+        self.run(self.simulator.stop())
+        self.loop.close()
+
+
+def measure(benchmark, env, cycle, setup = None):
+    cycles = []
+
+    def run():
+        cycles.append(env.run(cycle()))
+
+    env.simulator.reset_counters()
+    benchmark.pedantic(run, setup=setup, rounds=ROUNDS, iterations=1)
+    benchmark.extra_info["rpc_calls_per_cycle"] = sum(env.simulator.calls.values()) / len(cycles)
+    benchmark.extra_info["http_requests_per_cycle"] = env.simulator.requests / len(cycles)
+    benchmark.extra_info["rpc_methods"] = dict(env.simulator.calls)
+
+
+def parse_rpc_config(config_path):
+    rpcuser, rpcpassword, rpcport = None, None, None
+    with open(config_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("rpcuser="):
+                rpcuser = line.split("=", 1)[1].strip()
+            elif line.startswith("rpcpassword="):
+                rpcpassword = line.split("=", 1)[1].strip()
+            elif line.startswith("rpcport="):
+                rpcport = line.split("=", 1)[1].strip()
+    if not rpcport:
+        rpcport = 1979
+    url = f"http://localhost:{rpcport}/"
+    authorization = aiohttp.BasicAuth(rpcuser, rpcpassword).encode()
+    return url, authorization
+
+
+async def per_call_rpc(credentials, method, params):
+    auth = aiohttp.BasicAuth(credentials.user, credentials.password)
+    payload = {
+        "jsonrpc": "1.0",
+        "id": "curltest",
+        "method": method,
+        "params": params,
+    }
+    async with aiohttp.ClientSession(auth=auth) as session:
+        async with session.post(credentials.url, json=payload) as response:
+            data = json.loads(await response.text())
+            return data.get("result"), None
+
+
+async def concurrent_calls(call):
+    async def worker():
+        for _ in range(RPC_CALLS // RPC_CONCURRENCY):
+            result, _ = await call("getblockcount", [])
+            assert result is not None
+
+    await asyncio.gather(*(worker() for _ in range(RPC_CONCURRENCY)))
+
+
+@pytest.fixture
+def env(tmp_path):
+    environment = Environment(tmp_path, Simulator(transactions=2000, shielded_notes=500, memos=15))
+    yield environment
+    environment.close()
+
+
+@pytest.mark.benchmark(group="rpc-session")
+@pytest.mark.parametrize("mode", ("per_call", "pooled"))
+def test_rpc_session(benchmark, tmp_path, mode):
+    env = Environment(tmp_path, Simulator(transactions=0, shielded_notes=0, memos=0))
+    try:
+        if mode == "per_call":
+            credentials = env.rpc.utils.get_rpc_credentials()
+            cycle = lambda: concurrent_calls(lambda method, params: per_call_rpc(credentials, method, params))
+        else:
+            cycle = lambda: concurrent_calls(env.rpc._rpc_call)
+        measure(benchmark, env, cycle)
+        assert benchmark.extra_info["rpc_calls_per_cycle"] == RPC_CALLS
+    finally:
+        env.close()
+
+
+@pytest.mark.benchmark(group="rpc-config")
+@pytest.mark.parametrize("mode", ("parse", "cached"))
+def test_rpc_config(benchmark, tmp_path, mode):
+    config_path = str(tmp_path / "bitcoinz.conf")
+    with open(config_path, "w") as f:
+        f.write(RPC_CONFIG)
+    utils = ConfigUtils(config_path)
+    if mode == "parse":
+        result = benchmark(parse_rpc_config, config_path)
+    else:
+        credentials = benchmark(utils.get_rpc_credentials)
+        result = (credentials.url, credentials.authorization)
+    assert result == ("http://localhost:1979/", aiohttp.BasicAuth("benchuser", "benchpasswordbenchpassword").encode())
+
+
+def test_transactions_initial_sync(benchmark, env, tmp_path):
+    rounds = iter(range(ROUNDS))
+
+    def fresh_storage():
+        path = tmp_path / f"round{next(rounds)}"
+        path.mkdir()
+        env.app.paths.data = path
+        env.run(env.main.async_storage.close())
+        env.main.async_storage = AsyncStorage(env.app)
+        env.main.tx_index = TxIndex(env.app, env.main.async_storage)
+        env.transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+
+    async def cycle():
+        await env.transactions.sync_transparent_transactions()
+        await env.transactions.sync_shielded_transactions()
+
+    measure(benchmark, env, cycle, setup=fresh_storage)
+
+
+def test_transactions_steady_cycle(benchmark, env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+
+    async def cycle():
+        await transactions.sync_transparent_transactions()
+        await transactions.sync_unconfirmed_transactions()
+        await transactions.sync_shielded_transactions()
+
+    env.run(cycle())
+    measure(benchmark, env, cycle)
+    assert "listtransactions" not in benchmark.extra_info["rpc_methods"]
+
+
+def test_transactions_new_block_cycle(benchmark, env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+
+    async def cycle():
+        await transactions.sync_transparent_transactions()
+        await transactions.sync_unconfirmed_transactions()
+        await transactions.sync_shielded_transactions()
+
+    def new_block():
+        env.simulator.add_transaction(env.simulator.taddresses[0], "receive", 1.5)
+        env.simulator.add_note(env.simulator.zaddresses[0], 2.5)
+        env.simulator.mine()
+        env.main.home_page.current_blocks = env.simulator.height
+
+    env.run(cycle())
+    measure(benchmark, env, cycle, setup=new_block)
+
+
+def test_transactions_reorg(env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    stored = len(transactions.storagetxs.get_transactions(True, "transparent"))
+    assert stored == len(env.simulator.transactions)
+
+    env.simulator.reorg(3)
+    env.simulator.add_transaction(env.simulator.taddresses[0], "receive", 1.5)
+    env.simulator.mine()
+    env.run(transactions.sync_transparent_transactions())
+    assert len(transactions.storagetxs.get_transactions(True, "transparent")) == stored + 1
+    last_block = transactions.storagetxs.get_sync_state(TRANSPARENT_SYNC_BLOCK)
+    assert last_block == env.simulator.block_hash(env.simulator.height)
+
+
+def test_transactions_skip_mining_categories(env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    stored = len(transactions.storagetxs.get_transactions(True, "transparent"))
+
+    for category in ("generate", "immature", "orphan"):
+        env.simulator.add_transaction(env.simulator.taddresses[0], category, 12.5)
+    env.simulator.add_transaction(env.simulator.taddresses[0], "receive", 1.5)
+    env.simulator.mine()
+    assert env.run(transactions.sync_transparent_transactions()) == 1
+    assert len(transactions.storagetxs.get_transactions(True, "transparent")) == stored + 1
+
+
+def test_transactions_batch_inserts(env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    writes = []
+    write = env.main.async_storage.write
+
+    async def counted(function, *args, **kwargs):
+        writes.append(function.__name__)
+        return await write(function, *args, **kwargs)
+
+    env.main.async_storage.write = counted
+    env.run(transactions.sync_transparent_transactions())
+    env.run(transactions.sync_shielded_transactions())
+    assert "insert_transaction" not in writes
+    assert writes.count("insert_transactions") <= len(env.simulator.transactions) // BACKFILL_PAGE_SIZE + 3
+    assert len(transactions.storagetxs.get_transactions(True, "shielded")) > 0
+
+
+def test_transactions_sum_outputs(env):
+    simulator = env.simulator
+    txid = simulator.make_txid()
+    simulator.add_transaction(simulator.taddresses[1], "receive", 1.5, txid=txid)
+    simulator.add_transaction(simulator.taddresses[1], "receive", 2.25, txid=txid)
+    simulator.mine()
+    boundary = len(simulator.transactions) - BACKFILL_PAGE_SIZE
+    split = dict(simulator.transactions[boundary], amount=0.75)
+    simulator.transactions.insert(boundary, split)
+
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    assert transactions.storagetxs.get_transaction(txid)[4] == 3.75
+    expected = round(split["amount"] + simulator.transactions[boundary + 1]["amount"], 8)
+    assert transactions.storagetxs.get_transaction(split["txid"])[4] == expected
+
+
+def test_transactions_legacy_outputs(tmp_path):
+    rows = [
+        ("transparent", "receive", "t1a", "a" * 64, 1.5, 10, 0, 1000),
+        ("transparent", "receive", "t1a", "a" * 64, 2.25, 10, 0, 1000),
+        ("transparent", "receive", "t1b", "b" * 64, 1.0, 0, 0, 1000),
+        ("transparent", "receive", "t1b", "b" * 64, 1.0, 11, 0, 1000)
+    ]
+    with sqlite3.connect(tmp_path / "transactions.dat") as conn:
+        conn.execute(
+            'CREATE TABLE transactions (type TEXT, category TEXT, address TEXT, txid TEXT, '
+            'amount REAL, blocks INTEGER, fee INTEGER, timestamp INTEGER)'
+        )
+        conn.executemany('INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.close()
+
+    storage = StorageTxs(SimpleNamespace(paths=SimpleNamespace(data=tmp_path)))
+    assert storage.count_transactions() == 2
+    assert storage.get_transaction("a" * 64)[4] == 3.75
+    assert storage.get_transaction("b" * 64)[4:6] == (1.0, 11)
+
+
+def test_confirmation_tracker(env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    pending = set(transactions.storagetxs.get_unconfirmed_transactions())
+    assert len(pending) == 5
+
+    dropped = sorted(pending)[0]
+    env.simulator.drop_transaction(dropped)
+    env.simulator.mine()
+    env.simulator.reset_counters()
+    assert env.run(transactions.sync_unconfirmed_transactions()) == 0
+    assert env.simulator.requests == 1
+    assert transactions.storagetxs.get_unconfirmed_transactions() == []
+    assert transactions.storagetxs.get_transaction(dropped)[5] == -1
+    confirmed = (pending - {dropped}).pop()
+    assert transactions.storagetxs.get_transaction(confirmed)[5] == env.simulator.height
+
+
+def test_transaction_search(env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    storage = transactions.storagetxs
+    everything = storage.get_transactions()
+    address = everything[0][2]
+    expected = [row[3] for row in everything if row[2] == address and abs(row[4]) >= 1]
+
+    query = TransactionQuery.parse(f"{address} amount:>1")
+    found = []
+    rows = storage.get_transactions_after(None, 3, query)
+    while rows:
+        found.extend(row[3] for row in rows)
+        rows = storage.get_transactions_after((rows[-1][7], rows[-1][8]), 3, query)
+    assert sorted(found) == sorted(expected)
+    assert storage.count_search_transactions(query, 1000) == len(expected)
+
+    prefix = everything[0][3][:6]
+    query = TransactionQuery.parse(f"txid:{prefix} {everything[0][1]}")
+    assert everything[0][3] in [row[3] for row in storage.get_transactions_after(None, 50, query)]
+
+    history = TransactionHistory(env.main.async_storage.txs)
+    assert env.run(history.set_query(TransactionQuery.parse("transparent"))) == SEARCH_COUNT_LIMIT
+    assert history.get_row(0) is not None
+    assert not history.wants_more(0)
+    assert history.wants_more(SEARCH_COUNT_LIMIT - 1)
+    while history.capped:
+        env.run(history.extend())
+    assert history.count == len(everything)
+    last = history.count - 1
+    assert history.get_row(last) is None and history.is_missing(last)
+    assert env.run(history.load(last))
+    assert history.get_row(last) is not None and not history.is_missing(last)
+
+
+def test_history_stays_off_the_loop(env, monkeypatch):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    threads = set()
+
+    def connect(path):
+        threads.add(threading.current_thread().name)
+        return engine_connect(path)
+
+    monkeypatch.setattr(s_txs, "connect", connect)
+    history = TransactionHistory(env.main.async_storage.txs)
+    count = env.run(history.refresh())
+    assert history.get_row(0) is not None
+    assert env.run(history.load(count - 1))
+    index = TxIndex(env.app, env.main.async_storage)
+    assert env.run(index.known(INDEX_TRANSPARENT, [("missing", "receive", "t1")])) == set()
+    assert threads and all(name.startswith("storage-reader") for name in threads)
+
+
+def test_shielded_change_detection(tmp_path):
+    env = Environment(tmp_path, Simulator(transactions=10, shielded_addresses=300, shielded_notes=600))
+    try:
+        transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+        env.run(transactions.sync_shielded_transactions())
+        stored = len(transactions.storagetxs.get_transactions(True, "shielded"))
+        assert stored == 600
+
+        env.simulator.reset_counters()
+        env.run(transactions.sync_shielded_transactions())
+        assert dict(env.simulator.calls) == {"z_listaddresses": 1, "z_listunspent": 1}
+
+        spent = next(note for note in env.simulator.notes if note["address"] == env.simulator.zaddresses[7])
+        env.simulator.spend_note(spent)
+        env.simulator.add_note(env.simulator.zaddresses[5], 2.5)
+        env.simulator.mine()
+        env.main.home_page.current_blocks = env.simulator.height
+        env.simulator.reset_counters()
+        env.run(transactions.sync_shielded_transactions())
+        assert env.simulator.calls["z_listreceivedbyaddress"] == 2
+        assert len(transactions.storagetxs.get_transactions(True, "shielded")) == stored + 1
+    finally:
+        env.close()
+
+
+def test_balance_history_reconciles(tmp_path):
+    env = Environment(tmp_path, Simulator(transactions=10, shielded_notes=200, memos=0))
+    try:
+        transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+        history = BalanceHistory(transactions.storagetxs)
+        env.run(transactions.sync_shielded_transactions())
+
+        _, shielded = env.simulator.balances()
+        source = max(shielded, key=shielded.get)
+        amount = round(shielded[source] / 2, 8)
+        operation, _ = env.run(env.rpc.z_sendMany(source, "zs1external", amount, 0.0001))
+        result, _ = env.run(env.rpc.z_getOperationResult(operation))
+        txid = result[0]["result"]["txid"]
+        env.run(HeadlessCashOut(env.main).store_shielded_transaction(source, txid, amount, 0.0001))
+        env.simulator.mine()
+        env.main.home_page.current_blocks = env.simulator.height
+        env.run(transactions.sync_shielded_transactions())
+        assert any(note["change"] for note in env.simulator.notes)
+
+        total = env.run(env.rpc.z_getTotalBalance())[0]
+        assert abs(history.series("day")[-1][2] - float(total["private"])) < 1e-6
+
+        _, shielded = env.simulator.balances()
+        points = history.series("day", addresses=(env.simulator.taddresses[0], source))
+        assert abs(points[-1][2] - shielded[source]) < 1e-6
+        start = points[len(points) // 2][0] + 1
+        assert history.series("day", start, (env.simulator.taddresses[0], source))[-1] == points[-1]
+    finally:
+        env.close()
+
+
+def test_export_running_balances(tmp_path):
+    storage = StorageTxs(SimpleNamespace(paths=SimpleNamespace(data=tmp_path)))
+    storage.insert_transactions([
+        ("transparent", "receive", "t1a", "tx1", 10.0, 100, None, 1000),
+        ("transparent", "send", "t1a", "tx2", -4.0, 101, -0.0001, 2000),
+        ("shielded", "receive", "zs1a", "tx3", 5.0, 102, None, 3000),
+        ("shielded", "send", "zs1a", "tx4", -2.0, 103, 0.0001, 4000),
+        ("transparent", "receive", "t1b", "tx5", 1.0, -1, None, 5000)
+    ])
+    rows = [row for chunk in storage.iter_export_transactions() for row in chunk]
+    assert [(row[3], row[9], row[10]) for row in rows] == [
+        ("tx1", 10.0, 10.0),
+        ("tx2", 5.9999, 5.9999),
+        ("tx3", 5.0, 5.0),
+        ("tx4", 2.9999, 2.9999),
+        ("tx5", 0.0, 5.9999)
+    ]
+
+    path = tmp_path / "export.jsonl"
+    progress = []
+    assert TransactionExporter(storage).export(str(path), 2000, 4001, progress=lambda *args: progress.append(args)) == 3
+    assert [json.loads(line)["type_balance"] for line in path.read_text().splitlines()] == [5.9999, 5.0, 2.9999]
+    assert progress == [(3, 3)]
+
+    with sqlite3.connect(storage.data) as conn:
+        conn.execute("DROP TABLE transactions")
+    with pytest.raises(sqlite3.OperationalError):
+        list(storage.iter_export_transactions())
+
+
+def test_wallet_cycle(benchmark, env):
+    wallet = HeadlessWallet(env.app, env.main, env.rpc)
+
+    async def cycle():
+        await wallet.sync_total_balances()
+        await wallet.sync_transparent_addresses()
+        await wallet.sync_shielded_addresses()
+
+    env.run(cycle())
+    measure(benchmark, env, cycle)
+    assert wallet.scripts
+
+
+def test_address_balances(env):
+    wallet = HeadlessWallet(env.app, env.main, env.rpc)
+    changes = []
+    env.rpc.events.subscribe(BALANCES_CHANGED, lambda event, **data: changes.append(data))
+    storage = StorageAddresses(env.app)
+
+    env.run(wallet.sync_transparent_addresses())
+    env.run(wallet.sync_shielded_addresses())
+    transparent, shielded = env.simulator.balances()
+    stored = {row[2]: row[3] for row in storage.get_addresses(full=True)}
+    assert len(stored) == len(env.simulator.taddresses) + len(env.simulator.zaddresses)
+    assert all(abs(stored[address] - balance) < 1e-6 for address, balance in transparent.items())
+    assert all(abs(stored[address] - shielded[address]) < 1e-6 for address in env.simulator.zaddresses)
+    assert [data["address_type"] for data in changes] == ["transparent", "shielded"]
+
+    changes.clear()
+    env.simulator.reset_counters()
+    env.run(wallet.sync_transparent_addresses())
+    env.run(wallet.sync_shielded_addresses())
+    assert env.simulator.requests == 2
+    assert "z_getbalance" not in env.simulator.calls
+    assert changes == []
+
+    env.simulator.add_note(env.simulator.zaddresses[3], 2.5)
+    env.simulator.mine()
+    env.pushed.clear()
+    env.run(wallet.sync_shielded_addresses())
+    assert changes == [{"address_type": "shielded", "addresses": [env.simulator.zaddresses[3]]}]
+    assert env.pushed == ["update_balances"]
+    assert len(storage.get_addresses(full=True)) == len(stored)
+
+
+def test_chat_cycle(benchmark, env):
+    chat = HeadlessChat(env.app, env.main, env.rpc)
+    chat.storage.identity("individual", "bench", env.simulator.messages_address)
+
+    env.run(chat.sync_new_memos())
+    assert len(chat.storage.get_txs()) == 15
+    assert env.run(env.main.tx_index.members(INDEX_MEMOS)) == set(chat.storage.get_txs())
+    measure(benchmark, env, chat.sync_new_memos)
+
+
+def test_tip_watcher_cycle(benchmark, env):
+    emitted = []
+    env.rpc.events.subscribe(NEW_BLOCK, lambda event, **data: emitted.append(event))
+    env.rpc.events.subscribe(WALLET_CHANGED, lambda event, **data: emitted.append(event))
+
+    env.run(env.rpc.tip_watcher.check_tip())
+    measure(benchmark, env, env.rpc.tip_watcher.check_tip)
+    assert emitted == []
+    assert benchmark.extra_info["http_requests_per_cycle"] == 1
+
+    env.simulator.add_transaction(env.simulator.taddresses[0], "receive", 1.5)
+    env.simulator.mine()
+    env.run(env.rpc.tip_watcher.check_tip())
+    assert emitted == [NEW_BLOCK, WALLET_CHANGED]
+
+
+def test_tip_watcher_clears_cache(env):
+    watcher = env.rpc.tip_watcher
+    env.run(watcher.check_tip())
+    info, _ = env.run(env.rpc.getBlockchainInfo())
+    env.simulator.mine()
+    assert env.run(env.rpc.getBlockchainInfo())[0]["blocks"] == info["blocks"]
+    assert env.run(watcher.check_tip())
+    assert env.run(env.rpc.getBlockchainInfo())[0]["blocks"] == info["blocks"] + 1
+
+
+def test_confirmations_follow_mempool(env):
+    transactions = HeadlessTransactions(env.app, env.main, env.rpc)
+    env.run(transactions.sync_transparent_transactions())
+    env.run(env.rpc.tip_watcher.check_tip())
+    env.run(transactions.sync_unconfirmed_transactions())
+    env.simulator.reset_counters()
+    env.run(transactions.sync_unconfirmed_transactions())
+    assert env.simulator.requests == 0
+
+    env.simulator.add_transaction(env.simulator.taddresses[0], "receive", 1.5)
+    assert env.run(env.rpc.tip_watcher.check_tip())
+    env.simulator.reset_counters()
+    env.run(transactions.sync_unconfirmed_transactions())
+    assert env.simulator.requests == 1
+
+
+def test_tip_watcher_isolates_subscribers(env):
+    errors = []
+    emitted = []
+    env.app.console.error_log = errors.append
+
+    def failing(event, **data):
+        raise RuntimeError("subscriber")
+
+    env.rpc.events.subscribe(NEW_BLOCK, failing)
+    env.rpc.events.subscribe(NEW_BLOCK, lambda event, **data: emitted.append(event))
+    assert env.run(env.rpc.tip_watcher.check_tip())
+    assert not env.run(env.rpc.tip_watcher.check_tip())
+
+    env.simulator.mine()
+    assert env.run(env.rpc.tip_watcher.check_tip())
+    assert emitted == [NEW_BLOCK]
+    assert errors == [f"{NEW_BLOCK} : subscriber"]